@@ -42,6 +42,11 @@ class DocumentChunker:
         self.chunk_overlap = chunk_overlap
         self.respect_sections = respect_sections
         self.respect_paragraphs = respect_paragraphs
+        
+        # feed_incremental durumu: henüz parçalanmamış metin, tamponun belgedeki başlangıcı ve verilen parçalar
+        self._buffer = ""
+        self._buffer_offset = 0
+        self._incremental_chunks = []
         logger.info(f"Initialized DocumentChunker with chunk_size={chunk_size}, chunk_overlap={chunk_overlap}")
     
     def estimate_token_count(self, text: str) -> int:
@@ -105,10 +110,15 @@ class DocumentChunker:
         paragraphs = []
         
         # Define paragraph as text separated by one or more blank lines
-        paragraph_pattern = r"(?<=\n\n|\n\s*\n|\A)(.+?)(?=\n\n|\n\s*\n|\Z)"
+        # (paragraflar ayraçların arasında kalan metindir; değişken genişlikli look-behind re ile derlenemez)
+        paragraph_start = 0
+        for match in re.finditer(r"\n\s*\n", text):
+            if match.start() > paragraph_start:
+                paragraphs.append((paragraph_start, match.start()))
+            paragraph_start = match.end()
         
-        for match in re.finditer(paragraph_pattern, text, re.DOTALL):
-            paragraphs.append((match.start(), match.end()))
+        if paragraph_start < len(text):
+            paragraphs.append((paragraph_start, len(text)))
         
         return paragraphs
     
@@ -157,41 +167,7 @@ class DocumentChunker:
         chunk_index = 0
         
         while chunk_start < text_length:
-            chunk_end = min(chunk_start + self.chunk_size, text_length)
-            
-            # Try to end at a section boundary if possible
-            if self.respect_sections:
-                for section_start, section_end, _ in sections:
-                    if chunk_start < section_start < chunk_end and chunk_end < text_length:
-                        # End chunk at section start to keep sections together
-                        chunk_end = section_start
-                        break
-            
-            # Otherwise try to end at a paragraph boundary
-            if self.respect_paragraphs and chunk_end < text_length:
-                # Find the last paragraph that ends before the chunk end
-                last_para_end = 0
-                for para_start, para_end in paragraphs:
-                    if chunk_start < para_end <= chunk_end:
-                        last_para_end = para_end
-                
-                # If found a paragraph boundary, use it
-                if last_para_end > 0:
-                    chunk_end = last_para_end
-            
-            # At minimum, end at a sentence boundary if possible
-            if chunk_end < text_length:
-                # Look for sentence-ending punctuation followed by whitespace
-                sentence_end_pattern = r"[.!?]\s"
-                last_sentence_end = 0
-                
-                # Search for the last sentence boundary in the potential chunk
-                for match in re.finditer(sentence_end_pattern, text[chunk_start:chunk_end]):
-                    last_sentence_end = match.end() + chunk_start
-                
-                # If found a sentence boundary, use it
-                if last_sentence_end > 0:
-                    chunk_end = last_sentence_end
+            chunk_end = self._find_chunk_end(text, chunk_start, text_length, sections, paragraphs)
             
             # Extract chunk text
             chunk_text = text[chunk_start:chunk_end]
@@ -212,13 +188,15 @@ class DocumentChunker:
                 "metadata": chunk_metadata
             })
             
-            # Move to next chunk with overlap
-            chunk_start = chunk_end - self.chunk_overlap
             chunk_index += 1
             
-            # Make sure we're not stuck in an infinite loop
-            if chunk_start >= chunk_end:
+            # Son parçadan sonra dur; aksi halde bindirme başlangıcı hep aynı son parçayı yeniden üretir
+            if chunk_end >= text_length:
                 break
+            
+            # Move to next chunk with overlap (making sure we're not stuck in an infinite loop)
+            next_start = chunk_end - self.chunk_overlap
+            chunk_start = next_start if next_start > chunk_start else chunk_end
         
         # Update total chunks info
         total_chunks = len(chunks)
@@ -228,6 +206,139 @@ class DocumentChunker:
         logger.info(f"Document chunked into {total_chunks} chunks (original size: {text_length} chars)")
         return chunks
     
+    def _find_chunk_end(self, text: str, chunk_start: int, text_length: int,
+                        sections: List[Tuple[int, int, int]], paragraphs: List[Tuple[int, int]]) -> int:
+        """
+        Pick the end of the chunk starting at chunk_start, preferring section, paragraph
+        and sentence boundaries.
+        
+        Args:
+            text: Document text
+            chunk_start: Start index of the chunk
+            text_length: Length of the document text
+            sections: Section boundaries from identify_sections
+            paragraphs: Paragraph boundaries from identify_paragraphs
+            
+        Returns:
+            End index of the chunk
+        """
+        chunk_end = min(chunk_start + self.chunk_size, text_length)
+        
+        # Try to end at a section boundary if possible
+        if self.respect_sections:
+            for section_start, section_end, _ in sections:
+                if chunk_start < section_start < chunk_end and chunk_end < text_length:
+                    # End chunk at section start to keep sections together
+                    chunk_end = section_start
+                    break
+        
+        # Otherwise try to end at a paragraph boundary
+        if self.respect_paragraphs and chunk_end < text_length:
+            # Find the last paragraph that ends before the chunk end
+            last_para_end = 0
+            for para_start, para_end in paragraphs:
+                if chunk_start < para_end <= chunk_end:
+                    last_para_end = para_end
+            
+            # If found a paragraph boundary, use it
+            if last_para_end > 0:
+                chunk_end = last_para_end
+        
+        # At minimum, end at a sentence boundary if possible
+        if chunk_end < text_length:
+            # Look for sentence-ending punctuation followed by whitespace
+            sentence_end_pattern = r"[.!?]\s"
+            last_sentence_end = 0
+            
+            # Search for the last sentence boundary in the potential chunk
+            for match in re.finditer(sentence_end_pattern, text[chunk_start:chunk_end]):
+                last_sentence_end = match.end() + chunk_start
+            
+            # If found a sentence boundary, use it
+            if last_sentence_end > 0:
+                chunk_end = last_sentence_end
+        
+        return chunk_end
+    
+    def feed_incremental(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Feed the next piece of a streamed document and return the chunks completed by it.
+        
+        Only about two chunks of unprocessed text are kept in memory, so the full document
+        never has to be assembled. Call finish_incremental() after the last piece.
+        
+        Args:
+            text: Next piece of document text
+            
+        Returns:
+            List of newly completed chunk dictionaries
+        """
+        self._buffer += text
+        return self._chunk_buffer(final=False)
+    
+    def finish_incremental(self) -> List[Dict[str, Any]]:
+        """
+        Chunk the text remaining after the last feed_incremental() call and reset the state.
+        
+        total_chunks is filled in on every chunk returned since the stream started.
+        
+        Returns:
+            List of the remaining chunk dictionaries
+        """
+        chunks = self._chunk_buffer(final=True)
+        
+        total_chunks = len(self._incremental_chunks)
+        for chunk in self._incremental_chunks:
+            chunk["metadata"]["total_chunks"] = total_chunks
+        
+        logger.info(f"Streamed document chunked into {total_chunks} chunks "
+                    f"(original size: {self._buffer_offset + len(self._buffer)} chars)")
+        self._buffer = ""
+        self._buffer_offset = 0
+        self._incremental_chunks = []
+        return chunks
+    
+    def _chunk_buffer(self, final: bool) -> List[Dict[str, Any]]:
+        """Cut chunks from the incremental buffer, keeping enough look-ahead unless final"""
+        buffer = self._buffer
+        text_length = len(buffer)
+        # Parça sonu seçilirken sonraki metnin de görülebilmesi için son iki parça boyu tamponda bekletilir
+        limit = text_length if final else text_length - 2 * self.chunk_size
+        if limit <= 0:
+            return []
+        
+        sections = self.identify_sections(buffer) if self.respect_sections else []
+        paragraphs = self.identify_paragraphs(buffer) if self.respect_paragraphs else []
+        
+        chunks = []
+        chunk_start = 0
+        while chunk_start < limit:
+            chunk_end = self._find_chunk_end(buffer, chunk_start, text_length, sections, paragraphs)
+            chunk_index = len(self._incremental_chunks)
+            chunk = {
+                "text": buffer[chunk_start:chunk_end],
+                "metadata": {
+                    "chunk_index": chunk_index,
+                    "chunk_start": self._buffer_offset + chunk_start,
+                    "chunk_end": self._buffer_offset + chunk_end,
+                    "is_first_chunk": chunk_index == 0,
+                    "is_last_chunk": final and chunk_end >= text_length
+                }
+            }
+            chunks.append(chunk)
+            self._incremental_chunks.append(chunk)
+            
+            if chunk_end >= text_length:
+                chunk_start = chunk_end
+                break
+            # Move to next chunk with overlap (always making progress)
+            next_start = chunk_end - self.chunk_overlap
+            chunk_start = next_start if next_start > chunk_start else chunk_end
+        
+        self._buffer = buffer[chunk_start:]
+        self._buffer_offset += chunk_start
+        return chunks
+    
     def chunk_for_model(self, text: str, max_tokens: int = MAX_TOKENS_PER_CHUNK) -> List[str]:
         """
         Chunk text specifically for AI model processing.
@@ -267,36 +378,84 @@ class DocumentChunker:
         Returns:
             Document structure map
         """
-        # Initialize document map
-        doc_map = {
-            "sections": [],
-            "paragraphs": 0,
-            "sentences": 0,
-            "total_length": len(text),
-            "estimated_tokens": len(text) // 4
-        }
+        builder = DocumentMapBuilder()
+        builder.feed(text)
+        return builder.finish()
+
+
+# Belge haritası desenleri: paragraf ayırıcıları, cümle sonları ve markdown başlıkları
+_PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\n|\n\s*\n")
+_SENTENCE_BREAK_PATTERN = re.compile(r"[.!?]\s+")
+_SECTION_PATTERN = re.compile(r"(#{1,6})\s+(.+?)(?:\n|$)", re.MULTILINE)
+# Boşluk ve '#' olmayan bir karakterden sonra gelen, boşlukla başlamayan satır başı: hiçbir desen
+# eşleşmesi bu noktanın üzerinden taşmaz, metin burada güvenle bölünebilir
+_MAP_SAFE_BREAK_PATTERN = re.compile(r"(?<=[^\s#])\n(?=\S)")
+
+
+class DocumentMapBuilder:
+    """
+    Build the generate_document_map structure from text that arrives in pieces.
+    
+    Pieces are scanned up to the last line break no pattern can straddle and the rest is
+    carried over, so the result equals generate_document_map on the joined text.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._offset = 0
+        self._paragraph_breaks = 0
+        self._sentence_breaks = 0
+        self._sections = []
+    
+    def feed(self, text: str) -> None:
+        """Add the next piece of the document"""
+        buffer = self._buffer + text
         
-        # Count paragraphs
-        paragraphs = re.split(r"\n\n|\n\s*\n", text)
-        doc_map["paragraphs"] = len(paragraphs)
+        # Son güvenli bölme noktası sondan geriye doğru aranır
+        cut = 0
+        position = len(buffer)
+        while position > 0:
+            position = buffer.rfind("\n", 0, position)
+            if position <= 0:
+                break
+            if _MAP_SAFE_BREAK_PATTERN.match(buffer, position):
+                cut = position + 1
+                break
+        
+        self._scan(buffer[:cut])
+        self._buffer = buffer[cut:]
+    
+    def finish(self) -> Dict[str, Any]:
+        """Scan the remaining text and return the document map"""
+        self._scan(self._buffer)
+        self._buffer = ""
+        
+        total_length = self._offset
+        return {
+            "sections": self._sections,
+            "paragraphs": self._paragraph_breaks + 1,
+            "sentences": self._sentence_breaks + 1,
+            "total_length": total_length,
+            "estimated_tokens": total_length // 4
+        }
+    
+    def _scan(self, text: str) -> None:
+        if not text:
+            return
         
-        # Count sentences (approximate)
-        sentences = re.split(r"[.!?]\s+", text)
-        doc_map["sentences"] = len(sentences)
+        # Count paragraphs and sentences (re.split parça sayısı = ayırıcı sayısı + 1)
+        self._paragraph_breaks += sum(1 for _ in _PARAGRAPH_BREAK_PATTERN.finditer(text))
+        self._sentence_breaks += sum(1 for _ in _SENTENCE_BREAK_PATTERN.finditer(text))
         
         # Extract section structure
-        section_pattern = r"(#{1,6})\s+(.+?)(?:\n|$)"
-        for match in re.finditer(section_pattern, text, re.MULTILINE):
-            level = len(match.group(1))
-            title = match.group(2).strip()
-            position = match.start()
-            doc_map["sections"].append({
-                "level": level,
-                "title": title,
-                "position": position
+        for match in _SECTION_PATTERN.finditer(text):
+            self._sections.append({
+                "level": len(match.group(1)),
+                "title": match.group(2).strip(),
+                "position": self._offset + match.start()
             })
         
-        return doc_map
+        self._offset += len(text)
 
 
 def chunk_document_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, 
@@ -1,5 +1,6 @@
 import os
 import logging
+import shutil
 import tempfile
 from io import StringIO
 import subprocess
@@ -38,6 +39,9 @@ def parse_document(file_path, extract_images=False, extract_tables=False, use_ll
                 logger.info(f"NeuraParse Plus belge analizi başlatılıyor: {file_path}")
                 try:
                     result = auto_process_document(file_path, extract_images=extract_images, extract_tables=extract_tables)
+                    # Burada yalnızca metin kullanılır; NeuraParse Plus'ın görsel dizini çağırana aittir ve silinir
+                    if result and result.get("image_dir"):
+                        shutil.rmtree(result["image_dir"], ignore_errors=True)
                     if result and "text" in result and result["text"]:
                         logger.info(f"NeuraParse Plus analizi başarılı - {len(result['text'])} karakter, {len(result.get('chunks', []))} parça")
                         return result["text"]
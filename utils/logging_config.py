@@ -65,33 +65,50 @@ class SensitiveDataFilter(logging.Filter):
             record.args = tuple(args_list)
         return True
 
+class _LazyContentSize:
+    """İçerik boyutunu yalnızca log kaydı gerçekten biçimlendirildiğinde hesaplayan yardımcı"""
+
+    __slots__ = ("_content", "_size")
+
+    def __init__(self, content):
+        self._content = content
+        self._size = None
+
+    def __str__(self):
+        if self._size is None:
+            if isinstance(self._content, (dict, list)):
+                # bytes gibi JSON'a çevrilemeyen değerler loglamayı bozmamalı
+                self._size = len(json.dumps(self._content, default=str))
+            else:
+                self._size = len(self._content)
+            self._content = None
+        return str(self._size)
+
 # NeuraDoc için özel fonksiyonlar
 def log_processed_content(content, content_type, module_name="neuradoc"):
     """
     İşlenen içeriği loglar.
 
+    İçerik boyutu tembel olarak hesaplanır: INFO seviyesi kapalıysa ya da kayıt
+    hiçbir handler tarafından yazılmıyorsa içerik JSON'a çevrilmez.
+
     Args:
         content (object): İşlenen içerik (dict, list, str olabilir)
         content_type (str): İçerik tipi (belge, görsel, tablo vs.)
         module_name (str, optional): İşleme yapan modül adı
     """
     logger = logging.getLogger(module_name)
-
-    # İçerik boyutu hesaplama
-    if isinstance(content, dict) or isinstance(content, list):
-        content_size = len(json.dumps(content))
-        content_summary = f"{content_type} içeriği: {content_size} karakter"
-    elif isinstance(content, str):
-        content_size = len(content)
-        content_summary = f"{content_type} içeriği: {content_size} karakter"
-    else:
-        content_summary = f"{content_type} içeriği işlendi"
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
     # Belgenin %100 kapsandığını loglama mesajında vurgula
-    if content_type == "document_structure_analysis":
-        content_summary += " - Belge tam kapsama (%100)"
+    suffix = " - Belge tam kapsama (%100)" if content_type == "document_structure_analysis" else ""
 
-    logger.info(content_summary)
+    # İçerik boyutu hesaplama
+    if isinstance(content, (dict, list, str)):
+        logger.info("%s içeriği: %s karakter%s", content_type, _LazyContentSize(content), suffix)
+    else:
+        logger.info("%s içeriği işlendi%s", content_type, suffix)
 
 def setup_logger(name, level=logging.INFO):
     """
@@ -14,11 +14,22 @@ from utils.neuradoc_enhanced import *
 
 import os
 import io
+import re
 import json
 import base64
 import logging
 import random
-from typing import Dict, List, Optional, Union, Any, Tuple
+import copy
+import functools
+import multiprocessing
+import threading
+from typing import Dict, List, Optional, Union, Any, Tuple, Iterator
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from array import array
+from enum import IntEnum
 from datetime import datetime
 
 # Loglama yapılandırması ekleniyor
@@ -39,6 +50,36 @@ ENHANCED_ML_AVAILABLE = True  # Always set to True to bypass import checks - ASL
 # Dokümanların tam olarak işlendiğinden emin olmak için detaylı loglama
 DETAILED_LOGGING = True # Detaylı loglama her zaman açık
 
+# Dosya yolu üzerinden bir kez hesaplanan bilgiler; yardımcı fonksiyonlara aktarılır
+_FileInfo = namedtuple("_FileInfo", "path ext doc_type size mtime basename")
+
+class DocType(IntEnum):
+    """Document formats the extractors dispatch on, resolved once from the file extension"""
+    OTHER = 0
+    PDF = 1
+    DOCX = 2
+    DOC = 3
+
+_EXT_DOC_TYPES = {"pdf": DocType.PDF, "docx": DocType.DOCX, "doc": DocType.DOC}
+_WORD_DOC_TYPES = (DocType.DOCX, DocType.DOC)
+
+# Aynı dosya sürümü için çıkarım sonuçlarının tutulduğu önbelleğin en fazla kayıt sayısı
+DOC_CACHE_SIZE = 128
+
+# Sayfa bazlı PDF işlemleri için süreç havuzu ayarları; görsel bilgileri görsel akışı okunmadan
+# sayfa başına milisaniyeler içinde toplandığından havuz yalnızca çok sayfalı belgelerde açılır
+PDF_PAGE_WORKERS = min(os.cpu_count() or 1, 8)
+PDF_PARALLEL_MIN_PAGES = 64
+# Havuz fork ile başlatılmaz: çok iş parçacıklı sunucuda kopyalanan kilitler alt süreçte kilitli
+# kalabilir; forkserver yoksa spawn kullanılır
+PDF_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# PDF görsel akışı filtresine göre extract_image'in döndüreceği uzantı (diğerleri PNG'ye dönüştürülür)
+_PDF_IMAGE_FILTER_EXTS = {"DCTDecode": "jpeg", "JPXDecode": "jpx", "JBIG2Decode": "jb2"}
+
+# Veri akışı olarak kabul edilen diyagram türleri (küçük harfle, tek hash araması ile eşleştirilir)
+_DATA_FLOW_DIAGRAM_TYPES = frozenset(("sequence diagram", "flow diagram", "data flow"))
+
 # We're using our own implementation, not external libraries
 try:
     # Ensure necessary base libraries are available
@@ -94,24 +135,33 @@ try:
     
     # Prepare OpenAI client if available
     client = None  # Define client at module level
+    http_client = None  # Shared keep-alive connection pool for the OpenAI client
     if OPENAI_AVAILABLE:
         try:
             # First try to get API key from environment variable
             openai_api_key = os.environ.get("OPENAI_API_KEY", "")
-            if openai_api_key:
-                # Initialize OpenAI client with the API key
-                client = OpenAI(api_key=openai_api_key)
-                logger.info("OpenAI client successfully initialized from environment variable")
-            else:
+            if not openai_api_key:
                 # Fallback to config manager
                 try:
                     openai_api_key = config_manager.get_api_key("openai")
-                    if openai_api_key:
-                        client = OpenAI(api_key=openai_api_key)
-                        logger.info("OpenAI client initialized from config manager")
-                    else:
-                        logger.warning("No OpenAI API key found, vision analysis will be limited")
-                        OPENAI_AVAILABLE = False
+                except Exception as ce:
+                    logger.error(f"Error reading OpenAI API key from config manager: {str(ce)}")
+                    openai_api_key = ""
+
+            if openai_api_key:
+                # Tüm çağrılar aynı bağlantı havuzunu kullanır; her istekte TLS el sıkışması tekrarlanmaz
+                import atexit
+                import httpx
+                http_client = httpx.Client(
+                    timeout=60,
+                    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+                )
+                atexit.register(http_client.close)
+                client = OpenAI(api_key=openai_api_key, http_client=http_client)
+                logger.info("OpenAI client successfully initialized with pooled HTTP client")
+            else:
+                logger.warning("No OpenAI API key found, vision analysis will be limited")
+                OPENAI_AVAILABLE = False
         except Exception as oe:
             logger.error(f"Error initializing OpenAI client: {str(oe)}")
             OPENAI_AVAILABLE = False
@@ -122,32 +172,44 @@ except ImportError as e:
     # Still set to True to ensure functionality - we'll use fallbacks
     OPENAI_AVAILABLE = False
 
-def extract_text(file_path: str) -> Optional[str]:
+# PyMuPDF, PDF içindeki görselleri doğrudan (yeniden render etmeden) çıkarmak için kullanılır
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+    logger.info("PyMuPDF successfully imported for PDF image extraction")
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    logger.warning("PyMuPDF not available, PDF image extraction will be simulated")
+
+def extract_text(file_path: str, file_info: Optional[_FileInfo] = None) -> Optional[str]:
     """
     Extract text content from a document file
     
     Args:
         file_path (str): Path to the document file
+        file_info (_FileInfo, optional): Precomputed file information for file_path
         
     Returns:
         str or None: Extracted text content or None if extraction failed
     """
-    document_type = os.path.splitext(file_path)[1].lower()[1:]
+    file_info = file_info or _get_file_info(file_path)
+    document_type = file_info.ext
+    doc_type = file_info.doc_type
     logger.info(f"Extracting text from {document_type} document: {file_path}")
     
     try:
-        if document_type == 'pdf':
+        if doc_type is DocType.PDF:
             # Use PyPDF2 for PDF text extraction if available
             if 'PyPDF2' in globals():
                 try:
-                    text = []
-                    with open(file_path, 'rb') as f:
-                        pdf = PdfReader(f)
-                        for page_num in range(len(pdf.pages)):
-                            page = pdf.pages[page_num]
-                            text.append(page.extract_text())
+                    # Sayfalar tek tek okunup doğrudan tampona yazılır; sayfa listesi bellekte tutulmaz
+                    buffer = io.StringIO()
+                    for page_num, page_text in enumerate(_iter_page_texts(file_path)):
+                        if page_num:
+                            buffer.write("\n\n")
+                        buffer.write(page_text)
                     
-                    full_text = "\n\n".join(text)
+                    full_text = buffer.getvalue()
                     if not full_text.strip():
                         logger.warning("PyPDF2 extracted blank text, trying fallback")
                         raise Exception("Blank text extracted")
@@ -161,7 +223,7 @@ def extract_text(file_path: str) -> Optional[str]:
             logger.info("Using fallback PDF text extraction")
             # In a real implementation, this would use other PDF libraries
             
-        elif document_type in ['docx', 'doc']:
+        elif doc_type in _WORD_DOC_TYPES:
             # Use python-docx for Word document text extraction if available
             try:
                 try:
@@ -190,14 +252,15 @@ def extract_text(file_path: str) -> Optional[str]:
     
     # Provide a fallback with minimal but useful information
     logger.info("Using fallback text extraction")
-    return f"Document: {os.path.basename(file_path)}\nType: {document_type}\nSize: {os.path.getsize(file_path)} bytes"
+    return f"Document: {file_info.basename}\nType: {document_type}\nSize: {file_info.size} bytes"
 
-def get_document_structure(file_path: str) -> Optional[Dict[str, Any]]:
+def get_document_structure(file_path: str, file_info: Optional[_FileInfo] = None) -> Optional[Dict[str, Any]]:
     """
     Get advanced document structure analysis
     
     Args:
         file_path (str): Path to the document file
+        file_info (_FileInfo, optional): Precomputed file information for file_path
         
     Returns:
         dict or None: Advanced document structure information with semantic analysis
@@ -208,16 +271,16 @@ def get_document_structure(file_path: str) -> Optional[Dict[str, Any]]:
     logger.info("NeuraDoc ile doküman yapısı analizi başlatılıyor...")
         
     try:
-        document_type = os.path.splitext(file_path)[1].lower()[1:]  # Remove leading dot
+        file_info = file_info or _get_file_info(file_path)
         
         # This is a simulated implementation
         # In a real implementation, this would call actual document processing libraries
         
         # Simulated document structure object
         structure = {
-            "file_type": document_type,
-            "file_size": os.path.getsize(file_path),
-            "filename": os.path.basename(file_path),
+            "file_type": file_info.ext,
+            "file_size": file_info.size,
+            "filename": file_info.basename,
             "processing_engine": "NeuraDoc 2.0"
         }
         
@@ -226,8 +289,11 @@ def get_document_structure(file_path: str) -> Optional[Dict[str, Any]]:
         structure["headings"] = _extract_headings(file_path)
         
         # Add rich content elements
-        structure["images"] = _extract_images(file_path)
-        structure["tables"] = _extract_tables(file_path)
+        # PDF, görsel ve tablo çıkarımı için tek sefer açılır; xref tablosu yalnızca bir kez okunur
+        shared_doc = _open_doc(file_path) if file_info.doc_type is DocType.PDF and PYMUPDF_AVAILABLE else nullcontext()
+        with shared_doc as doc:
+            structure["images"] = _extract_images(file_path, file_info, doc=doc)
+            structure["tables"] = _extract_tables(file_path, file_info, doc=doc)
         structure["charts"] = _extract_charts(file_path)
         structure["diagrams"] = _extract_diagrams(file_path)
         
@@ -273,8 +339,9 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
         
     try:
         # Get document structure and extract the text content
-        structure = get_document_structure(file_path)
-        text_content = extract_text(file_path)
+        file_info = _get_file_info(file_path)
+        structure = get_document_structure(file_path, file_info)
+        text_content = extract_text(file_path, file_info)
         
         if not structure or not text_content:
             logger.error("Failed to extract structure or content from document")
@@ -372,7 +439,7 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
             }
             
             # Tüm tabloları test içeriği olarak kabul et
-            for table in structure.get("tables", []):
+            for table in structure.get("tables", ()):
                 if isinstance(table, dict):
                     # Her tabloyu test case olarak ekle
                     table_content = table.get("data", [])
@@ -394,12 +461,17 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
                         "priority": "High"
                     })
                     
-            # Tüm görselleri test içeriği olarak kabul et
-            for image in structure.get("images", []):
+                    # Gereksinim tablosu olsun ya da olmasın tüm tablolar gereksinimlere eklenir
+                    test_content["requirements"].append(table)
+                    
+            # Tüm görselleri tek geçişte işle: UI bileşeni, test senaryosu ve otomatik senaryolar.
+            # user_interfaces sırası korunur: önce tüm bileşenler, ardından tüm görseller
+            image_interfaces = []
+            for image in structure.get("images", ()):
                 if isinstance(image, dict):
-                    # Her görsel için bir UI test senaryosu ekle 
                     image_type = image.get("type", "UI Element")
-                    image_description = image.get("description", "User Interface Component")
+                    raw_description = image.get("description")
+                    image_description = "User Interface Component" if raw_description is None else raw_description
                     
                     # Görsele dayalı bir UI bileşeni ekle
                     test_content["user_interfaces"].append({
@@ -415,25 +487,11 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
                         "priority": "Medium"
                     })
                     
-                    # Başlığı kontrol et ve uygun kategoriye ekle
-                    caption = table.get("caption", "").lower()
-                    if "gereksinim" in caption or "requirement" in caption:
-                        test_content["requirements"].append(table)
-                    else:
-                        # Eğer gereksinim tablosu değilse de ekle, hiçbir içeriği atlama
-                        test_content["requirements"].append(table)
-            
-            # Extract UI-related content from images - tümünü dahil et
-            for image in structure.get("images", []):
-                if isinstance(image, dict):
-                    # Tüm görselleri işle ve otomatik testler oluştur
-                    test_scenarios = []
-                    
                     # Tüm görseller için otomatik senaryo oluştur
-                    image_desc = image.get("description", "Görsel içerik")
-                    test_scenario = {
+                    image_desc = "Görsel içerik" if raw_description is None else raw_description
+                    image["test_scenarios"] = [{
                         "title": f"Görsel İçerik Doğrulama: {image_desc[:30]}...",
-                        "description": f"Belgedeki görselin doğru şekilde görüntülendiğini ve içeriğinin doğru olduğunu doğrulama",
+                        "description": "Belgedeki görselin doğru şekilde görüntülendiğini ve içeriğinin doğru olduğunu doğrulama",
                         "test_cases": [
                             {
                                 "title": "Görsel İçerik Kontrol Testi",
@@ -441,20 +499,11 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
                                 "expected_results": "Görsel doğru şekilde görüntülenmeli"
                             }
                         ]
-                    }
-                    test_scenarios.append(test_scenario)
-                    
-                    # Görsele test senaryoları ekle
-                    image["test_scenarios"] = test_scenarios
+                    }]
                     
-                    # Kullanıcı arayüzüne ekle
-                    desc = image.get("description", "").lower()
-                    # Ekran veya kullanıcı arayüzü mü kontrol et
-                    if "arayüz" in desc or "interface" in desc or "ekran" in desc or "screen" in desc:
-                        test_content["user_interfaces"].append(image)
-                    else:
-                        # Eğer arayüz değilse de otomatik olarak dahil et
-                        test_content["user_interfaces"].append(image)
+                    # Arayüz olsun ya da olmasın tüm görseller kullanıcı arayüzlerine dahil edilir
+                    image_interfaces.append(image)
+            test_content["user_interfaces"].extend(image_interfaces)
             
             # Extract functional areas from semantic structure
             if "semantic_structure" in structure:
@@ -463,9 +512,9 @@ def process_with_neuradoc(file_path: str) -> Optional[Dict[str, Any]]:
                     test_content["functional_areas"] = semantic["key_concepts"]
             
             # Extract data flows from diagrams
-            for diagram in structure.get("diagrams", []):
+            for diagram in structure.get("diagrams", ()):
                 if isinstance(diagram, dict):
-                    if diagram.get("diagram_type", "").lower() in ["sequence diagram", "flow diagram", "data flow"]:
+                    if diagram.get("diagram_type", "").lower() in _DATA_FLOW_DIAGRAM_TYPES:
                         test_content["data_flows"].append(diagram)
             
             return test_content
@@ -510,12 +559,13 @@ def extract_document_content(file_path: str) -> Optional[Dict[str, Any]]:
         
     try:
         # First get document structure
-        structure = get_document_structure(file_path)
+        file_info = _get_file_info(file_path)
+        structure = get_document_structure(file_path, file_info)
         if not structure:
             return None
             
         # Add full text content
-        text_content = extract_text(file_path)
+        text_content = extract_text(file_path, file_info)
         if not text_content:
             from utils.document_parser import parse_document
             text_content = parse_document(file_path)
@@ -541,6 +591,356 @@ def extract_document_content(file_path: str) -> Optional[Dict[str, Any]]:
 # Private helper functions for document analysis
 #
 
+# Simüle edilmiş grafik, diyagram ve semantik yapı içerikleri her çağrıda yeniden oluşturulmaz.
+# Sonuçlar oturumda JSON olarak saklandığı için MappingProxyType yerine düz dict kullanılır;
+# fonksiyonlar yalnızca dış kabı kopyalar, iç nesneler paylaşılır.
+_CHARTS_FIXTURE = (
+    {
+        "chart_type": "Bar Chart",
+        "caption": "Figure 3: Test Case Results by Category",
+        "page": 4,
+        "data_summary": "Bar chart showing test case pass/fail counts across 5 categories",
+        "categories": ["UI", "Backend", "API", "Database", "Integration"],
+        "values": [12, 8, 15, 6, 10]
+    },
+)
+
+_DIAGRAMS_FIXTURE = (
+    {
+        "diagram_type": "Sequence Diagram",
+        "caption": "Figure 4: User Authentication Flow",
+        "page": 5,
+        "description": "A sequence diagram showing the authentication process flow between user, client, and server",
+        "connections": [
+            {"from": "User", "to": "Client", "label": "Enter Credentials"},
+            {"from": "Client", "to": "Server", "label": "Authenticate Request"},
+            {"from": "Server", "to": "Database", "label": "Validate User"},
+            {"from": "Server", "to": "Client", "label": "Authentication Response"},
+            {"from": "Client", "to": "User", "label": "Display Result"}
+        ]
+    },
+)
+
+# Belgeden görsel veya tablo çıkarılamadığında döndürülen yer tutucu kayıtlar
+_IMAGE_FALLBACK = (
+    {
+        "description": "Belge içeriğinde tespit edilebilen görsel",
+        "page": 1,
+        "analysis": "Belge görsellerinin analizi için daha gelişmiş modüller gerekiyor",
+        "content_type": "unknown",
+        "test_relevance": "belirsiz"
+    },
+)
+
+_TABLE_FALLBACK = (
+    {
+        "caption": "Belge Tablolarının Analizi",
+        "page": 1,
+        "summary": "Belgedeki tablolar etkin şekilde analiz edilemedi",
+        "test_relevance": "düşük"
+    },
+)
+
+_SEMANTIC_FIXTURE = {
+    "topic": "Software Testing",
+    "target_audience": "QA Engineers",
+    "key_concepts": ["Automated Testing", "Test Cases", "Test Analysis", "Reporting"],
+    "document_goals": ["Document Test Procedures", "Explain Test Results"],
+    "complexity_level": "Technical",
+    "document_quality": 0.85
+}
+
+# Simüle edilmiş PDF görselleri için değer havuzları
+_SIMULATED_IMAGE_TYPES = ("diagram", "screenshot", "flowchart", "mockup", "user interface", "technical drawing")
+_SIMULATED_WIDTHS = tuple(range(400, 1201, 50))
+_SIMULATED_HEIGHTS = tuple(range(300, 901, 50))
+_SIMULATED_RELEVANCES = ("kritik", "yüksek", "orta", "düşük")
+
+# Görsel açıklamasındaki anahtar kelimeleri tek geçişte sınıflandıran desen
+_KIND_RE = re.compile(r"(?P<ui>arayüz|ekran|interface)|(?P<flow>diyagram|akış)", re.IGNORECASE)
+
+# Simüle edilmiş görsel açıklama şablonları ({p}: sayfa numarası, {i}: sayfadaki görsel sırası)
+_DIAGRAM_DESCRIPTIONS = (
+    "Sistem Mimarisi Diyagramı (Sayfa {p}, Görsel {i})",
+    "Veri Akış Diyagramı (Sayfa {p}, Görsel {i})",
+    "Komponent İlişkileri Diyagramı (Sayfa {p}, Görsel {i})"
+)
+_SCREENSHOT_DESCRIPTIONS = (
+    "Kullanıcı Paneli Ekran Görüntüsü (Sayfa {p}, Görsel {i})",
+    "Admin Arayüzü Ekranı (Sayfa {p}, Görsel {i})",
+    "Rapor Sayfası Ekranı (Sayfa {p}, Görsel {i})"
+)
+_FLOWCHART_DESCRIPTIONS = (
+    "İşlem Akış Şeması (Sayfa {p}, Görsel {i})",
+    "Kullanıcı Kayıt Akışı (Sayfa {p}, Görsel {i})",
+    "Onay Süreci Akışı (Sayfa {p}, Görsel {i})"
+)
+_OTHER_DESCRIPTIONS = (
+    "Teknik Çizim (Sayfa {p}, Görsel {i})",
+    "Arayüz Tasarımı (Sayfa {p}, Görsel {i})",
+    "Konsept Model (Sayfa {p}, Görsel {i})"
+)
+
+# Görsel türüne göre (açıklama şablonları, analiz metni); diğer türler _OTHER_IMAGE_TYPE kullanır
+_IMAGE_TYPE_DISPATCH = {
+    "diagram": (
+        _DIAGRAM_DESCRIPTIONS,
+        "Sistemin bileşenleri arasındaki ilişkileri gösteren teknik diyagram. Veri akışları ve bağlantı noktaları açıkça belirtilmiş."
+    ),
+    "screenshot": (
+        _SCREENSHOT_DESCRIPTIONS,
+        "Uygulama arayüzünün görsel tasarımını ve kullanıcı etkileşim öğelerini gösteren ekran görüntüsü. Butonlar, formlar ve bilgi alanları içeriyor."
+    ),
+    "flowchart": (
+        _FLOWCHART_DESCRIPTIONS,
+        "Bir sürecin adımlarını ve karar noktalarını gösteren akış şeması. Başlangıç, bitiş ve karar noktaları açıkça işaretlenmiş."
+    )
+}
+_OTHER_IMAGE_TYPE = (
+    _OTHER_DESCRIPTIONS,
+    "Sistemin teknik bir görsel temsili. Boyutlar, bağlantılar ve bileşen detayları gösterilmiş."
+)
+
+# Görsel türüne göre test senaryosu şablonları ({p}: sayfa numarası, {i}: sayfadaki görsel sırası)
+_SCENARIO_TEMPLATES = {
+    "ui": (
+        "UI Elemanları Kontrolü: Sayfa {p}, Görsel {i} - Tüm butonların ve form elemanlarının doğru çalıştığını doğrula",
+        "Duyarlı Tasarım Testi: Sayfa {p}, Görsel {i} - Arayüzün farklı ekran boyutlarında düzgün görüntülendiğini kontrol et",
+        "Görsel Tutarlılık Testi: Sayfa {p}, Görsel {i} - Renk şeması ve tipografinin tasarım kılavuzuna uygunluğunu doğrula"
+    ),
+    "flow": (
+        "İş Akışı Doğrulama: Sayfa {p}, Görsel {i} - Diyagramdaki akışın gerçek sistem davranışıyla uyumlu olduğunu doğrula",
+        "Entegrasyon Noktaları Testi: Sayfa {p}, Görsel {i} - Diyagramda gösterilen entegrasyon noktalarının çalıştığını kontrol et",
+        "Sınır Koşulları Testi: Sayfa {p}, Görsel {i} - Diyagramda belirtilen karar noktalarındaki sınır koşullarını test et"
+    ),
+    "other": (
+        "Görsel İçerik Doğrulama: Sayfa {p}, Görsel {i} - Görselin teknik dokümantasyonla uyumluluğunu doğrula",
+        "Metadata Kontrolü: Sayfa {p}, Görsel {i} - Görselin meta verilerinin doğruluğunu kontrol et",
+        "Erişilebilirlik Testi: Sayfa {p}, Görsel {i} - Görseldeki bilgilerin alternatif metinlerle sunulduğunu doğrula"
+    )
+}
+
+def _image_kind(description: str, image_type: str) -> str:
+    """Classify an image as 'ui', 'flow' or 'other' from its type and description keywords"""
+    if image_type == "screenshot":
+        return "ui"
+    match = _KIND_RE.search(description)
+    if match:
+        return match.lastgroup
+    if image_type in ("diagram", "flowchart"):
+        return "flow"
+    return "other"
+
+def _get_file_info(file_path: str) -> _FileInfo:
+    """Collect extension, document type, size and name of a file with a single stat call"""
+    st = os.stat(file_path)
+    ext = os.path.splitext(file_path)[1].lower()[1:]  # Remove leading dot
+    return _FileInfo(
+        path=file_path,
+        ext=ext,
+        doc_type=_EXT_DOC_TYPES.get(ext, DocType.OTHER),
+        size=st.st_size,
+        mtime=st.st_mtime,
+        basename=os.path.basename(file_path)
+    )
+
+_doc_cache_entries = OrderedDict()
+_doc_cache_lock = threading.Lock()
+
+def _doc_cache(fn):
+    """
+    Cache an extractor's result per file version, keyed by (function, path, mtime_ns, size).
+    A modified file gets a new key, so stale entries simply age out of the LRU order.
+    """
+    @functools.wraps(fn)
+    def wrapper(file_path: str, *args, **kwargs):
+        st = os.stat(file_path)
+        key = (fn.__name__, file_path, st.st_mtime_ns, st.st_size)
+        with _doc_cache_lock:
+            if key in _doc_cache_entries:
+                _doc_cache_entries.move_to_end(key)
+                # Çağıranlar dönen görsel/tablo sözlüklerini yerinde güncellediği için kopya döndürülür
+                return copy.deepcopy(_doc_cache_entries[key])
+        
+        result = fn(file_path, *args, **kwargs)
+        with _doc_cache_lock:
+            _doc_cache_entries[key] = copy.deepcopy(result)
+            _doc_cache_entries.move_to_end(key)
+            while len(_doc_cache_entries) > DOC_CACHE_SIZE:
+                _doc_cache_entries.popitem(last=False)
+        return result
+    return wrapper
+
+@contextmanager
+def _open_doc(file_path: str):
+    """Open a PDF with PyMuPDF for the duration of a block so extractors can share one handle"""
+    doc = fitz.open(file_path)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+def _iter_page_texts(file_path: str):
+    """Yield the text of each PDF page in order, keeping only one page in memory"""
+    with open(file_path, 'rb') as f:
+        pdf = PdfReader(f)
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+class _ImageColumns:
+    """
+    Columnar buffer for PDF image metadata.
+    Sayısal alanlar array sütunlarında tutulur; işçi süreçlerden dönen sonuçlar
+    sözlük listesine göre çok daha küçük serileştirilir. Sözlükler yalnızca iterasyonda üretilir.
+    """
+
+    __slots__ = ("pages", "indexes", "widths", "heights", "sizes", "content_types")
+
+    def __init__(self):
+        self.pages = array('I')
+        self.indexes = array('I')
+        self.widths = array('I')
+        self.heights = array('I')
+        self.sizes = array('Q')
+        self.content_types = []
+
+    def append(self, page: int, index: int, width: int, height: int, size: int, content_type: str):
+        self.pages.append(page)
+        self.indexes.append(index)
+        self.widths.append(width)
+        self.heights.append(height)
+        self.sizes.append(size)
+        self.content_types.append(content_type)
+
+    def extend(self, other: "_ImageColumns"):
+        self.pages.extend(other.pages)
+        self.indexes.extend(other.indexes)
+        self.widths.extend(other.widths)
+        self.heights.extend(other.heights)
+        self.sizes.extend(other.sizes)
+        self.content_types.extend(other.content_types)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __iter__(self):
+        for page, index, width, height, size, content_type in zip(
+            self.pages, self.indexes, self.widths, self.heights, self.sizes, self.content_types
+        ):
+            yield {
+                "description": f"PDF görseli (Sayfa {page}, Görsel {index})",
+                "page": page,
+                "index_on_page": index,
+                "width": width,
+                "height": height,
+                "content_type": content_type,
+                "bytes": size,
+                "extraction_method": "PyMuPDF get_images"
+            }
+
+def _pdf_stream_length(doc, xref: int) -> int:
+    """Stored (encoded) length of a PDF stream object from its /Length entry, 0 if unknown"""
+    value_type, value = doc.xref_get_key(xref, "Length")
+    try:
+        if value_type == "int":
+            return int(value)
+        if value_type == "xref":
+            # /Length dolaylı nesne olarak verilmiş olabilir ("12 0 R")
+            return int(doc.xref_object(int(value.split()[0])).strip())
+    except ValueError:
+        pass
+    return 0
+
+def _collect_page_images(doc, page_index: int, columns: _ImageColumns) -> None:
+    """Append the embedded images of a single page of an open PyMuPDF document to columns"""
+    # Boyut ve biçim get_images demetinden ve akış sözlüğünden okunur; extract_image her görselin
+    # tüm akışını okuyup (JPEG dışındakileri PNG'ye) çözerdi
+    for img_index, (xref, _, width, height, _, _, _, _, image_filter, *_) in enumerate(
+            doc[page_index].get_images(full=True)):
+        columns.append(
+            page_index + 1,
+            img_index + 1,
+            width,
+            height,
+            _pdf_stream_length(doc, xref),
+            _PDF_IMAGE_FILTER_EXTS.get(image_filter, "png")
+        )
+
+def _extract_page_images(file_path: str, page_indices: range) -> _ImageColumns:
+    """Worker: open the PDF in this process and extract images of a page range"""
+    columns = _ImageColumns()
+    with fitz.open(file_path) as doc:
+        for page_index in page_indices:
+            _collect_page_images(doc, page_index, columns)
+    return columns
+
+def _extract_pdf_images(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """Extract embedded PDF images with PyMuPDF, spreading large documents over a process pool"""
+    if doc is None:
+        with _open_doc(file_path) as doc:
+            return _extract_pdf_images(file_path, doc)
+    
+    columns = _ImageColumns()
+    page_count = doc.page_count
+    if page_count <= PDF_PARALLEL_MIN_PAGES or PDF_PAGE_WORKERS < 2:
+        for page_index in range(page_count):
+            _collect_page_images(doc, page_index, columns)
+        return list(columns)
+    
+    # Her işçi kendi fitz.Document nesnesini açar; sayfalar sırayı korumak için ardışık bloklara bölünür
+    workers = min(PDF_PAGE_WORKERS, page_count)
+    step = -(-page_count // workers)
+    page_ranges = [range(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    
+    mp_context = multiprocessing.get_context(PDF_POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=len(page_ranges), mp_context=mp_context) as executor:
+        for page_columns in executor.map(_extract_page_images, repeat(file_path), page_ranges):
+            columns.extend(page_columns)
+    return list(columns)
+
+def _extract_pdf_tables(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """Extract PDF tables with PyMuPDF's table finder, which returns already-parsed cells"""
+    if doc is None:
+        with _open_doc(file_path) as doc:
+            return _extract_pdf_tables(file_path, doc)
+    
+    tables = []
+    for page_index, page in enumerate(doc):
+        for table in page.find_tables().tables:
+            rows = [["" if cell is None else str(cell).strip() for cell in row] for row in table.extract()]
+            header = table.header
+            headers = [name or f"Sütun {i + 1}" for i, name in enumerate(header.names)]
+            # Başlık tablonun içindeyse ilk satır veri değildir
+            data = rows if header.external else rows[1:]
+            tables.append({
+                "caption": f"Tablo {len(tables) + 1} (Sayfa {page_index + 1})",
+                "page": page_index + 1,
+                "headers": headers,
+                "data": data,
+                "test_relevance": "orta",
+                "summary": f"{len(data)} satır ve {len(headers)} sütun içeren tablo",
+                "extraction_method": "PyMuPDF find_tables"
+            })
+    return tables
+
+def _safe(fn, default, *args, **kwargs):
+    """Call fn for work backed by external libraries, returning default if it raises"""
+    try:
+        return fn(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Error in {getattr(fn, '__name__', fn)}: {str(e)}")
+        return default
+
+@_doc_cache
+def _pdf_page_count(file_path: str) -> int:
+    """Return the number of pages in a PDF file"""
+    if PYMUPDF_AVAILABLE:
+        # PyMuPDF sayfa sayısını nesne tablosunu baştan sona ayrıştırmadan verir
+        with _open_doc(file_path) as doc:
+            return doc.page_count
+    with open(file_path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
 def _extract_sections(file_path: str) -> List[Dict[str, Any]]:
     """Extract document sections (simulated implementation)"""
     # In a real implementation, this would extract actual sections
@@ -661,165 +1061,115 @@ def analyze_image_with_openai(image_data: bytes, image_format: str = 'PNG') -> D
             "test_scenarios": []
         }
 
-def _extract_images(file_path: str) -> List[Dict[str, Any]]:
+def _iter_images(file_path: str, file_info: Optional[_FileInfo] = None, doc=None) -> Iterator[Dict[str, Any]]:
     """
-    Extract document images with detailed image analysis - Sayfa sayfa, resim resim analiz
-    Her bir görseli ayrı ayrı işleyip test senaryolarına dönüştürür
+    Yield document images one by one with detailed image analysis - Sayfa sayfa, resim resim analiz
+    Tüketici görselleri tek tek işleyebilir; tüm liste bellekte tutulmak zorunda değildir
     """
-    document_type = os.path.splitext(file_path)[1].lower()[1:]
-    images = []
+    doc_type = (file_info or _get_file_info(file_path)).doc_type
     
-    try:
-        # For PDF files, try to extract images
-        if document_type == 'pdf' and 'PyPDF2' in globals():
-            try:
-                # Detaylı loglama ekle
-                logger.info(f"PDF dosyasından görüntüler çıkarılıyor (sayfa sayfa): {file_path}")
-                
-                # Müşteri talebi: Tüm görselleri sayfa sayfa eksiksiz çıkar
-                # PyMuPDF benzeri bir kütüphane kullanılarak her sayfadaki her görsel çıkarılır
-                # Her bir görsel için gerçek AI tabanlı analiz yapılabilir
-                
-                # Her sayfadaki her görsel için ayrıntılı işleme yapalım
-                page_count = 0
-                
-                try:
-                    with open(file_path, 'rb') as f:
-                        pdf = PyPDF2.PdfReader(f)
-                        page_count = len(pdf.pages)
-                        logger.info(f"PDF dosyası {page_count} sayfa içeriyor. Tüm sayfalar analiz edilecek.")
-                except Exception as pdf_err:
-                    logger.error(f"PDF sayfa sayısı hesaplanamadı: {str(pdf_err)}")
-                    page_count = 10  # Varsayılan değer
-                
-                # Örnek olarak sayfa başına en az 2-4 görsel oluşturalım (daha fazla görsel çıkarmak için)
-                for page_num in range(1, page_count + 1):
-                    logger.info(f"PDF Sayfa {page_num}/{page_count} görüntüleri analiz ediliyor...")
-                    
-                    # Her sayfa için tesadüfi sayıda görsel (2-4 arası) oluştur
-                    images_per_page = random.randint(3, 6)  # Her sayfada daha fazla görsel
-                    
-                    for img_idx in range(images_per_page):
-                        # Her görsel için detaylı bilgiler
-                        image_types = ["diagram", "screenshot", "flowchart", "mockup", "user interface", "technical drawing"]
-                        image_type = random.choice(image_types)
-                        
-                        # Gerçekçi görsel tanımları
-                        if image_type == "diagram":
-                            descriptions = [
-                                f"Sistem Mimarisi Diyagramı (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Veri Akış Diyagramı (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Komponent İlişkileri Diyagramı (Sayfa {page_num}, Görsel {img_idx+1})"
-                            ]
-                            analysis = "Sistemin bileşenleri arasındaki ilişkileri gösteren teknik diyagram. Veri akışları ve bağlantı noktaları açıkça belirtilmiş."
-                        elif image_type == "screenshot":
-                            descriptions = [
-                                f"Kullanıcı Paneli Ekran Görüntüsü (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Admin Arayüzü Ekranı (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Rapor Sayfası Ekranı (Sayfa {page_num}, Görsel {img_idx+1})"
-                            ]
-                            analysis = "Uygulama arayüzünün görsel tasarımını ve kullanıcı etkileşim öğelerini gösteren ekran görüntüsü. Butonlar, formlar ve bilgi alanları içeriyor."
-                        elif image_type == "flowchart":
-                            descriptions = [
-                                f"İşlem Akış Şeması (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Kullanıcı Kayıt Akışı (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Onay Süreci Akışı (Sayfa {page_num}, Görsel {img_idx+1})"
-                            ]
-                            analysis = "Bir sürecin adımlarını ve karar noktalarını gösteren akış şeması. Başlangıç, bitiş ve karar noktaları açıkça işaretlenmiş."
-                        else:
-                            descriptions = [
-                                f"Teknik Çizim (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Arayüz Tasarımı (Sayfa {page_num}, Görsel {img_idx+1})",
-                                f"Konsept Model (Sayfa {page_num}, Görsel {img_idx+1})"
-                            ]
-                            analysis = "Sistemin teknik bir görsel temsili. Boyutlar, bağlantılar ve bileşen detayları gösterilmiş."
-                        
-                        # Her görsel için detaylı test senaryoları
-                        description = random.choice(descriptions)
-                        test_scenarios = []
-                        
-                        # Görsel türüne özel test senaryoları oluştur
-                        if "arayüz" in description.lower() or "ekran" in description.lower() or "interface" in description.lower() or "screenshot" in image_type:
-                            test_scenarios = [
-                                f"UI Elemanları Kontrolü: Sayfa {page_num}, Görsel {img_idx+1} - Tüm butonların ve form elemanlarının doğru çalıştığını doğrula",
-                                f"Duyarlı Tasarım Testi: Sayfa {page_num}, Görsel {img_idx+1} - Arayüzün farklı ekran boyutlarında düzgün görüntülendiğini kontrol et",
-                                f"Görsel Tutarlılık Testi: Sayfa {page_num}, Görsel {img_idx+1} - Renk şeması ve tipografinin tasarım kılavuzuna uygunluğunu doğrula"
-                            ]
-                        elif "diyagram" in description.lower() or "akış" in description.lower() or "diagram" in image_type or "flowchart" in image_type:
-                            test_scenarios = [
-                                f"İş Akışı Doğrulama: Sayfa {page_num}, Görsel {img_idx+1} - Diyagramdaki akışın gerçek sistem davranışıyla uyumlu olduğunu doğrula",
-                                f"Entegrasyon Noktaları Testi: Sayfa {page_num}, Görsel {img_idx+1} - Diyagramda gösterilen entegrasyon noktalarının çalıştığını kontrol et",
-                                f"Sınır Koşulları Testi: Sayfa {page_num}, Görsel {img_idx+1} - Diyagramda belirtilen karar noktalarındaki sınır koşullarını test et"
-                            ]
-                        else:
-                            test_scenarios = [
-                                f"Görsel İçerik Doğrulama: Sayfa {page_num}, Görsel {img_idx+1} - Görselin teknik dokümantasyonla uyumluluğunu doğrula",
-                                f"Metadata Kontrolü: Sayfa {page_num}, Görsel {img_idx+1} - Görselin meta verilerinin doğruluğunu kontrol et",
-                                f"Erişilebilirlik Testi: Sayfa {page_num}, Görsel {img_idx+1} - Görseldeki bilgilerin alternatif metinlerle sunulduğunu doğrula"
-                            ]
-                        
-                        # Her görsel için benzersiz bir kayıt ekle
-                        images.append({
-                            "description": description,
-                            "page": page_num,
-                            "index_on_page": img_idx + 1,
-                            "analysis": analysis,
-                            "width": random.randint(400, 1200),
-                            "height": random.randint(300, 900),
-                            "content_type": image_type,
-                            "test_relevance": random.choice(["kritik", "yüksek", "orta", "düşük"]),
-                            "test_scenarios": test_scenarios,
-                            "extraction_method": "AI-based image analysis"
-                        })
-                
-                logger.info(f"Toplam {len(images)} görsel çıkarıldı ve analiz edildi (PDF)")
-            except Exception as pdf_img_err:
-                logger.error(f"Error extracting images from PDF: {str(pdf_img_err)}")
+    # For PDF files, extract the embedded images with PyMuPDF
+    if doc_type is DocType.PDF and PYMUPDF_AVAILABLE:
+        logger.info("PDF dosyasından görüntüler PyMuPDF ile çıkarılıyor: %s", file_path)
+        yield from _safe(_extract_pdf_images, [], file_path, doc)
     
-        # For docx files try to extract images 
-        elif document_type in ['docx', 'doc']:
-            try:
-                # Try to extract Word document images
-                logger.info(f"Extracting images from Word document: {file_path}")
-                # This would use python-docx in a real implementation
+    # PyMuPDF yoksa sayfa bazlı simüle edilmiş görsel analizi kullanılır
+    elif doc_type is DocType.PDF and 'PyPDF2' in globals():
+        # Detaylı loglama ekle
+        logger.info("PDF dosyasından görüntüler çıkarılıyor (sayfa sayfa): %s", file_path)
 
-                # Provide realistic simulated results for testing
-                images = [
-                    {
-                        "description": "Test Senaryoları Tablosu",
-                        "page": 2,
-                        "analysis": "Belgedeki test senaryolarının detaylarını gösteren tablo. Test ID, açıklama, ön koşullar ve beklenen sonuçlar sütunlarını içeriyor.",
-                        "width": 720, 
-                        "height": 340,
-                        "content_type": "table_image",
-                        "test_relevance": "kritik",
-                        "test_scenarios": [
-                            "Tablodaki test senaryolarının otomatize edilmesi",
-                            "Ön koşulların sağlandığının doğrulanması",
-                            "Beklenen sonuçların kontrolü için doğrulayıcı mekanizmalar oluşturulması"
-                        ]
-                    }
-                ]
-            except Exception as docx_img_err:
-                logger.error(f"Error extracting images from Word document: {str(docx_img_err)}")
+        # Müşteri talebi: Tüm görselleri sayfa sayfa eksiksiz çıkar
+        # PyMuPDF benzeri bir kütüphane kullanılarak her sayfadaki her görsel çıkarılır
+        # Her bir görsel için gerçek AI tabanlı analiz yapılabilir
+
+        # Her sayfadaki her görsel için ayrıntılı işleme yapalım
+        page_count = _safe(_pdf_page_count, 10, file_path)  # Hata durumunda varsayılan değer
+        logger.info("PDF dosyası %d sayfa içeriyor. Tüm sayfalar analiz edilecek.", page_count)
+        
+        # İlerleme her sayfada değil, yaklaşık yirmide bir adımda loglanır
+        progress_step = max(1, page_count // 20)
+        
+        # Örnek olarak sayfa başına en az 2-4 görsel oluşturalım (daha fazla görsel çıkarmak için)
+        for page_num in range(1, page_count + 1):
+            if page_num % progress_step == 0:
+                logger.info("PDF Sayfa %d/%d görüntüleri analiz ediliyor...", page_num, page_count)
+
+            # Her sayfa için tesadüfi sayıda görsel (3-6 arası) oluştur
+            # Rastgele değerler sayfa başına tek seferde, sayfaya bağlı tohumla üretilir
+            rng = random.Random(page_num)
+            images_per_page = rng.randint(3, 6)  # Her sayfada daha fazla görsel
+            image_types = rng.choices(_SIMULATED_IMAGE_TYPES, k=images_per_page)
+            variants = rng.choices(range(3), k=images_per_page)
+            widths = rng.choices(_SIMULATED_WIDTHS, k=images_per_page)
+            heights = rng.choices(_SIMULATED_HEIGHTS, k=images_per_page)
+            relevances = rng.choices(_SIMULATED_RELEVANCES, k=images_per_page)
+
+            for img_idx in range(images_per_page):
+                # Her görsel için detaylı bilgiler
+                image_type = image_types[img_idx]
+
+                # Gerçekçi görsel tanımları
+                descriptions, analysis = _IMAGE_TYPE_DISPATCH.get(image_type, _OTHER_IMAGE_TYPE)
+
+                # Yalnızca seçilen açıklama şablonu doldurulur; aynı alan sözlüğü senaryolarda da kullanılır
+                fields = {"p": page_num, "i": img_idx + 1}
+                description = descriptions[variants[img_idx]].format_map(fields)
+
+                # Görsel türüne özel test senaryoları oluştur
+                kind = _image_kind(description, image_type)
+                test_scenarios = [template.format_map(fields) for template in _SCENARIO_TEMPLATES[kind]]
+
+                # Her görsel için benzersiz bir kayıt ekle
+                yield {
+                    "description": description,
+                    "page": page_num,
+                    "index_on_page": img_idx + 1,
+                    "analysis": analysis,
+                    "width": widths[img_idx],
+                    "height": heights[img_idx],
+                    "content_type": image_type,
+                    "test_relevance": relevances[img_idx],
+                    "test_scenarios": test_scenarios,
+                    "extraction_method": "AI-based image analysis"
+                }
     
-    except Exception as e:
-        logger.error(f"General error extracting images: {str(e)}")
+    # For docx files try to extract images 
+    elif doc_type in _WORD_DOC_TYPES:
+        # Try to extract Word document images
+        logger.info("Extracting images from Word document: %s", file_path)
+        # This would use python-docx in a real implementation
+
+        # Provide realistic simulated results for testing
+        yield {
+            "description": "Test Senaryoları Tablosu",
+            "page": 2,
+            "analysis": "Belgedeki test senaryolarının detaylarını gösteren tablo. Test ID, açıklama, ön koşullar ve beklenen sonuçlar sütunlarını içeriyor.",
+            "width": 720, 
+            "height": 340,
+            "content_type": "table_image",
+            "test_relevance": "kritik",
+            "test_scenarios": [
+                "Tablodaki test senaryolarının otomatize edilmesi",
+                "Ön koşulların sağlandığının doğrulanması",
+                "Beklenen sonuçların kontrolü için doğrulayıcı mekanizmalar oluşturulması"
+            ]
+        }
+
+@_doc_cache
+def _extract_images(file_path: str, file_info: Optional[_FileInfo] = None, doc=None) -> List[Dict[str, Any]]:
+    """
+    Extract document images with detailed image analysis - Sayfa sayfa, resim resim analiz
+    Her bir görseli ayrı ayrı işleyip test senaryolarına dönüştürür
+    """
+    images = list(_iter_images(file_path, file_info, doc))
     
     if not images:
         # Fallback to provide at least some useful information
         logger.info("Using fallback image extraction mechanism")
-        images = [
-            {
-                "description": "Belge içeriğinde tespit edilebilen görsel",
-                "page": 1,
-                "analysis": "Belge görsellerinin analizi için daha gelişmiş modüller gerekiyor",
-                "content_type": "unknown",
-                "test_relevance": "belirsiz"
-            }
-        ]
+        # Görsel sözlükleri sonradan yerinde güncellendiği için sabitin kopyası kullanılır
+        images = [dict(entry) for entry in _IMAGE_FALLBACK]
     
-    logger.info(f"Extracted {len(images)} images from document")
+    logger.info("Extracted %d images from document", len(images))
     
     # Log extracted images
     log_processed_content(
@@ -830,93 +1180,90 @@ def _extract_images(file_path: str) -> List[Dict[str, Any]]:
     
     return images
 
-def _extract_tables(file_path: str) -> List[Dict[str, Any]]:
-    """Extract tables from document with enhanced capabilities"""
-    document_type = os.path.splitext(file_path)[1].lower()[1:]
-    tables = []
+def _iter_tables(file_path: str, file_info: Optional[_FileInfo] = None, doc=None) -> Iterator[Dict[str, Any]]:
+    """Yield tables from document one by one with enhanced capabilities"""
+    file_info = file_info or _get_file_info(file_path)
+    doc_type = file_info.doc_type
     
-    try:
-        # Process based on file type
-        if document_type == 'pdf':
-            logger.info(f"Extracting tables from PDF: {file_path}")
-            # In a real implementation, use a PDF table extraction library
-            # For now, provide realistic simulated results
-            tables = [
-                {
-                    "caption": "Test Senaryoları Özeti",
-                    "page": 3,
-                    "headers": ["ID", "Test Senaryosu", "Durum", "Öncelik", "Sorumlu"],
-                    "data": [
-                        ["TS001", "Kullanıcı Girişi", "Başarılı", "Yüksek", "Ayşe Demir"],
-                        ["TS002", "Profil Güncelleme", "Başarısız", "Orta", "Mehmet Yılmaz"],
-                        ["TS003", "Arama İşlevi", "Başarılı", "Yüksek", "Ali Öztürk"],
-                        ["TS004", "Rapor Oluşturma", "Beklemede", "Düşük", "Fatma Çelik"]
-                    ],
-                    "test_relevance": "kritik",
-                    "summary": "Test senaryolarının durumunu, önceliğini ve sorumlularını gösteren özet tablo",
-                    "test_actions": [
-                        "Tablodaki başarısız testlerin ayrıntılı incelenmesi",
-                        "Yüksek öncelikli test senaryolarının otomatize edilmesi",
-                        "Beklemedeki testlerin tamamlanma tarihlerinin belirlenmesi"
-                    ]
-                },
-                {
-                    "caption": "Sistem Gereksinimleri",
-                    "page": 5,
-                    "headers": ["Gereksinim ID", "Açıklama", "Tip", "Kaynak"],
-                    "data": [
-                        ["REQ001", "Kullanıcı kimlik doğrulama sistemi", "Fonksiyonel", "İş Analizi"],
-                        ["REQ002", "Sistem yanıt süresi < 2 saniye olmalı", "Performans", "Müşteri Talebi"],
-                        ["REQ003", "Raporlar PDF formatında dışa aktarılabilmeli", "Fonksiyonel", "Ürün Yönetimi"]
-                    ],
-                    "test_relevance": "yüksek",
-                    "summary": "Sistemin temel gereksinimlerini ve kaynaklarını gösteren tablo",
-                    "test_actions": [
-                        "Her gereksinim için en az bir test senaryosu hazırlanması",
-                        "Gereksinimlerin karşılanıp karşılanmadığını doğrulayan testlerin geliştirilmesi",
-                        "Gereksinimlerin kabul kriterlerinin netleştirilmesi"
-                    ]
-                }
-            ]
-        elif document_type in ['docx', 'doc']:
-            logger.info(f"Extracting tables from Word document: {file_path}")
-            # In a real implementation, use python-docx to extract tables
-            tables = [
-                {
-                    "caption": "Fonksiyonel Test Planı",
-                    "page": 2,
-                    "headers": ["Test Alanı", "Test Türü", "Başlangıç", "Bitiş", "Kaynak İhtiyacı"],
-                    "data": [
-                        ["Kullanıcı Arayüzü", "Manuel", "15.04.2025", "25.04.2025", "2 Test Uzmanı"],
-                        ["API Servisleri", "Otomatik", "10.04.2025", "20.04.2025", "1 Test Mühendisi"],
-                        ["Veritabanı", "Otomatik", "05.04.2025", "12.04.2025", "1 Test Mühendisi"]
-                    ],
-                    "test_relevance": "yüksek",
-                    "summary": "Test sürecinin planını ve kaynak ihtiyaçlarını gösteren tablo",
-                    "test_actions": [
-                        "Test takviminin proje planıyla uyumluluğunun kontrolü",
-                        "Kaynak atamalarının gerçekleştirilmesi",
-                        "Test ortamlarının hazırlanması için görevlerin oluşturulması"
-                    ]
-                }
-            ]
-        else:
-            logger.info(f"No specific table extraction for file type: {document_type}")
-    except Exception as e:
-        logger.error(f"Error extracting tables: {str(e)}")
-    
-    if not tables:
-        # Fallback with useful information
-        tables = [
+    # Process based on file type
+    if doc_type is DocType.PDF and PYMUPDF_AVAILABLE:
+        logger.info("Extracting tables from PDF with PyMuPDF: %s", file_path)
+        yield from _safe(_extract_pdf_tables, [], file_path, doc)
+    elif doc_type is DocType.PDF:
+        logger.info("Extracting tables from PDF: %s", file_path)
+        # PyMuPDF yoksa simüle edilmiş sonuçlar kullanılır
+        yield from [
+            {
+                "caption": "Test Senaryoları Özeti",
+                "page": 3,
+                "headers": ["ID", "Test Senaryosu", "Durum", "Öncelik", "Sorumlu"],
+                "data": [
+                    ["TS001", "Kullanıcı Girişi", "Başarılı", "Yüksek", "Ayşe Demir"],
+                    ["TS002", "Profil Güncelleme", "Başarısız", "Orta", "Mehmet Yılmaz"],
+                    ["TS003", "Arama İşlevi", "Başarılı", "Yüksek", "Ali Öztürk"],
+                    ["TS004", "Rapor Oluşturma", "Beklemede", "Düşük", "Fatma Çelik"]
+                ],
+                "test_relevance": "kritik",
+                "summary": "Test senaryolarının durumunu, önceliğini ve sorumlularını gösteren özet tablo",
+                "test_actions": [
+                    "Tablodaki başarısız testlerin ayrıntılı incelenmesi",
+                    "Yüksek öncelikli test senaryolarının otomatize edilmesi",
+                    "Beklemedeki testlerin tamamlanma tarihlerinin belirlenmesi"
+                ]
+            },
             {
-                "caption": "Belge Tablolarının Analizi",
-                "page": 1,
-                "summary": "Belgedeki tablolar etkin şekilde analiz edilemedi",
-                "test_relevance": "düşük"
+                "caption": "Sistem Gereksinimleri",
+                "page": 5,
+                "headers": ["Gereksinim ID", "Açıklama", "Tip", "Kaynak"],
+                "data": [
+                    ["REQ001", "Kullanıcı kimlik doğrulama sistemi", "Fonksiyonel", "İş Analizi"],
+                    ["REQ002", "Sistem yanıt süresi < 2 saniye olmalı", "Performans", "Müşteri Talebi"],
+                    ["REQ003", "Raporlar PDF formatında dışa aktarılabilmeli", "Fonksiyonel", "Ürün Yönetimi"]
+                ],
+                "test_relevance": "yüksek",
+                "summary": "Sistemin temel gereksinimlerini ve kaynaklarını gösteren tablo",
+                "test_actions": [
+                    "Her gereksinim için en az bir test senaryosu hazırlanması",
+                    "Gereksinimlerin karşılanıp karşılanmadığını doğrulayan testlerin geliştirilmesi",
+                    "Gereksinimlerin kabul kriterlerinin netleştirilmesi"
+                ]
+            }
+        ]
+    elif doc_type in _WORD_DOC_TYPES:
+        logger.info("Extracting tables from Word document: %s", file_path)
+        # In a real implementation, use python-docx to extract tables
+        yield from [
+            {
+                "caption": "Fonksiyonel Test Planı",
+                "page": 2,
+                "headers": ["Test Alanı", "Test Türü", "Başlangıç", "Bitiş", "Kaynak İhtiyacı"],
+                "data": [
+                    ["Kullanıcı Arayüzü", "Manuel", "15.04.2025", "25.04.2025", "2 Test Uzmanı"],
+                    ["API Servisleri", "Otomatik", "10.04.2025", "20.04.2025", "1 Test Mühendisi"],
+                    ["Veritabanı", "Otomatik", "05.04.2025", "12.04.2025", "1 Test Mühendisi"]
+                ],
+                "test_relevance": "yüksek",
+                "summary": "Test sürecinin planını ve kaynak ihtiyaçlarını gösteren tablo",
+                "test_actions": [
+                    "Test takviminin proje planıyla uyumluluğunun kontrolü",
+                    "Kaynak atamalarının gerçekleştirilmesi",
+                    "Test ortamlarının hazırlanması için görevlerin oluşturulması"
+                ]
             }
         ]
+    else:
+        logger.info("No specific table extraction for file type: %s", file_info.ext)
+
+@_doc_cache
+def _extract_tables(file_path: str, file_info: Optional[_FileInfo] = None, doc=None) -> List[Dict[str, Any]]:
+    """Extract tables from document with enhanced capabilities"""
+    tables = list(_iter_tables(file_path, file_info, doc))
     
-    logger.info(f"Extracted {len(tables)} tables from document")
+    if not tables:
+        # Fallback with useful information
+        tables = [dict(entry) for entry in _TABLE_FALLBACK]
+    
+    logger.info("Extracted %d tables from document", len(tables))
     
     # Log extracted tables
     log_processed_content(
@@ -927,19 +1274,11 @@ def _extract_tables(file_path: str) -> List[Dict[str, Any]]:
     
     return tables
 
+@_doc_cache
 def _extract_charts(file_path: str) -> List[Dict[str, Any]]:
     """Extract document charts (simulated implementation)"""
     # In a real implementation, this would extract actual charts
-    charts = [
-        {
-            "chart_type": "Bar Chart",
-            "caption": "Figure 3: Test Case Results by Category",
-            "page": 4,
-            "data_summary": "Bar chart showing test case pass/fail counts across 5 categories",
-            "categories": ["UI", "Backend", "API", "Database", "Integration"],
-            "values": [12, 8, 15, 6, 10]
-        }
-    ]
+    charts = list(_CHARTS_FIXTURE)
     
     # Log extracted charts
     log_processed_content(
@@ -950,24 +1289,11 @@ def _extract_charts(file_path: str) -> List[Dict[str, Any]]:
     
     return charts
 
+@_doc_cache
 def _extract_diagrams(file_path: str) -> List[Dict[str, Any]]:
     """Extract document diagrams (simulated implementation)"""
     # In a real implementation, this would extract actual diagrams
-    diagrams = [
-        {
-            "diagram_type": "Sequence Diagram",
-            "caption": "Figure 4: User Authentication Flow",
-            "page": 5,
-            "description": "A sequence diagram showing the authentication process flow between user, client, and server",
-            "connections": [
-                {"from": "User", "to": "Client", "label": "Enter Credentials"},
-                {"from": "Client", "to": "Server", "label": "Authenticate Request"},
-                {"from": "Server", "to": "Database", "label": "Validate User"},
-                {"from": "Server", "to": "Client", "label": "Authentication Response"},
-                {"from": "Client", "to": "User", "label": "Display Result"}
-            ]
-        }
-    ]
+    diagrams = list(_DIAGRAMS_FIXTURE)
     
     # Log extracted diagrams
     log_processed_content(
@@ -978,18 +1304,12 @@ def _extract_diagrams(file_path: str) -> List[Dict[str, Any]]:
     
     return diagrams
 
+@_doc_cache
 def _extract_semantic_structure(file_path: str) -> Dict[str, Any]:
     """Extract semantic structure (simulated implementation)"""
     # In a real implementation, this would use ML models to create 
     # a semantic understanding of the document's purpose and structure
-    semantic_structure = {
-        "topic": "Software Testing",
-        "target_audience": "QA Engineers",
-        "key_concepts": ["Automated Testing", "Test Cases", "Test Analysis", "Reporting"],
-        "document_goals": ["Document Test Procedures", "Explain Test Results"],
-        "complexity_level": "Technical",
-        "document_quality": 0.85
-    }
+    semantic_structure = dict(_SEMANTIC_FIXTURE)
     
     # Log semantic structure
     log_processed_content(
@@ -1000,11 +1320,13 @@ def _extract_semantic_structure(file_path: str) -> Dict[str, Any]:
     
     return semantic_structure
 
+@_doc_cache
 def _classify_document_purpose(file_path: str) -> str:
     """Classify document purpose (simulated implementation)"""
     # In a real implementation, this would use ML to classify document purpose
     return "Functional Specification Document"
 
+@_doc_cache
 def _classify_document_type(file_path: str) -> str:
     """Classify document type (simulated implementation)"""
     # In a real implementation, this would use ML to classify document type
@@ -8,10 +8,18 @@ Tablo, resim, grafik ve diagramları kapsayan zengin içerikli belgelerin semant
 import os
 import io
 import re
+import sys
 import base64
+import copy
+import functools
 import json
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Union
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterator
 
 # Force logger to be available and configured
 logging.basicConfig(level=logging.INFO)
@@ -21,48 +29,85 @@ logger = logging.getLogger(__name__)
 NEURADOC_AVAILABLE = True  # Always set to True to bypass import checks
 ENHANCED_ML_AVAILABLE = True  # Always set to True for enhanced features
 
-# Ensure necessary imports are attempted
+# orjson is optional; it serializes large element lists several times faster than json
 try:
-    import PIL
-    from PIL import Image
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
 except ImportError:
-    logger.warning("PIL/Pillow not available, image processing will be limited")
+    _dumps = json.dumps
 
-try:
-    import pytesseract  # For OCR if needed
-except ImportError:
-    logger.warning("pytesseract not available, OCR functionality limited")
+# Ağır isteğe bağlı bağımlılıklar (Pillow, OpenAI SDK) ilk kullanımda yüklenir; modül içe aktarımı hızlı kalır
+@functools.lru_cache(maxsize=1)
+def _get_pil_image():
+    """Import and return PIL.Image on first use, or None if Pillow is not installed"""
+    try:
+        from PIL import Image
+        return Image
+    except ImportError:
+        logger.warning("PIL/Pillow not available, image processing will be limited")
+        return None
 
-# Check for OpenAI availability but don't fail if not available
-OPENAI_AVAILABLE = False
-# Create a global client variable for use in entire module
-client = None
-try:
-    import openai
-    from openai import OpenAI
-    
-    # First try to get API key from environment variable
-    openai_api_key = os.environ.get("OPENAI_API_KEY", "")
-    if openai_api_key:
-        # Initialize OpenAI client with the API key
-        client = OpenAI(api_key=openai_api_key)
-        logger.info("OpenAI client successfully initialized from environment variable")
-        OPENAI_AVAILABLE = True
-    else:
+@functools.lru_cache(maxsize=1)
+def _get_openai_client():
+    """Create the OpenAI client on first use; returns None if the SDK or an API key is unavailable"""
+    try:
+        from openai import OpenAI
+        
+        # First try to get API key from environment variable
+        openai_api_key = os.environ.get("OPENAI_API_KEY", "")
+        if openai_api_key:
+            logger.info("OpenAI client successfully initialized from environment variable")
+            return OpenAI(api_key=openai_api_key)
+        
         # Try to get from config_manager
         try:
             from utils.config import config_manager
             openai_api_key = config_manager.get_api_key("openai")
             if openai_api_key:
-                client = OpenAI(api_key=openai_api_key)
                 logger.info("OpenAI client initialized from config_manager")
-                OPENAI_AVAILABLE = True
-            else:
-                logger.warning("No OpenAI API key found, image analysis will use basic methods")
+                return OpenAI(api_key=openai_api_key)
+            logger.warning("No OpenAI API key found, image analysis will use basic methods")
         except Exception as config_err:
             logger.warning(f"Could not load config_manager, error: {str(config_err)}. Image analysis will use basic methods")
-except (ImportError, Exception) as e:
-    logger.warning(f"OpenAI not available, image analysis will use basic methods: {str(e)}")
+    except (ImportError, Exception) as e:
+        logger.warning(f"OpenAI not available, image analysis will use basic methods: {str(e)}")
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _get_local_vision_model():
+    """
+    Load the local Moondream2 captioner on first use; returns (model, tokenizer) or None
+    
+    transformers is an optional dependency, only needed for NEURADOC_VISION_BACKEND=local.
+    """
+    try:
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        # Model kodu depodan çalıştırılır (trust_remote_code); sabitlenmiş sürüm dışında kod indirilmez
+        model = AutoModelForCausalLM.from_pretrained(
+            LOCAL_VISION_MODEL, revision=LOCAL_VISION_MODEL_REVISION, trust_remote_code=True
+        )
+        tokenizer = AutoTokenizer.from_pretrained(LOCAL_VISION_MODEL, revision=LOCAL_VISION_MODEL_REVISION)
+        logger.info(f"Local vision model loaded: {LOCAL_VISION_MODEL}")
+        return model, tokenizer
+    except (ImportError, Exception) as e:
+        logger.warning(f"Local vision model not available, image analysis will use basic methods: {str(e)}")
+        return None
+
+def _vision_backend_ready() -> bool:
+    """Return whether the configured vision backend can analyze images"""
+    if VISION_BACKEND == "local":
+        return _get_local_vision_model() is not None
+    return _get_openai_client() is not None
+
+def __getattr__(name):
+    # OPENAI_AVAILABLE ve client eski modül düzeyi adlarıyla erişilmeye devam eder, ancak tembel olarak çözülür
+    if name == "client":
+        return _get_openai_client()
+    if name == "OPENAI_AVAILABLE":
+        return _get_openai_client() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Importing logging configuration
 try:
@@ -71,14 +116,143 @@ except ImportError:
     # Fallback logging function if module not available
     def log_processed_content(content, content_type, module_name="neuradoc"):
         logger = logging.getLogger(module_name)
-        logger.info(f"Processed {content_type}: {len(str(content))} characters")
+        # İçeriği metne dönüştürmek büyük yapılarda pahalıdır; yalnızca üst düzey nesne boyutu loglanır
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processed %s: %d bytes (top-level)", content_type, sys.getsizeof(content))
+
+# Görsel analiz sonuçları görsel içeriğinin SHA-256 özetiyle diskte saklanır; aynı görsel tekrar analiz edilmez
+VISION_CACHE_DIR = os.environ.get(
+    "NEURADOC_VISION_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "neuradoc", "img_vision")
+)
+
+# Görsel analiz arka ucu: "openai" (varsayılan) veya ağ erişimi gerektirmeyen yerel "local" (Moondream2)
+VISION_BACKEND = os.environ.get("NEURADOC_VISION_BACKEND", "openai").strip().lower()
+LOCAL_VISION_MODEL = "vikhyatk/moondream2"
+# encode_image/answer_question arayüzünü sunan sabit model sürümü
+LOCAL_VISION_MODEL_REVISION = "2024-08-26"
+_VISION_PROMPT = "Bu görseli analiz et. Bu ne tür bir arayüz görseli ve test edilmesi gereken hangi unsurları içeriyor?"
+
+# Görsel analiz istekleri ağ gecikmesine bağlı olduğundan eşzamanlı gönderilir
+VISION_WORKERS = 8
+
+# Görsel model girdiyi zaten küçülttüğü için yükleme öncesi uzun kenar bu boyuta indirilir
+VISION_MAX_EDGE = 1024
+VISION_JPEG_QUALITY = 85
+
+# Metin çıkarım sonuçları dosya içeriğinin özetiyle bellekte tutulur
+TEXT_CACHE_SIZE = 32
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+def _content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest of the given bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def _file_hash(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _vision_cache_get(key: str) -> Optional[str]:
+    """Return the cached vision analysis for an image hash, or None"""
+    try:
+        with open(os.path.join(VISION_CACHE_DIR, f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f).get("analysis")
+    except (OSError, ValueError):
+        return None
 
-def extract_text(file_path: str) -> Optional[str]:
+def _vision_cache_put(key: str, analysis: str) -> None:
+    """Store a vision analysis for an image hash; failures only disable caching"""
+    try:
+        os.makedirs(VISION_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(VISION_CACHE_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump({"analysis": analysis}, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"Görsel analiz önbelleğine yazılamadı: {str(e)}")
+
+# _open_document ile açık tutulan DOCX belgelerinin gövde bloklarının önbelleği (id(doc) -> (paragraflar, tablolar))
+_docx_block_cache = {}
+
+@contextmanager
+def _open_document(file_path: str, doc=None, ext: Optional[str] = None):
+    """
+    Open a PDF (PyMuPDF) or DOCX (python-docx) document once for all extractors
+    
+    Yields the given handle unchanged when one is already open, so nested
+    callers share a single parse. Yields None for other formats or when the
+    parser library is unavailable or cannot open the file.
+    """
+    if doc is not None:
+        yield doc
+        return
+    
+    file_extension = ext if ext is not None else os.path.splitext(file_path)[1].lower()
+    opened = None
+    try:
+        if file_extension == '.pdf':
+            import fitz  # PyMuPDF
+            opened = fitz.open(file_path)
+        elif file_extension == '.docx':
+            import docx
+            opened = docx.Document(file_path)
+    except ImportError:
+        logger.warning(f"Parser library not available for {file_extension} documents")
+    except Exception as e:
+        logger.warning(f"Error opening document {file_path}: {str(e)}")
+    
+    # Açık DOCX belgeleri için gövde taraması _docx_blocks tarafından bir kez yapılıp paylaşılır
+    if opened is not None and file_extension == '.docx':
+        _docx_block_cache[id(opened)] = None
+    
+    try:
+        yield opened
+    finally:
+        if opened is not None and file_extension == '.pdf':
+            opened.close()
+        _docx_block_cache.pop(id(opened), None)
+
+def _docx_blocks(doc) -> Tuple[list, list]:
+    """
+    Return the top-level paragraphs and tables of a DOCX body from a single walk
+    
+    python-docx rebuilds doc.paragraphs and doc.tables from the XML on every
+    access; here the body is scanned once and, for documents opened through
+    _open_document, the result is shared by all extractors.
+    """
+    blocks = _docx_block_cache.get(id(doc))
+    if blocks is not None:
+        return blocks
+    
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+    
+    paragraphs, tables = [], []
+    for child in doc.element.body.iterchildren():
+        if child.tag == _W_P:
+            paragraphs.append(Paragraph(child, doc))
+        elif child.tag == _W_TBL:
+            tables.append(Table(child, doc))
+    
+    blocks = (paragraphs, tables)
+    if id(doc) in _docx_block_cache:
+        _docx_block_cache[id(doc)] = blocks
+    return blocks
+
+def extract_text(file_path: str, doc=None, ext: Optional[str] = None) -> Optional[str]:
     """
     Extract text content from a document file
     
+    Results are cached by the SHA-256 of the file contents, so an unchanged
+    file is not parsed again.
+    
     Args:
         file_path (str): Path to the document file
+        doc: Optional document handle already opened by _open_document
+        ext (str, optional): Lower-cased file extension, if already known
         
     Returns:
         str or None: Extracted text content or None if extraction failed
@@ -86,44 +260,86 @@ def extract_text(file_path: str) -> Optional[str]:
     if not os.path.exists(file_path):
         logger.error(f"File not found: {file_path}")
         return None
-        
-    file_extension = os.path.splitext(file_path)[1].lower()
     
+    if ext is None:
+        ext = os.path.splitext(file_path)[1].lower()
+    
+    key = (_file_hash(file_path), ext)
+    with _text_cache_lock:
+        if key in _text_cache:
+            _text_cache.move_to_end(key)
+            return _text_cache[key]
+    
+    text = _extract_text_uncached(file_path, doc, ext)
+    if text is not None:
+        with _text_cache_lock:
+            _text_cache[key] = text
+            while len(_text_cache) > TEXT_CACHE_SIZE:
+                _text_cache.popitem(last=False)
+    return text
+
+def _iter_pdf_pages(file_path: str, doc=None) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order
+    
+    Uses PyMuPDF when available and PyPDF2 otherwise; raises ImportError if
+    neither is installed. Pages are produced one at a time, so callers that
+    can work incrementally never hold the whole document text.
+    """
+    # PyMuPDF (MuPDF C motoru) metin çıkarımında PyPDF2'den çok daha hızlıdır
+    with _open_document(file_path, doc, '.pdf') as pdf:
+        if pdf is not None:
+            for page in pdf:
+                yield page.get_text()
+            return
+    logger.warning("PyMuPDF not available, falling back to PyPDF2 for PDF text extraction")
+    
+    import PyPDF2
+    with open(file_path, 'rb') as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            yield page.extract_text() or ""
+
+def _extract_text_pdf(file_path: str, doc=None) -> str:
+    """Extract PDF text with PyMuPDF, falling back to PyPDF2"""
+    try:
+        return "\n\n".join(_iter_pdf_pages(file_path, doc))
+    except ImportError:
+        logger.warning("PyPDF2 not available, trying alternative PDF extraction")
+        # Fallback to basic extraction
+        return f"PDF İçeriği: {os.path.basename(file_path)}"
+
+def _extract_text_docx(file_path: str, doc=None) -> str:
+    """Extract DOCX paragraph text with python-docx"""
+    with _open_document(file_path, doc, '.docx') as docx_doc:
+        if docx_doc is not None:
+            paragraphs, _ = _docx_blocks(docx_doc)
+            return "\n\n".join([para.text for para in paragraphs])
+    logger.warning("python-docx not available, trying alternative DOCX extraction")
+    # Fallback to basic extraction
+    return f"DOCX İçeriği: {os.path.basename(file_path)}"
+
+def _extract_text_txt(file_path: str, doc=None) -> str:
+    """Read a plain text file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _extract_text_generic(file_path: str, doc=None) -> str:
+    """Fallback for formats without a text extractor"""
+    logger.warning(f"Unsupported file format for text extraction: {os.path.splitext(file_path)[1].lower()}")
+    return f"Dosya İçeriği: {os.path.basename(file_path)}"
+
+# Dosya uzantısına göre metin çıkarıcılar; yeni biçimler buraya eklenir
+_TEXT_EXTRACTORS = {
+    '.pdf': _extract_text_pdf,
+    '.docx': _extract_text_docx,
+    '.txt': _extract_text_txt,
+}
+
+def _extract_text_uncached(file_path: str, doc, file_extension: str) -> Optional[str]:
+    """Extract text content from a document file without consulting the cache"""
     try:
         # Extract text based on file type
-        if file_extension == '.pdf':
-            try:
-                import PyPDF2
-                text = ""
-                with open(file_path, 'rb') as f:
-                    pdf = PyPDF2.PdfReader(f)
-                    for page_num in range(len(pdf.pages)):
-                        text += pdf.pages[page_num].extract_text() + "\n\n"
-                return text
-            except ImportError:
-                logger.warning("PyPDF2 not available, trying alternative PDF extraction")
-                # Fallback to basic extraction
-                return f"PDF İçeriği: {os.path.basename(file_path)}"
-                
-        elif file_extension == '.docx':
-            try:
-                import docx
-                doc = docx.Document(file_path)
-                text = "\n\n".join([para.text for para in doc.paragraphs])
-                return text
-            except ImportError:
-                logger.warning("python-docx not available, trying alternative DOCX extraction")
-                # Fallback to basic extraction
-                return f"DOCX İçeriği: {os.path.basename(file_path)}"
-                
-        elif file_extension == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-                
-        else:
-            logger.warning(f"Unsupported file format for text extraction: {file_extension}")
-            return f"Dosya İçeriği: {os.path.basename(file_path)}"
-            
+        return _TEXT_EXTRACTORS.get(file_extension, _extract_text_generic)(file_path, doc)
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {str(e)}")
         return None
@@ -159,20 +375,37 @@ def get_document_structure(file_path: str) -> Dict[str, Any]:
             "image_analysis_score": 100.0,  # Always set to 100%
         }
         
-        # Extract text content
-        text_content = extract_text(file_path)
+        # Belge bir kez açılır ve metin, görsel ve tablo çıkarımı aynı nesneyi paylaşır.
+        # Çıkarımlar eşzamanlı çalışır; görsel analizinin ağ beklemesi metin ve tablo XML işlemiyle örtüşür.
+        # Havuz, belge kapanmadan önce tüm işlerin bitmesini bekler.
+        with _open_document(file_path, ext=file_extension) as doc, ThreadPoolExecutor(max_workers=3) as executor:
+            # Extract tables - enhanced for better test scenario generation
+            tables_future = executor.submit(_extract_tables, file_path, doc, file_extension)
+            
+            if file_extension == '.pdf':
+                # PyMuPDF belgeleri iş parçacıkları arasında güvenle paylaşılamaz; metin ve görseller aynı iş parçacığında sırayla çıkarılır
+                pdf_future = executor.submit(
+                    lambda: (extract_text(file_path, doc=doc, ext=file_extension),
+                             _extract_images(file_path, doc=doc, ext=file_extension))
+                )
+                text_content, images = pdf_future.result()
+            else:
+                # Extract text content
+                text_future = executor.submit(extract_text, file_path, doc, file_extension)
+                # Extract images - enhanced for better test scenario generation
+                images_future = executor.submit(_extract_images, file_path, doc, file_extension)
+                text_content, images = text_future.result(), images_future.result()
+            
+            tables = tables_future.result()
+        
         if text_content:
             structure["text_content"] = text_content
             structure["text_length"] = len(text_content)
         
-        # Extract images - enhanced for better test scenario generation
-        images = _extract_images(file_path)
         if images:
             structure["images"] = images
             structure["image_count"] = len(images)
             
-        # Extract tables - enhanced for better test scenario generation
-        tables = _extract_tables(file_path)
         if tables:
             structure["tables"] = tables
             structure["table_count"] = len(tables)
@@ -205,350 +438,541 @@ def get_document_structure(file_path: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
-def _extract_images(file_path: str) -> List[Dict[str, Any]]:
-    """Extract images from the document with enhanced analysis"""
-    images = []
-    file_extension = os.path.splitext(file_path)[1].lower()
-    
-    # Generate some placeholder images to ensure we always have content
-    # These will be replaced with real images if extraction succeeds
-    sample_images = [
-        {
-            "id": "img1",
-            "description": "Kullanıcı Arayüzü - Ana Ekran",
-            "type": "UI Screen",
-            "test_relevance": "High",
-            "test_scenarios": [
-                {
-                    "title": "Ana Ekran Görünüm Testi",
-                    "description": "Ana ekranın tüm öğelerinin doğru görüntülendiğini doğrulama",
-                    "steps": "1. Ana ekranı aç\n2. Tüm görsel elemanları kontrol et",
-                    "expected_results": "Tüm elemanlar doğru yerleşimde ve boyutta olmalı"
-                }
-            ]
-        },
-        {
-            "id": "img2",
-            "description": "Rapor Ekranı - Veri Görselleştirme",
-            "type": "Data Visualization",
-            "test_relevance": "Medium",
-            "test_scenarios": [
-                {
-                    "title": "Rapor Görselleştirme Testi",
-                    "description": "Rapor grafiklerinin doğru verileri gösterdiğini doğrulama",
-                    "steps": "1. Rapor ekranını aç\n2. Grafikleri kontrol et",
-                    "expected_results": "Grafikler doğru veri setini göstermeli"
+# Gerçek görsel çıkarılamadığında kullanılan örnek görseller; çağıranlar sözlükleri değiştirdiği için kopyalanarak döndürülür
+_SAMPLE_IMAGES = (
+    {
+        "id": "img1",
+        "description": "Kullanıcı Arayüzü - Ana Ekran",
+        "type": "UI Screen",
+        "test_relevance": "High",
+        "test_scenarios": [
+            {
+                "title": "Ana Ekran Görünüm Testi",
+                "description": "Ana ekranın tüm öğelerinin doğru görüntülendiğini doğrulama",
+                "steps": "1. Ana ekranı aç\n2. Tüm görsel elemanları kontrol et",
+                "expected_results": "Tüm elemanlar doğru yerleşimde ve boyutta olmalı"
+            }
+        ]
+    },
+    {
+        "id": "img2",
+        "description": "Rapor Ekranı - Veri Görselleştirme",
+        "type": "Data Visualization",
+        "test_relevance": "Medium",
+        "test_scenarios": [
+            {
+                "title": "Rapor Görselleştirme Testi",
+                "description": "Rapor grafiklerinin doğru verileri gösterdiğini doğrulama",
+                "steps": "1. Rapor ekranını aç\n2. Grafikleri kontrol et",
+                "expected_results": "Grafikler doğru veri setini göstermeli"
+            }
+        ]
+    }
+)
+
+def _extract_pdf_images(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """Extract the embedded images of a PDF with PyMuPDF"""
+    # Gömülü görsel akışları extract_image ile doğrudan okunur (Pixmap ile yeniden render edilmez)
+    real_images = []
+    # Birden çok sayfada kullanılan görsel (logo, başlık görseli) aynı xref'i paylaşır ve bir kez okunur
+    extracted = {}
+    with _open_document(file_path, doc, '.pdf') as doc:
+        if doc is None:
+            raise ImportError("PyMuPDF not available")
+        for page in doc:
+            for img_info in page.get_images(full=True):
+                xref = img_info[0]
+                if xref not in extracted:
+                    extracted[xref] = doc.extract_image(xref)
+                base_image = extracted[xref]
+                if not base_image:
+                    continue
+
+                image_idx = len(real_images) + 1
+                image_bytes = base_image["image"]
+                image_format = base_image["ext"]
+                if image_format == 'jpeg':
+                    image_format = 'jpg'
+
+                real_image = {
+                    "id": f"img{image_idx}",
+                    "description": f"Doküman görseli {image_idx} (Sayfa {page.number + 1})",
+                    "type": "Document Image",
+                    "test_relevance": "Medium",
+                    "image_data": image_bytes,
+                    "format": image_format,
+                    "page": page.number + 1
                 }
-            ]
-        }
-    ]
+                real_images.append(real_image)
+    return real_images
+
+_RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CONTENT_TYPES_NS = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+_RT_IMAGE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+
+def _docx_body_image_parts(archive) -> List[Tuple[str, str]]:
+    """
+    Return (part name, content type) of the images referenced by the DOCX body
     
-    # Artık, gerçek görseller bulunduğunda bu örnek görseller temizlenecek
-    # Sadece fallback olarak burada tutuyoruz - önce ekleyip sonra gerçek görseller bulunduğunda temizleyeceğiz
-    if file_extension != '.docx':
-        # Sadece DOCX dışındaki belge türlerinde örnek görselleri ekle
-        # Çünkü DOCX için kendi gerçek görsel çıkarma işlemimiz var
-        images.extend(sample_images)
+    Like python-docx's doc.part.rels filtered to RT.IMAGE: only images related to
+    word/document.xml are returned (not header/footer or stray media files), and
+    each part's content type comes from [Content_Types].xml.
+    """
+    import posixpath
+    import xml.etree.ElementTree as ET
     
-    # For PDF files, try to extract actual images
-    if file_extension == '.pdf':
-        try:
-            import PyPDF2
-            with open(file_path, 'rb') as f:
-                pdf = PyPDF2.PdfReader(f)
-                # Note: This is a simplified placeholder - real image extraction would go here
-                logger.info(f"PDF contains {len(pdf.pages)} pages with potential images")
-        except (ImportError, Exception) as e:
-            logger.warning(f"Error extracting PDF images: {str(e)}")
+    content_types = ET.fromstring(archive.read('[Content_Types].xml'))
+    defaults = {
+        element.get('Extension', '').lower(): element.get('ContentType', '')
+        for element in content_types.iter(f"{_CONTENT_TYPES_NS}Default")
+    }
+    overrides = {
+        element.get('PartName', '').lstrip('/'): element.get('ContentType', '')
+        for element in content_types.iter(f"{_CONTENT_TYPES_NS}Override")
+    }
+    
+    try:
+        rels = ET.fromstring(archive.read('word/_rels/document.xml.rels'))
+    except KeyError:
+        return []
+    
+    parts = []
+    seen = set()
+    for rel in rels.iter(f"{_RELS_NS}Relationship"):
+        if rel.get('Type') != _RT_IMAGE or rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        part_name = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('word', target))
+        if part_name in seen:
+            continue
+        seen.add(part_name)
+        
+        extension = part_name.rsplit('.', 1)[-1].lower()
+        content_type = overrides.get(part_name) or defaults.get(extension, '')
+        if content_type.startswith('image/'):
+            parts.append((part_name, content_type))
+    return parts
+
+def _image_format_from_content_type(content_type: str) -> str:
+    """Short image format for a MIME type: image/jpeg -> jpg, image/x-emf -> emf, image/svg+xml -> svg"""
+    image_format = content_type.split('/', 1)[1].split('+', 1)[0].lower()
+    if image_format.startswith('x-'):
+        image_format = image_format[2:]
+    return 'jpg' if image_format == 'jpeg' else image_format
+
+def _extract_docx_images(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """Extract the images referenced by the body of a DOCX archive"""
+    import zipfile
     
-    # For DOCX files, try to extract actual images
-    elif file_extension == '.docx':
+    # Gerçek görselleri çıkar
+    real_images = []
+
+    # DOCX bir ZIP arşividir; görsel baytları python-docx XML ağacı kurulmadan, gövdenin görsel
+    # ilişkilerinden (document.xml.rels) bulunan parçalardan okunur
+    with zipfile.ZipFile(file_path) as archive:
+        for image_idx, (name, content_type) in enumerate(_docx_body_image_parts(archive), 1):
+            try:
+                # Resim verisini al
+                image_bytes = archive.read(name)
+
+                # Resim formatı uzantıdan değil, parçanın içerik türünden belirlenir
+                image_format = _image_format_from_content_type(content_type)
+
+                # Gerçek resim öğesini ekle
+                real_image = {
+                    "id": f"img{image_idx}",
+                    "description": f"Doküman görseli {image_idx}",
+                    "type": "Document Image",
+                    "test_relevance": "Medium",
+                    "image_data": image_bytes,
+                    "format": image_format
+                }
+
+                # Görseli listeye ekle
+                real_images.append(real_image)
+
+            except Exception as img_error:
+                logger.warning(f"Görsel çıkarma hatası: {str(img_error)}")
+    return real_images
+
+# Dosya uzantısına göre gerçek görsel çıkarıcılar
+_IMAGE_EXTRACTORS = {
+    '.pdf': _extract_pdf_images,
+    '.docx': _extract_docx_images,
+}
+
+def _extract_images(file_path: str, doc=None, ext: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract images from the document with enhanced analysis"""
+    images = []
+    file_extension = ext if ext is not None else os.path.splitext(file_path)[1].lower()
+    
+    # Desteklenen biçimlerde gerçek görselleri çıkarmayı dene
+    extractor = _IMAGE_EXTRACTORS.get(file_extension)
+    if extractor is not None:
+        kind = file_extension[1:].upper()
         try:
-            import docx
-            from docx.document import Document
-            from docx.oxml.text.paragraph import CT_P
-            from docx.oxml.table import CT_Tbl
-            from docx.table import _Cell, Table
-            from docx.text.paragraph import Paragraph
+            real_images = extractor(file_path, doc)
             
-            doc = docx.Document(file_path)
+            # OpenAI görsel analizi yapabiliyorsa, görselleri analiz et
+            _analyze_images(real_images)
             
-            # Gerçek görselleri çıkar
-            real_images = []
-            image_idx = 0
-            
-            # Doküman içindeki tüm ilişkili parçaları bul
-            rels = doc.part.rels
-            for rel in rels.values():
-                # Resim ilişkileri kontrol et
-                if "image" in rel.reltype:
-                    try:
-                        image_idx += 1
-                        # Resim verisini al
-                        image_part = rel.target_part
-                        image_bytes = image_part.blob
-                        
-                        # Resim formatını belirle 
-                        image_format = image_part.content_type.split('/')[-1]
-                        if image_format == 'jpeg':
-                            image_format = 'jpg'
-                        
-                        # Resim dosya adını al
-                        image_name = f"image{image_idx}.{image_format}"
-                        
-                        # Resim tanımlama ve açıklama oluştur
-                        image_description = f"Doküman görseli {image_idx}"
-                        
-                        # Gerçek resim öğesini ekle
-                        real_image = {
-                            "id": f"img{image_idx}",
-                            "description": image_description,
-                            "type": "Document Image",
-                            "test_relevance": "Medium",
-                            "image_data": image_bytes,
-                            "format": image_format
-                        }
-                        
-                        # OpenAI görsel analizi yapabiliyorsa, görseli analiz et
-                        if OPENAI_AVAILABLE and client:
-                            try:
-                                import base64
-                                # Görseli base64'e dönüştür
-                                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                                
-                                # Anlama isteği gönder
-                                response = client.chat.completions.create(
-                                    model="gpt-4o",
-                                    messages=[
-                                        {"role": "system", "content": "Bu görseli analiz et ve test senaryoları için uygunluğunu değerlendir."},
-                                        {"role": "user", "content": [
-                                            {"type": "text", "text": "Bu görseli analiz et. Bu ne tür bir arayüz görseli ve test edilmesi gereken hangi unsurları içeriyor?"},
-                                            {"type": "image_url", "image_url": {"url": f"data:image/{image_format};base64,{image_base64}"}}
-                                        ]}
-                                    ],
-                                    max_tokens=500
-                                )
-                                
-                                # Yanıtı işle
-                                analysis = response.choices[0].message.content
-                                
-                                # Zenginleştirilmiş açıklama ve test senaryoları oluştur
-                                real_image["description"] = analysis.split("\n")[0] if "\n" in analysis else analysis[:100]
-                                real_image["test_scenarios"] = [
-                                    {
-                                        "title": f"Görsel Doğrulama: {real_image['description'][:30]}...",
-                                        "description": f"Bu görselin içeriğini doğrulama testi: {analysis[:200]}...",
-                                        "steps": "1. İlgili ekranı aç\n2. Görsellerin doğru şekilde yüklendiğini kontrol et\n3. Görselin içeriğini doğrula",
-                                        "expected_results": "Görsel doğru şekilde görüntülenmeli ve içeriği sunulan bilgilerle eşleşmeli"
-                                    }
-                                ]
-                                
-                                logger.info(f"Görsel analizi tamamlandı: {real_image['description'][:50]}...")
-                                
-                            except Exception as img_analysis_error:
-                                logger.warning(f"Görsel analizi sırasında hata oluştu: {str(img_analysis_error)}")
-                                # Analiz başarısız olsa bile görseli ekle, sadece basit test senaryosu oluştur
-                                real_image["test_scenarios"] = [
-                                    {
-                                        "title": f"Görsel {image_idx} Doğrulama Testi",
-                                        "description": f"Doküman içindeki {image_idx}. görselin doğru şekilde gösterilip gösterilmediğini doğrula",
-                                        "steps": "1. İlgili ekranı aç\n2. Görselin varlığını kontrol et",
-                                        "expected_results": "Görsel doğru şekilde görüntülenmeli"
-                                    }
-                                ]
-                        
-                        # Görseli listeye ekle
-                        real_images.append(real_image)
-                        
-                    except Exception as img_error:
-                        logger.warning(f"Görsel çıkarma hatası: {str(img_error)}")
-            
-            # Gerçek görselleri sadece boş değilse ekle
             if real_images:
-                # Var olan örnek görselleri temizle ve gerçek görselleri ekle
-                images.clear()
                 images.extend(real_images)
-                logger.info(f"DOCX belgeden {len(real_images)} gerçek görsel çıkarıldı")
+                logger.info(f"{kind} belgeden {len(real_images)} gerçek görsel çıkarıldı")
             else:
-                # Gerçek görsel yoksa, önceden eklenen sample_images kalacak
-                logger.info(f"DOCX belgede gerçek görsel bulunamadı, örnek görseller kullanılıyor")
-                
+                logger.info(f"{kind} belgede gerçek görsel bulunamadı")
         except (ImportError, Exception) as e:
-            logger.warning(f"Error extracting DOCX images: {str(e)}")
+            logger.warning(f"Error extracting {kind} images: {str(e)}")
+    
+    # Gerçek görsel çıkarılamadıysa DOCX dışındaki belgelerde örnek görseller kullanılır
+    # (DOCX için kendi gerçek görsel çıkarma işlemimiz var)
+    if not images and file_extension != '.docx':
+        images.extend(copy.deepcopy(_SAMPLE_IMAGES))
     
     logger.info(f"Extracted {len(images)} images from document")
     return images
 
-def _extract_tables(file_path: str) -> List[Dict[str, Any]]:
-    """Extract tables from the document with enhanced analysis"""
-    tables = []
-    file_extension = os.path.splitext(file_path)[1].lower()
+def _analyze_images(real_images: List[Dict[str, Any]]) -> None:
+    """Analyze all extracted images, issuing the vision requests concurrently (once per distinct image)"""
+    if not real_images or not _vision_backend_ready():
+        return
     
-    # Generate some placeholder tables to ensure we always have content
-    # These will be replaced with real tables if extraction succeeds
-    sample_tables = [
-        {
-            "id": "table1",
-            "caption": "Fonksiyonel Gereksinimler",
-            "headers": ["ID", "Gereksinim", "Öncelik"],
-            "data": [
-                ["FR-001", "Kullanıcı giriş yapabilmeli", "Yüksek"],
-                ["FR-002", "Kullanıcı rapor oluşturabilmeli", "Orta"],
-                ["FR-003", "Kullanıcı ayarları değiştirebilmeli", "Düşük"]
-            ],
-            "test_scenarios": [
+    # Aynı içerikli görseller (her sayfadaki logo gibi) bir kez analiz edilir; sonuç kopyalara aktarılır
+    groups = defaultdict(list)
+    for image_idx, real_image in enumerate(real_images, 1):
+        groups[_content_hash(real_image["image_data"])].append((image_idx, real_image))
+    
+    def analyze_one(group):
+        content_hash, indexed_images = group
+        image_idx, real_image = indexed_images[0]
+        _analyze_image(real_image, real_image["image_data"], real_image["format"], image_idx, content_hash)
+        for _, duplicate in indexed_images[1:]:
+            if "description" in real_image:
+                duplicate["description"] = real_image["description"]
+            if "test_scenarios" in real_image:
+                duplicate["test_scenarios"] = copy.deepcopy(real_image["test_scenarios"])
+    
+    unique_groups = list(groups.items())
+    # Yerel model CPU/GPU'ya bağlıdır, eşzamanlı çağrı kazandırmaz; tek görsel de sıralı işlenir
+    if len(unique_groups) == 1 or VISION_BACKEND == "local":
+        for group in unique_groups:
+            analyze_one(group)
+        return
+    
+    # Her grup yalnızca kendi görsel sözlüklerini günceller, bu yüzden iş parçacıkları arasında paylaşım yoktur
+    with ThreadPoolExecutor(max_workers=min(VISION_WORKERS, len(unique_groups))) as executor:
+        list(executor.map(analyze_one, unique_groups))
+
+def _prepare_vision_upload(image_bytes: bytes, image_format: str) -> Tuple[bytes, str]:
+    """Downscale and re-encode an image as JPEG for upload; returns the original if Pillow cannot handle it"""
+    Image = _get_pil_image()
+    if Image is None:
+        return image_bytes, image_format
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
+            buffer = io.BytesIO()
+            img.convert('RGB').save(buffer, 'JPEG', quality=VISION_JPEG_QUALITY, optimize=True)
+        return buffer.getvalue(), 'jpeg'
+    except Exception as e:
+        logger.debug(f"Görsel küçültülemedi, orijinal gönderiliyor: {str(e)}")
+        return image_bytes, image_format
+
+def _request_image_analysis(image_bytes: bytes, image_format: str) -> str:
+    """Analyze one image with the configured vision backend and return the analysis text"""
+    # Orijinal görsel image_data içinde kalır; modele küçültülmüş kopya gönderilir
+    image_bytes, image_format = _prepare_vision_upload(image_bytes, image_format)
+    
+    if VISION_BACKEND == "local":
+        return _request_local_image_analysis(image_bytes)
+    return _request_openai_image_analysis(image_bytes, image_format)
+
+def _request_local_image_analysis(image_bytes: bytes) -> str:
+    """Caption one image with the local Moondream2 model"""
+    model, tokenizer = _get_local_vision_model()
+    with _get_pil_image().open(io.BytesIO(image_bytes)) as img:
+        encoded_image = model.encode_image(img.convert('RGB'))
+    return model.answer_question(encoded_image, _VISION_PROMPT, tokenizer)
+
+def _request_openai_image_analysis(image_bytes: bytes, image_format: str) -> str:
+    """Send one image to the OpenAI vision model and return the analysis text"""
+    # Görseli base64'e dönüştür; küçültülmüş baytlar tek seferde kodlanır ve veri URL'i bir kez oluşturulur
+    data_url = f"data:image/{image_format};base64," + base64.b64encode(image_bytes).decode('ascii')
+    
+    # Anlama isteği gönder
+    response = _get_openai_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Bu görseli analiz et ve test senaryoları için uygunluğunu değerlendir."},
+            {"role": "user", "content": [
+                {"type": "text", "text": _VISION_PROMPT},
+                {"type": "image_url", "image_url": {"url": data_url}}
+            ]}
+        ],
+        max_tokens=200
+    )
+    return response.choices[0].message.content
+
+def _analyze_image(real_image: Dict[str, Any], image_bytes: bytes, image_format: str, image_idx: int,
+                   content_hash: Optional[str] = None) -> None:
+    """Analyze an extracted image with the vision backend and attach description and test scenarios to it"""
+    if _vision_backend_ready():
+        try:
+            # Aynı görsel daha önce analiz edildiyse model çağrısı yapılmaz; arka uçların sonuçları ayrı tutulur
+            cache_key = content_hash or _content_hash(image_bytes)
+            if VISION_BACKEND == "local":
+                cache_key = f"local-{cache_key}"
+            analysis = _vision_cache_get(cache_key)
+            if analysis is None:
+                analysis = _request_image_analysis(image_bytes, image_format)
+                _vision_cache_put(cache_key, analysis)
+            else:
+                logger.info(f"Görsel analizi önbellekten alındı: {cache_key[:12]}")
+
+            # Zenginleştirilmiş açıklama ve test senaryoları oluştur
+            real_image["description"] = analysis.split("\n")[0] if "\n" in analysis else analysis[:100]
+            real_image["test_scenarios"] = [
                 {
-                    "title": "Kullanıcı Giriş İşlevi Testi",
-                    "description": "Kullanıcının sisteme başarılı şekilde giriş yapabilmesini doğrulama",
-                    "steps": "1. Giriş sayfasını aç\n2. Geçerli kullanıcı bilgileri gir\n3. Giriş butonuna tıkla",
-                    "expected_results": "Kullanıcı başarıyla giriş yapabilmeli ve ana sayfaya yönlendirilmeli"
+                    "title": f"Görsel Doğrulama: {real_image['description'][:30]}...",
+                    "description": f"Bu görselin içeriğini doğrulama testi: {analysis[:200]}...",
+                    "steps": "1. İlgili ekranı aç\n2. Görsellerin doğru şekilde yüklendiğini kontrol et\n3. Görselin içeriğini doğrula",
+                    "expected_results": "Görsel doğru şekilde görüntülenmeli ve içeriği sunulan bilgilerle eşleşmeli"
                 }
             ]
-        },
-        {
-            "id": "table2",
-            "caption": "Test Senaryoları",
-            "headers": ["ID", "Senaryo", "Adımlar", "Beklenen Sonuç"],
-            "data": [
-                ["TS-001", "Login Test", "1. Kullanıcı adı ve şifre gir\n2. Giriş yap", "Başarılı giriş"],
-                ["TS-002", "Rapor Oluşturma", "1. Rapor sayfasına git\n2. Tarih seç\n3. Oluştur", "Rapor oluşturuldu"]
-            ],
-            "test_scenarios": [
+
+            logger.info(f"Görsel analizi tamamlandı: {real_image['description'][:50]}...")
+
+        except Exception as img_analysis_error:
+            logger.warning(f"Görsel analizi sırasında hata oluştu: {str(img_analysis_error)}")
+            # Analiz başarısız olsa bile görseli ekle, sadece basit test senaryosu oluştur
+            real_image["test_scenarios"] = [
                 {
-                    "title": "Kullanıcı Rapor Oluşturma Testi",
-                    "description": "Kullanıcının rapor oluşturma işlevini doğrulama",
-                    "steps": "1. Rapor sayfasına git\n2. Tarih seç\n3. Oluştur butonuna tıkla",
-                    "expected_results": "Rapor başarıyla oluşturulmalı ve görüntülenmeli"
+                    "title": f"Görsel {image_idx} Doğrulama Testi",
+                    "description": f"Doküman içindeki {image_idx}. görselin doğru şekilde gösterilip gösterilmediğini doğrula",
+                    "steps": "1. İlgili ekranı aç\n2. Görselin varlığını kontrol et",
+                    "expected_results": "Görsel doğru şekilde görüntülenmeli"
                 }
             ]
-        }
-    ]
-    
-    # Artık, gerçek tablolar bulunduğunda bu örnek tablolar temizlenecek
-    # Sadece fallback olarak burada tutuyoruz - önce ekleyip sonra gerçek tablolar bulunduğunda temizleyeceğiz
-    if file_extension != '.docx':
-        # Sadece DOCX dışındaki belge türlerinde örnek tabloları ekle
-        # Çünkü DOCX için kendi gerçek tablo çıkarma işlemimiz var
-        tables.extend(sample_tables)
+
+# WordprocessingML ad alanı; tablo hücreleri python-docx nesneleri kurulmadan doğrudan XML'den okunur
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = f"{_W_NS}p"
+_W_TBL = f"{_W_NS}tbl"
+_W_R = f"{_W_NS}r"
+_W_T = f"{_W_NS}t"
+_W_TAB = f"{_W_NS}tab"
+_W_LINE_BREAKS = (f"{_W_NS}br", f"{_W_NS}cr")
+_W_HYPERLINK = f"{_W_NS}hyperlink"
+_W_VAL = f"{_W_NS}val"
+
+def _paragraph_xml_text(p) -> str:
+    """Text of a w:p element like python-docx's Paragraph.text (runs and hyperlinks, tabs and line breaks)"""
+    parts = []
+    for child in p.iterchildren(_W_R, _W_HYPERLINK):
+        runs = (child,) if child.tag == _W_R else child.iterchildren(_W_R)
+        for run in runs:
+            for item in run.iterchildren():
+                if item.tag == _W_T:
+                    parts.append(item.text or "")
+                elif item.tag == _W_TAB:
+                    parts.append("\t")
+                elif item.tag in _W_LINE_BREAKS:
+                    parts.append("\n")
+    return "".join(parts)
+
+def _table_rows_text(tbl) -> List[List[str]]:
+    """
+    Return the stripped text of every cell of a w:tbl element, row by row
     
-    # For PDF files, try to extract actual tables
-    if file_extension == '.pdf':
+    Matches python-docx's row.cells: a horizontally merged cell (gridSpan) is
+    repeated for each grid column it spans and a vertically merged continuation
+    cell (vMerge) repeats the text of the cell above it.
+    """
+    rows = []
+    previous_row = {}
+    for tr in tbl.iterchildren(f"{_W_NS}tr"):
+        row_texts = []
+        current_row = {}
+        for tc in tr.iterchildren(f"{_W_NS}tc"):
+            grid_column = len(row_texts)
+            span = tc.find(f"{_W_NS}tcPr/{_W_NS}gridSpan")
+            merge = tc.find(f"{_W_NS}tcPr/{_W_NS}vMerge")
+            if merge is not None and merge.get(_W_VAL, "continue") == "continue" and grid_column in previous_row:
+                text = previous_row[grid_column]
+            else:
+                text = "\n".join(_paragraph_xml_text(p) for p in tc.iterchildren(_W_P)).strip()
+            
+            for column in range(grid_column, grid_column + (int(span.get(_W_VAL, 1)) if span is not None else 1)):
+                current_row[column] = text
+                row_texts.append(text)
+        
+        rows.append(row_texts)
+        previous_row = current_row
+    return rows
+
+# Gerçek tablo çıkarılamadığında kullanılan örnek tablolar; çağıranlar sözlükleri değiştirdiği için kopyalanarak döndürülür
+_SAMPLE_TABLES = (
+    {
+        "id": "table1",
+        "caption": "Fonksiyonel Gereksinimler",
+        "headers": ["ID", "Gereksinim", "Öncelik"],
+        "data": [
+            ["FR-001", "Kullanıcı giriş yapabilmeli", "Yüksek"],
+            ["FR-002", "Kullanıcı rapor oluşturabilmeli", "Orta"],
+            ["FR-003", "Kullanıcı ayarları değiştirebilmeli", "Düşük"]
+        ],
+        "test_scenarios": [
+            {
+                "title": "Kullanıcı Giriş İşlevi Testi",
+                "description": "Kullanıcının sisteme başarılı şekilde giriş yapabilmesini doğrulama",
+                "steps": "1. Giriş sayfasını aç\n2. Geçerli kullanıcı bilgileri gir\n3. Giriş butonuna tıkla",
+                "expected_results": "Kullanıcı başarıyla giriş yapabilmeli ve ana sayfaya yönlendirilmeli"
+            }
+        ]
+    },
+    {
+        "id": "table2",
+        "caption": "Test Senaryoları",
+        "headers": ["ID", "Senaryo", "Adımlar", "Beklenen Sonuç"],
+        "data": [
+            ["TS-001", "Login Test", "1. Kullanıcı adı ve şifre gir\n2. Giriş yap", "Başarılı giriş"],
+            ["TS-002", "Rapor Oluşturma", "1. Rapor sayfasına git\n2. Tarih seç\n3. Oluştur", "Rapor oluşturuldu"]
+        ],
+        "test_scenarios": [
+            {
+                "title": "Kullanıcı Rapor Oluşturma Testi",
+                "description": "Kullanıcının rapor oluşturma işlevini doğrulama",
+                "steps": "1. Rapor sayfasına git\n2. Tarih seç\n3. Oluştur butonuna tıkla",
+                "expected_results": "Rapor başarıyla oluşturulmalı ve görüntülenmeli"
+            }
+        ]
+    }
+)
+
+def _extract_pdf_tables(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """PDF table extraction is not implemented; the sample tables are used instead"""
+    # Simplified placeholder - real table extraction would go here
+    logger.info(f"PDF processed for table extraction")
+    return []
+
+def _extract_docx_tables(file_path: str, doc=None) -> List[Dict[str, Any]]:
+    """Extract the top-level tables of a DOCX document"""
+    with _open_document(file_path, doc, '.docx') as doc:
+        if doc is None:
+            raise ImportError("python-docx not available")
+        _, doc_tables = _docx_blocks(doc)
+
+    # Belgeden gerçek tabloları çıkar
+    actual_table_count = len(doc_tables)
+    logger.info(f"DOCX contains {actual_table_count} tables")
+
+    # Gerçek tabloları işle
+    real_tables = []
+    for table_idx, doc_table in enumerate(doc_tables):
         try:
-            # Simplified placeholder - real table extraction would go here
-            logger.info(f"PDF processed for table extraction")
-        except Exception as e:
-            logger.warning(f"Error extracting PDF tables: {str(e)}")
+            table_idx_str = str(table_idx + 1).zfill(2)
+
+            # Hücre metinleri tablo XML'inden tek geçişte okunur
+            rows = _table_rows_text(doc_table._tbl)
+
+            # Tablo başlıklarını çıkar (ilk satır olarak kabul ediliyor)
+            headers = rows[0] if rows else []
+
+            # Tablo verilerini çıkar (ilk satır dışındaki satırlar)
+            # İlk satır zaten başlık olarak alındıysa atla, boş satırları filtrele
+            data = [row_data for row_data in rows[1 if headers else 0:] if any(row_data)]
+
+            # Başlıkları düzeltme kontrolü - boş veya geçersiz başlıkları düzelt
+            if not headers or all(not h for h in headers):
+                # Otomatik başlıklar oluştur
+                headers = [f"Sütun {i+1}" for i in range(len(doc_table.columns))]
+
+            # Tablodaki metni özetle
+            table_content = ' '.join([' '.join(row) for row in data])
+            table_preview = table_content[:100] + "..." if len(table_content) > 100 else table_content
+
+            # Tablo başlığını belirle - varsayılan veya tablonun üstündeki paragraftan
+            table_caption = f"Tablo {table_idx + 1}"
+
+            # Veri temizliği - boş hücreleri temizle
+            cleaned_data = []
+            for row in data:
+                # Boş hücreleri düzenle
+                cleaned_row = [cell if cell.strip() else "-" for cell in row]
+                cleaned_data.append(cleaned_row)
+
+            # Test senaryoları oluştur
+            test_scenarios = [
+                {
+                    "title": f"Tablo Doğrulama: {table_caption}",
+                    "description": f"Bu tablonun içeriğini doğrulama testi: {table_preview}",
+                    "steps": "1. İlgili ekranı aç\n2. Tablonun varlığını kontrol et\n3. Tablonun içeriğini doğrula",
+                    "expected_results": "Tablo doğru şekilde görüntülenmeli ve içeriği sunulan verilerle eşleşmeli"
+                }
+            ]
+
+            # Eğer tablo en az 4 satır içeriyorsa, bazı özel satırlar için test senaryoları oluştur
+            if len(cleaned_data) >= 4:
+                for row_idx in range(min(3, len(cleaned_data))):
+                    row_data = cleaned_data[row_idx]
+                    row_preview = ', '.join(row_data[:2]) 
+
+                    row_scenario = {
+                        "title": f"Satır Doğrulama: {row_preview}",
+                        "description": f"Bu satırın verilerini doğrulama: {', '.join(row_data)}",
+                        "steps": f"1. Tabloyu aç\n2. '{row_preview}' içeren satırı bul\n3. Tüm veriyi kontrol et",
+                        "expected_results": "Satır verisi doğru şekilde görüntülenmeli"
+                    }
+                    test_scenarios.append(row_scenario)
+
+            # Gerçek tablo verisi oluştur
+            real_table = {
+                "id": f"table{table_idx_str}",
+                "caption": table_caption,
+                "headers": headers,
+                "data": cleaned_data,
+                "test_scenarios": test_scenarios,
+                "preview": table_preview
+            }
+
+            # Tablolara ekle
+            real_tables.append(real_table)
+
+        except Exception as table_error:
+            logger.warning(f"Tablo {table_idx + 1} çıkarma hatası: {str(table_error)}")
+    return real_tables
+
+# Dosya uzantısına göre gerçek tablo çıkarıcılar
+_TABLE_EXTRACTORS = {
+    '.pdf': _extract_pdf_tables,
+    '.docx': _extract_docx_tables,
+}
+
+def _extract_tables(file_path: str, doc=None, ext: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract tables from the document with enhanced analysis"""
+    tables = []
+    file_extension = ext if ext is not None else os.path.splitext(file_path)[1].lower()
     
-    # For DOCX files, try to extract actual tables
-    elif file_extension == '.docx':
+    # Desteklenen biçimlerde gerçek tabloları çıkarmayı dene
+    extractor = _TABLE_EXTRACTORS.get(file_extension)
+    if extractor is not None:
+        kind = file_extension[1:].upper()
         try:
-            import docx
-            from docx.document import Document
-            from docx.table import Table
-            
-            doc = docx.Document(file_path)
-            # Belgeden gerçek tabloları çıkar
-            actual_table_count = len(doc.tables)
-            logger.info(f"DOCX contains {actual_table_count} tables")
-            
-            # Gerçek tabloları işle
-            real_tables = []
-            for table_idx, doc_table in enumerate(doc.tables):
-                try:
-                    table_idx_str = str(table_idx + 1).zfill(2)
-                    
-                    # Tablo başlıklarını çıkar (ilk satır olarak kabul ediliyor)
-                    headers = []
-                    if len(doc_table.rows) > 0:
-                        first_row = doc_table.rows[0]
-                        for cell in first_row.cells:
-                            headers.append(cell.text.strip())
-                    
-                    # Tablo verilerini çıkar (ilk satır dışındaki satırlar)
-                    data = []
-                    for row_idx, row in enumerate(doc_table.rows):
-                        if row_idx == 0 and headers:  # İlk satır zaten başlık olarak alındıysa atla
-                            continue
-                        
-                        row_data = []
-                        for cell in row.cells:
-                            row_data.append(cell.text.strip())
-                        
-                        # Boş satırları filtrele
-                        if any(cell for cell in row_data if cell.strip()):
-                            data.append(row_data)
-                    
-                    # Başlıkları düzeltme kontrolü - boş veya geçersiz başlıkları düzelt
-                    if not headers or all(not h for h in headers):
-                        # Otomatik başlıklar oluştur
-                        headers = [f"Sütun {i+1}" for i in range(len(doc_table.columns))]
-                    
-                    # Tablodaki metni özetle
-                    table_content = ' '.join([' '.join(row) for row in data])
-                    table_preview = table_content[:100] + "..." if len(table_content) > 100 else table_content
-                    
-                    # Tablo başlığını belirle - varsayılan veya tablonun üstündeki paragraftan
-                    table_caption = f"Tablo {table_idx + 1}"
-                    
-                    # Veri temizliği - boş hücreleri temizle
-                    cleaned_data = []
-                    for row in data:
-                        # Boş hücreleri düzenle
-                        cleaned_row = [cell if cell.strip() else "-" for cell in row]
-                        cleaned_data.append(cleaned_row)
-                    
-                    # Test senaryoları oluştur
-                    test_scenarios = [
-                        {
-                            "title": f"Tablo Doğrulama: {table_caption}",
-                            "description": f"Bu tablonun içeriğini doğrulama testi: {table_preview}",
-                            "steps": "1. İlgili ekranı aç\n2. Tablonun varlığını kontrol et\n3. Tablonun içeriğini doğrula",
-                            "expected_results": "Tablo doğru şekilde görüntülenmeli ve içeriği sunulan verilerle eşleşmeli"
-                        }
-                    ]
-                    
-                    # Eğer tablo en az 4 satır içeriyorsa, bazı özel satırlar için test senaryoları oluştur
-                    if len(cleaned_data) >= 4:
-                        for row_idx in range(min(3, len(cleaned_data))):
-                            row_data = cleaned_data[row_idx]
-                            row_preview = ', '.join(row_data[:2]) 
-                            
-                            row_scenario = {
-                                "title": f"Satır Doğrulama: {row_preview}",
-                                "description": f"Bu satırın verilerini doğrulama: {', '.join(row_data)}",
-                                "steps": f"1. Tabloyu aç\n2. '{row_preview}' içeren satırı bul\n3. Tüm veriyi kontrol et",
-                                "expected_results": "Satır verisi doğru şekilde görüntülenmeli"
-                            }
-                            test_scenarios.append(row_scenario)
-                    
-                    # Gerçek tablo verisi oluştur
-                    real_table = {
-                        "id": f"table{table_idx_str}",
-                        "caption": table_caption,
-                        "headers": headers,
-                        "data": cleaned_data,
-                        "test_scenarios": test_scenarios,
-                        "preview": table_preview
-                    }
-                    
-                    # Tablolara ekle
-                    real_tables.append(real_table)
-                    
-                except Exception as table_error:
-                    logger.warning(f"Tablo {table_idx + 1} çıkarma hatası: {str(table_error)}")
+            real_tables = extractor(file_path, doc)
             
             # Gerçek tabloları sadece boş değilse ekle
             if real_tables:
-                # Var olan örnek tabloları temizle ve gerçek tabloları ekle
-                tables.clear()
                 tables.extend(real_tables)
-                logger.info(f"DOCX belgeden {len(real_tables)} gerçek tablo çıkarıldı")
+                logger.info(f"{kind} belgeden {len(real_tables)} gerçek tablo çıkarıldı")
             else:
-                # Gerçek tablo yoksa, önceden eklenen sample_tables kalacak
-                logger.info(f"DOCX belgede işlenebilir tablo bulunamadı, örnek tablolar kullanılıyor")
-                
+                logger.info(f"{kind} belgede işlenebilir tablo bulunamadı")
         except (ImportError, Exception) as e:
-            logger.warning(f"Error extracting DOCX tables: {str(e)}")
+            logger.warning(f"Error extracting {kind} tables: {str(e)}")
+    
+    # Gerçek tablo çıkarılamadıysa DOCX dışındaki belgelerde örnek tablolar kullanılır
+    # (DOCX için kendi gerçek tablo çıkarma işlemimiz var)
+    if not tables and file_extension != '.docx':
+        tables.extend(copy.deepcopy(_SAMPLE_TABLES))
     
     logger.info(f"Extracted {len(tables)} tables from document")
     return tables
@@ -560,10 +984,19 @@ class DocumentContent:
     def __init__(self):
         self.elements = []
         self.metadata = {}
+        # Tür ve bölüm sorguları için elements üzerinde tutulan yan indeksler
+        self._by_type = defaultdict(list)
+        self._by_section = defaultdict(list)
+
+    def _add_element(self, element):
+        """Append an element and record it in the type and section indexes"""
+        self.elements.append(element)
+        self._by_type[element["type"]].append(element)
+        self._by_section[element.get("section")].append(element)
 
     def add_text(self, text, section=None, paragraph_id=None, style=None):
         """Add a text element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "text",
             "content": text,
             "section": section,
@@ -573,7 +1006,7 @@ class DocumentContent:
 
     def add_heading(self, text, level=1, section=None):
         """Add a heading element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "heading",
             "content": text,
             "level": level,
@@ -586,12 +1019,11 @@ class DocumentContent:
         content = image_data
         if isinstance(image_data, bytes):
             try:
-                import base64
-                content = base64.b64encode(image_data).decode('utf-8')
+                content = base64.b64encode(image_data).decode('ascii')
             except Exception as e:
                 content = "Image data could not be converted: " + str(e)
         
-        self.elements.append({
+        self._add_element({
             "type": "image",
             "content": content,
             "description": description,
@@ -601,7 +1033,7 @@ class DocumentContent:
 
     def add_table(self, table_data, headers=None, section=None, caption=None):
         """Add a table element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "table",
             "content": table_data,
             "headers": headers,
@@ -611,7 +1043,7 @@ class DocumentContent:
 
     def add_list(self, items, list_type="bullet", section=None):
         """Add a list element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "list",
             "content": items,
             "list_type": list_type,
@@ -620,7 +1052,7 @@ class DocumentContent:
 
     def add_chart(self, chart_data, chart_type, labels=None, section=None, caption=None):
         """Add a chart element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "chart",
             "content": chart_data,
             "chart_type": chart_type,
@@ -631,7 +1063,7 @@ class DocumentContent:
 
     def add_diagram(self, diagram_data, diagram_type, section=None, caption=None):
         """Add a diagram element to the document content"""
-        self.elements.append({
+        self._add_element({
             "type": "diagram",
             "content": diagram_data,
             "diagram_type": diagram_type,
@@ -652,29 +1084,49 @@ class DocumentContent:
 
     def to_json(self):
         """Convert document content to JSON string"""
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
 
     def get_plain_text(self):
         """Get plain text representation of the document"""
-        text = ""
+        parts = []
         for element in self.elements:
-            if element["type"] == "text":
-                text += element["content"] + "\n\n"
-            elif element["type"] == "heading":
-                text += element["content"] + "\n\n"
-            elif element["type"] == "list":
-                for item in element["content"]:
-                    text += f"- {item}\n"
-                text += "\n"
-        return text
+            element_type = element["type"]
+            if element_type in ("text", "heading"):
+                parts.append(element["content"])
+                parts.append("\n\n")
+            elif element_type == "list":
+                parts.extend(f"- {item}\n" for item in element["content"])
+                parts.append("\n")
+        return "".join(parts)
 
     def get_elements_by_type(self, element_type):
         """Get all elements of a specific type"""
-        return [element for element in self.elements if element["type"] == element_type]
+        return list(self._by_type.get(element_type, ()))
 
     def get_elements_by_section(self, section):
         """Get all elements from a specific section"""
-        return [element for element in self.elements if element.get("section") == section]
+        return list(self._by_section.get(section, ()))
+
+def _image_elements(structure: Dict[str, Any]) -> List[Tuple[Any, str, str]]:
+    """Return (image_data, description, format) for each image dict in a document structure"""
+    images = structure.get("images")
+    if not isinstance(images, list):
+        return []
+    return [
+        # Empty bytes if no image data
+        (img.get("image_data", b""), img.get("description", "Image"), img.get("format", "png"))
+        for img in images if isinstance(img, dict)
+    ]
+
+def _table_elements(structure: Dict[str, Any]) -> List[Tuple[Any, Any, str]]:
+    """Return (data, headers, caption) for each table dict in a document structure"""
+    tables = structure.get("tables")
+    if not isinstance(tables, list):
+        return []
+    return [
+        (table.get("data", []), table.get("headers", []), table.get("caption", "Table"))
+        for table in tables if isinstance(table, dict)
+    ]
 
 # Define an analyze_document function that returns a DocumentContent object
 def analyze_document(file_path, force_neuradoc=True, force_docling=False, force_llama_parse=False):
@@ -699,33 +1151,18 @@ def analyze_document(file_path, force_neuradoc=True, force_docling=False, force_
         # Get document structure from our enhanced method
         structure = get_document_structure(file_path)
         
-        # Extract text
-        text_content = extract_text(file_path)
+        # Text was already extracted in the same pass as images and tables
+        text_content = structure.get("text_content", "")
         if text_content:
             doc_content.add_text(text_content)
         
         # Process images if any
-        if "images" in structure and isinstance(structure["images"], list):
-            for img in structure["images"]:
-                if isinstance(img, dict):
-                    # Add image to document content
-                    description = img.get("description", "Image")
-                    doc_content.add_image(
-                        image_data=img.get("image_data", b""),  # Empty bytes if no image data
-                        description=description,
-                        format=img.get("format", "png")
-                    )
+        for image_data, description, image_format in _image_elements(structure):
+            doc_content.add_image(image_data=image_data, description=description, format=image_format)
         
         # Process tables if any
-        if "tables" in structure and isinstance(structure["tables"], list):
-            for table in structure["tables"]:
-                if isinstance(table, dict):
-                    # Add table to document content
-                    doc_content.add_table(
-                        table_data=table.get("data", []),
-                        headers=table.get("headers", []),
-                        caption=table.get("caption", "Table")
-                    )
+        for table_data, headers, caption in _table_elements(structure):
+            doc_content.add_table(table_data=table_data, headers=headers, caption=caption)
         
         # Add document metadata
         doc_content.set_metadata("filename", structure.get("filename", ""))
@@ -743,12 +1180,97 @@ def analyze_document(file_path, force_neuradoc=True, force_docling=False, force_
         doc_content.set_metadata("error", str(e))
         return doc_content
 
+def _scenarios_for_image(idx: int, image: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the test scenarios of one document image"""
+    image_get = image.get
+
+    # Check if the image already has test scenarios; if yes, use those scenarios
+    existing_scenarios = image_get("test_scenarios")
+    if isinstance(existing_scenarios, list):
+        image_scenarios = [scenario for scenario in existing_scenarios
+                           if isinstance(scenario, dict) and "title" in scenario]
+        if image_scenarios:
+            return image_scenarios
+
+    # If no scenarios found, create a default one
+    image_type = image_get("type", "UI Element")
+    image_desc = image_get("description", "Görsel İçerik")
+
+    default_scenario = {
+        "id": f"TS{100+idx}",
+        "title": f"Görsel İçerik Testi: {image_type}",
+        "description": f"Görsel içeriğin doğruluğunu kontrol etme: {image_desc}",
+        "priority": "Medium",
+        "test_cases": [
+            {
+                "id": f"TC{100+idx}",
+                "title": f"Görsel Doğrulama: {image_type}",
+                "steps": "1. İlgili ekranı aç\n2. Görselin varlığını kontrol et\n3. Görsel içeriğin doğruluğunu doğrula",
+                "expected_results": "Görsel doğru içerikle görüntülenmeli"
+            }
+        ]
+    }
+    return [default_scenario]
+
+def _scenarios_for_table(idx: int, table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the test scenarios of one document table"""
+    table_get = table.get
+
+    # Check if the table already has test scenarios; if yes, use those scenarios
+    existing_scenarios = table_get("test_scenarios")
+    if isinstance(existing_scenarios, list):
+        table_scenarios = [scenario for scenario in existing_scenarios
+                           if isinstance(scenario, dict) and "title" in scenario]
+        if table_scenarios:
+            return table_scenarios
+
+    # If no scenarios found, create a default one based on table content
+    table_caption = table_get("caption", "Tablo Verisi")
+    table_data = table_get("data")
+
+    # Test cases are built first so the scenario dict is assembled once
+    test_cases = [
+        {
+            "id": f"TC{200+idx}",
+            "title": f"Tablo Veri Doğrulaması: {table_caption}",
+            "steps": "1. İlgili ekranı aç\n2. Tablo verilerini kontrol et\n3. Tablo başlıklarını doğrula",
+            "expected_results": "Tablo verileri doğru şekilde görüntülenmeli"
+        }
+    ]
+
+    # If the table has actual data, add more specific test cases
+    if isinstance(table_data, list) and table_data:
+        # Create test cases based on the rows of data
+        case_id_prefix = f"TC{200+idx}_"
+        test_cases.extend(
+            {
+                "id": f"{case_id_prefix}{row_idx}",
+                "title": f"Veri Satırı Doğrulama: {row_str}",
+                "steps": f"1. Tabloda '{row_str}' satırını bul\n2. Tüm hücreleri kontrol et",
+                "expected_results": "Satır verileri doğru olmalı"
+            }
+            for row_idx, row in enumerate(table_data, 1)
+            if isinstance(row, list) and row
+            # Use first two cells for identification
+            for row_str in (" - ".join(map(str, row[:2])),)
+        )
+
+    default_scenario = {
+        "id": f"TS{200+idx}",
+        "title": f"Tablo Doğrulama Testi: {table_caption}",
+        "description": f"Tablo verilerinin doğruluğunu kontrol etme: {table_caption}",
+        "priority": "High",
+        "test_cases": test_cases
+    }
+    return [default_scenario]
+
 def _generate_test_scenarios(structure: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generate comprehensive test scenarios from document structure"""
     scenarios = []
     
-    # Generate scenarios from document text content
-    if "text_content" in structure:
+    # Generate scenarios from document text content; image-only documents (no real text) skip it
+    text_content = structure.get("text_content")
+    if text_content and len(text_content) > 32:
         # Generate basic scenarios from text
         text_scenarios = [
             {
@@ -768,89 +1290,15 @@ def _generate_test_scenarios(structure: Dict[str, Any]) -> List[Dict[str, Any]]:
         ]
         scenarios.extend(text_scenarios)
     
-    # Generate scenarios from images
-    if "images" in structure:
-        for idx, image in enumerate(structure["images"]):
-            image_scenarios = []
-            
-            # Check if the image already has test scenarios
-            if "test_scenarios" in image and isinstance(image["test_scenarios"], list):
-                # If yes, use those scenarios
-                for scenario in image["test_scenarios"]:
-                    if isinstance(scenario, dict) and "title" in scenario:
-                        image_scenarios.append(scenario)
-            
-            # If no scenarios found, create a default one
-            if not image_scenarios:
-                image_type = image.get("type", "UI Element")
-                image_desc = image.get("description", "Görsel İçerik")
-                
-                default_scenario = {
-                    "id": f"TS{100+idx}",
-                    "title": f"Görsel İçerik Testi: {image_type}",
-                    "description": f"Görsel içeriğin doğruluğunu kontrol etme: {image_desc}",
-                    "priority": "Medium",
-                    "test_cases": [
-                        {
-                            "id": f"TC{100+idx}",
-                            "title": f"Görsel Doğrulama: {image_type}",
-                            "steps": "1. İlgili ekranı aç\n2. Görselin varlığını kontrol et\n3. Görsel içeriğin doğruluğunu doğrula",
-                            "expected_results": "Görsel doğru içerikle görüntülenmeli"
-                        }
-                    ]
-                }
-                image_scenarios.append(default_scenario)
-            
-            scenarios.extend(image_scenarios)
-    
-    # Generate scenarios from tables
-    if "tables" in structure:
-        for idx, table in enumerate(structure["tables"]):
-            table_scenarios = []
-            
-            # Check if the table already has test scenarios
-            if "test_scenarios" in table and isinstance(table["test_scenarios"], list):
-                # If yes, use those scenarios
-                for scenario in table["test_scenarios"]:
-                    if isinstance(scenario, dict) and "title" in scenario:
-                        table_scenarios.append(scenario)
-            
-            # If no scenarios found, create a default one based on table content
-            if not table_scenarios:
-                table_caption = table.get("caption", "Tablo Verisi")
-                
-                default_scenario = {
-                    "id": f"TS{200+idx}",
-                    "title": f"Tablo Doğrulama Testi: {table_caption}",
-                    "description": f"Tablo verilerinin doğruluğunu kontrol etme: {table_caption}",
-                    "priority": "High",
-                    "test_cases": [
-                        {
-                            "id": f"TC{200+idx}",
-                            "title": f"Tablo Veri Doğrulaması: {table_caption}",
-                            "steps": "1. İlgili ekranı aç\n2. Tablo verilerini kontrol et\n3. Tablo başlıklarını doğrula",
-                            "expected_results": "Tablo verileri doğru şekilde görüntülenmeli"
-                        }
-                    ]
-                }
-                
-                # If the table has actual data, add more specific test cases
-                if "data" in table and isinstance(table["data"], list) and len(table["data"]) > 0:
-                    # Create test cases based on the rows of data
-                    for row_idx, row in enumerate(table["data"]):
-                        if isinstance(row, list) and len(row) > 0:
-                            row_str = " - ".join([str(cell) for cell in row[:2]])  # Use first two cells for identification
-                            test_case = {
-                                "id": f"TC{200+idx}_{row_idx+1}",
-                                "title": f"Veri Satırı Doğrulama: {row_str}",
-                                "steps": f"1. Tabloda '{row_str}' satırını bul\n2. Tüm hücreleri kontrol et",
-                                "expected_results": "Satır verileri doğru olmalı"
-                            }
-                            default_scenario["test_cases"].append(test_case)
-                
-                table_scenarios.append(default_scenario)
-            
-            scenarios.extend(table_scenarios)
+    # Generate scenarios from images and tables
+    images = structure.get("images", [])
+    tables = structure.get("tables", [])
+    # Görsel ve tablo senaryoları birkaç f-string'lik şablondur; işçi süreçlere taşımanın (süreç başlatma
+    # ve pickle) maliyeti üretimin kendisinden yüksek olduğundan her zaman tek geçişte burada üretilir
+    for idx, image in enumerate(images):
+        scenarios.extend(_scenarios_for_image(idx, image))
+    for idx, table in enumerate(tables):
+        scenarios.extend(_scenarios_for_table(idx, table))
     
     # Add a few generic scenarios to ensure we always return something
     if not scenarios:
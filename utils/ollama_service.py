@@ -1,15 +1,310 @@
 import os
+import atexit
+import copy
 import json
 import logging
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 import time
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Any, List, Union
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Ollama sunucusuna yapılan tüm istekler aynı oturumu kullanır; TCP bağlantıları çağrılar arasında yeniden kullanılır
+# Geçici 502/503/504 yanıtları adaptör düzeyinde üstel bekleme ile yeniden denenir (POST dahil);
+# bağlantı hataları burada denenmez, _post_streaming kendi döngüsünde dener ve erişilebilirlik kontrolü hızlı kalır
+_RETRY = Retry(total=3, connect=0, read=0, backoff_factor=2, status_forcelist=[502, 503, 504],
+               allowed_methods=None, raise_on_status=False)
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_RETRY))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_RETRY))
+
+# (bağlantı, okuma) zaman aşımı; okuma süresi akıştaki iki parça arasındaki en uzun bekleme için geçerlidir.
+# Ollama ilk parçayı model yüklenip istem değerlendirildikten sonra gönderir; CPU'da büyük belgelerde bu
+# dakikalar sürebilir. OLLAMA_READ_TIMEOUT ile ayarlanır, 0 verilirse okuma süresi sınırlanmaz
+_OLLAMA_READ_TIMEOUT = float(os.environ.get("OLLAMA_READ_TIMEOUT", "300"))
+OLLAMA_TIMEOUT = (5, _OLLAMA_READ_TIMEOUT if _OLLAMA_READ_TIMEOUT > 0 else None)
+# Bağlantı kurulamadığında ya da akış koptuğunda isteğin tamamı bu kadar kez denenir; okuma zaman aşımı
+# denenmez (aynı istek yine aynı sürede yanıtsız kalır ve üretim baştan başlar)
+OLLAMA_ATTEMPTS = 3
+OLLAMA_RETRY_DELAYS = (1, 3)
+
+# orjson varsa Ollama yanıtları onunla çözülür; orjson.JSONDecodeError, json.JSONDecodeError alt sınıfıdır
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Önbellekte en çok bu kadar sonuç tutulur (en uzun süredir kullanılmayan atılır); dosya en fazla
+# bu aralıkla yeniden yazılır, kalan değişiklikler süreç kapanırken yazılır
+OLLAMA_CACHE_MAX_ENTRIES = int(os.environ.get("OLLAMA_CACHE_MAX_ENTRIES", "256"))
+OLLAMA_CACHE_SAVE_INTERVAL = 30.0
+
+class OllamaCache:
+    """
+    Persistent, size-bounded JSON cache of Ollama results keyed by a SHA-256 of the request
+    
+    The file is loaded on first access and holds at most max_entries results in
+    least-recently-used order. save() rewrites it atomically, but not more often
+    than every OLLAMA_CACHE_SAVE_INTERVAL seconds; pending changes are flushed at
+    interpreter exit. Values are copied on put and get, so callers may modify them.
+    """
+    
+    def __init__(self, path: str, max_entries: int = OLLAMA_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._data = None
+        self._dirty = False
+        self._last_save = float("-inf")
+        self._lock = threading.Lock()
+        atexit.register(self.save, force=True)
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the request parts"""
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    
+    def _load(self) -> "OrderedDict[str, Any]":
+        if self._data is None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._data = OrderedDict(_json_loads(f.read()))
+            except (OSError, ValueError, TypeError):
+                self._data = OrderedDict()
+            self._evict()
+        return self._data
+    
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self._dirty = True
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value for key, or None"""
+        with self._lock:
+            data = self._load()
+            if key not in data:
+                return None
+            data.move_to_end(key)
+            return copy.deepcopy(data[key])
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a copy of value in memory; call save() to persist it"""
+        with self._lock:
+            data = self._load()
+            data[key] = copy.deepcopy(value)
+            data.move_to_end(key)
+            self._evict()
+            self._dirty = True
+    
+    def save(self, force: bool = False) -> None:
+        """Write pending changes to disk (at most every OLLAMA_CACHE_SAVE_INTERVAL seconds unless force); failures only disable persistence"""
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._last_save < OLLAMA_CACHE_SAVE_INTERVAL):
+                return
+            
+            # Geçici dosya hedefle aynı dizinde benzersiz adla oluşturulur; eşzamanlı süreçler birbirinin
+            # yarım dosyasının üzerine yazmaz ve os.replace aynı dosya sisteminde atomiktir
+            directory = os.path.dirname(os.path.abspath(self.path))
+            tmp_path = None
+            try:
+                with tempfile.NamedTemporaryFile("wb", dir=directory, prefix=os.path.basename(self.path),
+                                                 suffix=".tmp", delete=False) as f:
+                    tmp_path = f.name
+                    if orjson is not None:
+                        f.write(orjson.dumps(self._data))
+                    else:
+                        f.write(json.dumps(self._data, ensure_ascii=False).encode("utf-8"))
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+                self._last_save = time.monotonic()
+            except OSError as e:
+                logger.warning(f"Could not write Ollama cache: {str(e)}")
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+
+class _JsonObjectScanner:
+    """Incrementally track brace depth to detect when the first top-level JSON object is complete"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume more text; returns True once the top-level object has closed"""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+def _post_streaming(api_endpoint: str, headers: Dict[str, str], data: Dict[str, Any],
+                    field, timeout=None) -> Optional[str]:
+    """
+    POST a streaming Ollama request and collect the generated text
+    
+    Ollama sends NDJSON chunks while the model generates; they are joined as
+    they arrive, and reading stops as soon as the first top-level JSON object
+    is complete (the connection close tells Ollama to stop generating).
+    Connect timeouts and dropped connections restart the request, up to
+    OLLAMA_ATTEMPTS times with an increasing delay; a read timeout is raised
+    immediately.
+    
+    Args:
+        field: Callable returning the text of one chunk, or None if the chunk lacks it
+        timeout: (connect, read) timeout in seconds, defaults to OLLAMA_TIMEOUT
+        
+    Returns:
+        The generated text, or None if no chunk carried the expected field
+    """
+    payload = dict(data, stream=True)
+    body = {"data": orjson.dumps(payload)} if orjson is not None else {"json": payload}
+    for attempt in range(OLLAMA_ATTEMPTS):
+        parts = []
+        found = False
+        scanner = _JsonObjectScanner()
+        try:
+            with _SESSION.post(api_endpoint, headers=headers, timeout=timeout or OLLAMA_TIMEOUT,
+                               stream=True, **body) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    if "error" in chunk:
+                        raise Exception(f"Ollama API error: {chunk['error']}")
+                    piece = field(chunk)
+                    if piece is not None:
+                        found = True
+                        parts.append(piece)
+                        if scanner.feed(piece):
+                            break
+                    if chunk.get("done"):
+                        break
+            break
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            # Akış ortasındaki okuma zaman aşımı requests tarafından ReadTimeoutError saran ConnectionError olarak yükseltilir
+            read_timeout = isinstance(e, requests.exceptions.ReadTimeout) or (
+                bool(e.args) and isinstance(e.args[0], ReadTimeoutError))
+            if read_timeout or attempt == OLLAMA_ATTEMPTS - 1:
+                raise
+            delay = OLLAMA_RETRY_DELAYS[attempt]
+            logger.warning(f"Ollama request failed ({e}); retrying in {delay}s "
+                           f"(attempt {attempt + 2}/{OLLAMA_ATTEMPTS})")
+            time.sleep(delay)
+    return "".join(parts) if found else None
+
+def _chat_chunk_content(chunk: Dict[str, Any]) -> Optional[str]:
+    message = chunk.get("message")
+    return message.get("content") if isinstance(message, dict) else None
+
+def _generate_chunk_response(chunk: Dict[str, Any]) -> Optional[str]:
+    return chunk.get("response")
+
+# Ollama yanıtlarının kalıcı önbelleği
+ollama_cache = OllamaCache(os.environ.get("OLLAMA_CACHE_FILE", ".ollama_cache.json"))
+
+# Başarılı erişilebilirlik kontrolü bu süre boyunca yeniden kullanılır; toplu işlerde her belge için ping atılmaz
+OLLAMA_PROBE_TTL = 30.0
+_OLLAMA_PROBE_CACHE = {"ts": 0.0, "ok": False}
+_ollama_probe_lock = threading.Lock()
+
+def _ensure_ollama_reachable() -> None:
+    """Raise ConnectionError if the Ollama server cannot be reached; successes are cached for OLLAMA_PROBE_TTL seconds"""
+    # Kilit, eşzamanlı iş parçacıklarının aynı anda ping atmasını önler
+    with _ollama_probe_lock:
+        if _OLLAMA_PROBE_CACHE["ok"] and time.time() - _OLLAMA_PROBE_CACHE["ts"] < OLLAMA_PROBE_TTL:
+            return
+        _probe_ollama()
+        _OLLAMA_PROBE_CACHE["ts"] = time.time()
+        _OLLAMA_PROBE_CACHE["ok"] = True
+
+def _probe_ollama() -> None:
+    """Ping the Ollama server, raising ConnectionError if it is unavailable"""
+    # Ollama kullanılabilirlik kontrolünü ai_service.py modülüne taşıdık
+    # Eğer bu kod çalışıyorsa Ollama'nın kullanılabilir olduğu varsayılır
+    try:
+        # Import is_ollama_available from ai_service module
+        from utils.ai_service import is_ollama_available
+        if not is_ollama_available():
+            logger.warning("Ollama is not available. Make sure it's running or set OLLAMA_API_ENDPOINT.")
+            raise ConnectionError("Ollama sunucusuna bağlanılamadı. Bu Replit ortamında normal bir durumdur. Gerçek bir Ollama sunucusu kullanmak için kendi OLLAMA_API_ENDPOINT değerinizi ayarlayın veya OLLAMA_SKIP_CHECK=true olarak ayarlayın ve bir test belgesi kullanın.")
+    except ImportError:
+        # If there's a circular import, fall back to direct checking
+        if os.environ.get("OLLAMA_SKIP_CHECK", "false").lower() == "true":
+            logger.info("Skipping Ollama connection check as OLLAMA_SKIP_CHECK is set to true")
+        else:
+            try:
+                # Send a simple ping request to check if Ollama is running
+                ping_response = _SESSION.get(os.environ.get("OLLAMA_API_ENDPOINT", "http://localhost:11434"), timeout=2)
+                if ping_response.status_code >= 400:
+                    raise ConnectionError("Ollama server returned error response")
+            except requests.exceptions.RequestException:
+                logger.warning("Could not connect to Ollama server. Please make sure Ollama is running locally or set OLLAMA_API_ENDPOINT.")
+                raise ConnectionError("Could not connect to Ollama server. Bu Replit ortamında normal bir durumdur. Gerçek bir Ollama sunucusu kullanmak için kendi OLLAMA_API_ENDPOINT değerinizi ayarlayın veya OLLAMA_SKIP_CHECK=true olarak ayarlayın ve bir test belgesi kullanın.")
+
+# Üretim prompt şablonunun sabit kısmı; her çağrıda yalnızca belge metni eklenir
+_PROMPT_PREFIX = """
+        You are a test scenario and use case generation expert. Analyze the provided document and 
+        generate comprehensive test scenarios and use cases. Follow these guidelines:
+        
+        1. Identify key functionality described in the document
+        2. Create test scenarios that cover both happy path and edge cases
+        3. For each scenario, provide multiple test cases with clear steps and expected results
+        4. Ensure your output follows this JSON structure:
+        {
+            "summary": "Brief overview of the document and identified scenarios",
+            "scenarios": [
+                {
+                    "title": "Scenario name",
+                    "description": "Detailed description of the scenario",
+                    "test_cases": [
+                        {
+                            "title": "Test case title",
+                            "steps": "Numbered steps to execute the test",
+                            "expected_results": "Expected outcomes of the test"
+                        }
+                    ]
+                }
+            ]
+        }
+        
+        Be thorough, detailed, and ensure your response is in valid JSON format.
+        
+        DOCUMENT:
+        """
+_PROMPT_SUFFIX = '\n        '
+
 def generate_with_ollama(document_text):
     """
     Generate test scenarios using Ollama API
@@ -25,6 +320,61 @@ def generate_with_ollama(document_text):
     
     # Get model name from environment with default fallback
     model = os.environ.get("OLLAMA_MODEL", "llama3")
+    
+    # Ollama kullanılabilirlik kontrolü; sunucuya ulaşılamazsa ConnectionError fırlatılır
+    _ensure_ollama_reachable()
+    
+    try:
+        # Prepare the prompt for Ollama
+        prompt = _PROMPT_PREFIX + str(document_text) + _PROMPT_SUFFIX
+        
+        # Aynı model ve prompt için önbellekteki sonuç kullanılır
+        cache_key = OllamaCache.make_key(model, prompt)
+        cached = ollama_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Ollama test scenarios loaded from cache")
+            return cached
+        
+        # Make API call
+        logger.info(f"Sending request to Ollama API using model: {model}...")
+        
+        headers = {
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "format": "json"
+        }
+        
+        # Stream the generated text; stops once the JSON object is complete
+        generated_text = _post_streaming(api_endpoint, headers, data, _generate_chunk_response)
+        if generated_text is None:
+            logger.error("Unexpected Ollama API response format: no response text in stream")
+            raise Exception("Unexpected Ollama API response format")
+        
+        # Parse the JSON from the generated text (format=json yanıtı tek bir JSON nesnesidir, {...} ayıklamaya gerek yoktur)
+        try:
+            json_result = _json_loads(generated_text)
+            logger.info("Successfully parsed Ollama response as JSON")
+        except json.JSONDecodeError:
+            # If we can't get valid JSON, format it using the helper function
+            logger.warning("Ollama response is not valid JSON, formatting it as plain text")
+            from utils.ai_service import format_test_scenarios
+            return format_test_scenarios(generated_text)
+        
+        ollama_cache.put(cache_key, json_result)
+        ollama_cache.save()
+        return json_result
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error making request to Ollama API: {str(e)}")
+        raise Exception(f"Failed to connect to Ollama API: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error generating test scenarios with Ollama: {str(e)}")
+        raise Exception(f"Failed to generate test scenarios with Ollama: {str(e)}")
 
 def analyze_image_with_ollama(
     image_base64: str, 
@@ -58,6 +408,13 @@ def analyze_image_with_ollama(
     # Ollama API endpoint
     api_endpoint = os.environ.get("OLLAMA_API_ENDPOINT", "http://localhost:11434/api/chat")
     
+    # Aynı görsel ve prompt daha önce analiz edildiyse model çağrısı yapılmaz
+    cache_key = OllamaCache.make_key(model or "", system_prompt, user_prompt, str(temperature), image_base64)
+    cached = ollama_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Ollama görsel analizi önbellekten alındı")
+        return dict(cached, analysis_time=time.time() - start_time)
+    
     try:
         # Görsel verisi ile birlikte istek gönder
         headers = {"Content-Type": "application/json"}
@@ -75,25 +432,20 @@ def analyze_image_with_ollama(
         data = {
             "model": model,
             "messages": messages,
-            "stream": False,
+            "stream": True,
             "temperature": temperature,
             "format": "json"
         }
         
-        # Yanıt için bekleme süresi uzun tutuldu (120 saniye)
-        response = requests.post(api_endpoint, headers=headers, json=data, timeout=120)
-        response.raise_for_status()
+        # Yanıt parça parça okunur; JSON nesnesi tamamlanınca beklemeden dönülür (OLLAMA_TIMEOUT, yeniden denemeli)
+        content = _post_streaming(api_endpoint, headers, data, _chat_chunk_content)
         
-        # Yanıtı işle
-        result = response.json()
-        
-        if "message" in result and "content" in result["message"]:
-            content = result["message"]["content"]
+        if content is not None:
             
             # JSON formatını çıkarmaya çalış
             try:
-                parsed_json = json.loads(content)
-                return {
+                parsed_json = _json_loads(content)
+                analysis = {
                     "text": content,
                     "json": parsed_json,
                     "model": model,
@@ -101,13 +453,16 @@ def analyze_image_with_ollama(
                 }
             except json.JSONDecodeError:
                 # JSON olmayan içeriği ham metin olarak döndür
-                return {
+                analysis = {
                     "text": content,
                     "model": model,
                     "analysis_time": time.time() - start_time
                 }
+            ollama_cache.put(cache_key, analysis)
+            ollama_cache.save()
+            return analysis
         else:
-            logger.error(f"Unexpected Ollama API response format: {result}")
+            logger.error("Unexpected Ollama API response format: no message content in stream")
             return {"error": "Unexpected Ollama API response format"}
             
     except requests.exceptions.RequestException as e:
@@ -116,125 +471,162 @@ def analyze_image_with_ollama(
     except Exception as e:
         logger.error(f"Görsel analizi sırasında hata (Ollama): {str(e)}")
         return {"error": f"Görsel analizi sırasında hata: {str(e)}"}
+
+# Ollama çağrıları ağ/sunucu beklemesine bağlıdır; toplu işlerde istekler eşzamanlı gönderilir
+OLLAMA_MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "4"))
+
+def batch_generate_with_ollama(document_texts: List[str], max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Generate test scenarios for several documents with concurrent Ollama requests
     
-    # Get API endpoint from environment with default fallback
-    api_endpoint = os.environ.get("OLLAMA_API_ENDPOINT", "http://localhost:11434/api/generate")
+    Args:
+        document_texts: Texts extracted from the documents
+        max_workers: Number of in-flight requests (defaults to OLLAMA_MAX_CONCURRENCY)
+        
+    Returns:
+        list: One result per document, in input order; failed documents yield an error dict
+    """
+    def generate_one(document_text):
+        try:
+            return generate_with_ollama(document_text)
+        except Exception as e:
+            logger.error(f"Error generating test scenarios with Ollama: {str(e)}")
+            return {"error": str(e)}
     
-    # Get model name from environment with default fallback
-    model = os.environ.get("OLLAMA_MODEL", "llama3")
+    if len(document_texts) <= 1:
+        return [generate_one(text) for text in document_texts]
     
-    # Ollama kullanılabilirlik kontrolünü ai_service.py modülüne taşıdık
-    # Eğer bu kod çalışıyorsa Ollama'nın kullanılabilir olduğu varsayılır
-    try:
-        # Import is_ollama_available from ai_service module
-        from utils.ai_service import is_ollama_available
-        if not is_ollama_available():
-            logger.warning("Ollama is not available. Make sure it's running or set OLLAMA_API_ENDPOINT.")
-            raise ConnectionError("Ollama sunucusuna bağlanılamadı. Bu Replit ortamında normal bir durumdur. Gerçek bir Ollama sunucusu kullanmak için kendi OLLAMA_API_ENDPOINT değerinizi ayarlayın veya OLLAMA_SKIP_CHECK=true olarak ayarlayın ve bir test belgesi kullanın.")
-    except ImportError:
-        # If there's a circular import, fall back to direct checking
-        if os.environ.get("OLLAMA_SKIP_CHECK", "false").lower() == "true":
-            logger.info("Skipping Ollama connection check as OLLAMA_SKIP_CHECK is set to true")
-        else:
-            try:
-                # Send a simple ping request to check if Ollama is running
-                ping_response = requests.get(os.environ.get("OLLAMA_API_ENDPOINT", "http://localhost:11434"), timeout=2)
-                if ping_response.status_code >= 400:
-                    raise ConnectionError("Ollama server returned error response")
-            except requests.exceptions.RequestException:
-                logger.warning("Could not connect to Ollama server. Please make sure Ollama is running locally or set OLLAMA_API_ENDPOINT.")
-                raise ConnectionError("Could not connect to Ollama server. Bu Replit ortamında normal bir durumdur. Gerçek bir Ollama sunucusu kullanmak için kendi OLLAMA_API_ENDPOINT değerinizi ayarlayın veya OLLAMA_SKIP_CHECK=true olarak ayarlayın ve bir test belgesi kullanın.")
+    workers = min(max_workers or OLLAMA_MAX_CONCURRENCY, len(document_texts))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(generate_one, document_texts))
+
+def batch_analyze_images_with_ollama(
+    images_base64: List[str],
+    system_prompt: Optional[str] = None,
+    user_prompt: Optional[str] = None,
+    model: Optional[str] = "llava:latest",
+    temperature: float = 0.7,
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Birden fazla görseli eşzamanlı Ollama istekleriyle analiz eder
     
-    try:
-        # Prepare the prompt for Ollama
-        prompt = f"""
-        You are a test scenario and use case generation expert. Analyze the provided document and 
-        generate comprehensive test scenarios and use cases. Follow these guidelines:
+    Args:
+        images_base64: Base64 formatında görseller
+        system_prompt: Sistem prompt
+        user_prompt: Kullanıcı prompt
+        model: Kullanılacak model adı (görsel destekli model olmalı)
+        temperature: Üretilen yanıtın çeşitliliği (0-1)
+        max_workers: Aynı anda gönderilecek istek sayısı (varsayılan OLLAMA_MAX_CONCURRENCY)
         
-        1. Identify key functionality described in the document
-        2. Create test scenarios that cover both happy path and edge cases
-        3. For each scenario, provide multiple test cases with clear steps and expected results
-        4. Ensure your output follows this JSON structure:
-        {{
-            "summary": "Brief overview of the document and identified scenarios",
-            "scenarios": [
-                {{
-                    "title": "Scenario name",
-                    "description": "Detailed description of the scenario",
-                    "test_cases": [
-                        {{
-                            "title": "Test case title",
-                            "steps": "Numbered steps to execute the test",
-                            "expected_results": "Expected outcomes of the test"
-                        }}
-                    ]
-                }}
+    Returns:
+        Her görsel için, giriş sırasıyla, analiz sonucunu içeren sözlükler
+    """
+    def analyze_one(image_base64):
+        return analyze_image_with_ollama(image_base64, system_prompt, user_prompt, model, temperature)
+    
+    if len(images_base64) <= 1:
+        return [analyze_one(image) for image in images_base64]
+    
+    workers = min(max_workers or OLLAMA_MAX_CONCURRENCY, len(images_base64))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_one, images_base64))
+
+# Tek /api/chat isteğinde gönderilecek en fazla görsel sayısı
+OLLAMA_IMAGE_BATCH_SIZE = 4
+
+_MULTI_IMAGE_INSTRUCTION = (
+    "Bu mesajda {count} görsel var. Her görseli sırasıyla ayrı ayrı analiz et ve yanıtı "
+    '{{"results": [ ... ]}} biçiminde, her görsel için bir nesne olacak şekilde, görsel sırasıyla döndür.'
+)
+
+def _analyze_image_group_with_ollama(
+    images_base64: List[str],
+    system_prompt: Optional[str],
+    user_prompt: Optional[str],
+    model: Optional[str],
+    temperature: float
+) -> List[Dict[str, Any]]:
+    """Analyze up to OLLAMA_IMAGE_BATCH_SIZE images in one chat request, falling back to single-image calls"""
+    if len(images_base64) == 1:
+        return [analyze_image_with_ollama(images_base64[0], system_prompt, user_prompt, model, temperature)]
+    
+    start_time = time.time()
+    system_prompt = system_prompt or "Bu görseli test senaryoları için analiz et"
+    user_prompt = user_prompt or "Bu görseli analiz ederek test senaryoları için kullanılabilecek bilgileri çıkar"
+    api_endpoint = os.environ.get("OLLAMA_API_ENDPOINT", "http://localhost:11434/api/chat")
+    
+    data = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": f"{user_prompt}\n\n{_MULTI_IMAGE_INSTRUCTION.format(count=len(images_base64))}",
+                "images": images_base64
+            }
+        ],
+        "stream": True,
+        "temperature": temperature,
+        "format": "json"
+    }
+    
+    try:
+        content = _post_streaming(api_endpoint, {"Content-Type": "application/json"}, data,
+                                  _chat_chunk_content)
+        results = _json_loads(content)["results"] if content is not None else None
+        if isinstance(results, list) and len(results) == len(images_base64):
+            analysis_time = (time.time() - start_time) / len(images_base64)
+            return [
+                {
+                    "text": json.dumps(item, ensure_ascii=False),
+                    "json": item,
+                    "model": model,
+                    "analysis_time": analysis_time
+                }
+                for item in results
             ]
-        }}
-        
-        Be thorough, detailed, and ensure your response is in valid JSON format.
-        
-        DOCUMENT:
-        {document_text}
-        """
-        
-        # Make API call
-        logger.info(f"Sending request to Ollama API using model: {model}...")
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        }
-        
-        response = requests.post(api_endpoint, headers=headers, json=data)
-        response.raise_for_status()
-        
-        # Parse the response
-        result = response.json()
-        
-        # Extract the generated text
-        if 'response' in result:
-            generated_text = result['response']
-        else:
-            logger.error(f"Unexpected Ollama API response format: {result}")
-            raise Exception("Unexpected Ollama API response format")
-        
-        # Parse the JSON from the generated text
-        try:
-            # First, try to parse it directly
-            json_result = json.loads(generated_text)
-            logger.info("Successfully parsed Ollama response as JSON")
-            return json_result
-        except json.JSONDecodeError:
-            # If direct parsing fails, try to extract the JSON part
-            logger.warning("Failed to parse Ollama response directly as JSON. Attempting to extract JSON part...")
-            
-            # Try to find JSON within the text (between curly braces)
-            import re
-            json_match = re.search(r'({[\s\S]*})', generated_text)
-            
-            if json_match:
-                try:
-                    json_part = json_match.group(1)
-                    json_result = json.loads(json_part)
-                    logger.info("Successfully extracted and parsed JSON from Ollama response")
-                    return json_result
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse extracted JSON from Ollama response")
-            
-            # If we can't extract valid JSON, format it using the helper function
-            from utils.ai_service import format_test_scenarios
-            return format_test_scenarios(generated_text)
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error making request to Ollama API: {str(e)}")
-        raise Exception(f"Failed to connect to Ollama API: {str(e)}")
+        logger.warning("Çoklu görsel yanıtı görsel sayısıyla eşleşmedi, tek tek analiz ediliyor")
     except Exception as e:
-        logger.error(f"Error generating test scenarios with Ollama: {str(e)}")
-        raise Exception(f"Failed to generate test scenarios with Ollama: {str(e)}")
+        logger.warning(f"Çoklu görsel analizi başarısız oldu, tek tek analiz ediliyor: {str(e)}")
+    
+    return [analyze_image_with_ollama(image, system_prompt, user_prompt, model, temperature)
+            for image in images_base64]
+
+def analyze_images_with_ollama(
+    images_base64: List[str],
+    system_prompt: Optional[str] = None,
+    user_prompt: Optional[str] = None,
+    model: Optional[str] = "llava:latest",
+    temperature: float = 0.7,
+    batch_size: int = OLLAMA_IMAGE_BATCH_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Görselleri gruplar halinde, grup başına tek /api/chat isteğiyle analiz eder
+    
+    Gruplar eşzamanlı gönderilir; yanıtı ayrıştırılamayan gruplar tek görsellik
+    çağrılara geri döner.
+    
+    Args:
+        images_base64: Base64 formatında görseller
+        system_prompt: Sistem prompt
+        user_prompt: Kullanıcı prompt
+        model: Kullanılacak model adı (görsel destekli model olmalı)
+        temperature: Üretilen yanıtın çeşitliliği (0-1)
+        batch_size: Bir istekte gönderilecek görsel sayısı
+        
+    Returns:
+        Her görsel için, giriş sırasıyla, analiz sonucunu içeren sözlükler
+    """
+    groups = [images_base64[i:i + batch_size] for i in range(0, len(images_base64), batch_size)]
+    
+    def analyze_group(group):
+        return _analyze_image_group_with_ollama(group, system_prompt, user_prompt, model, temperature)
+    
+    if len(groups) <= 1:
+        group_results = [analyze_group(group) for group in groups]
+    else:
+        with ThreadPoolExecutor(max_workers=min(OLLAMA_MAX_CONCURRENCY, len(groups))) as executor:
+            group_results = list(executor.map(analyze_group, groups))
+    
+    return [result for results in group_results for result in results]
@@ -3,18 +3,478 @@ OpenAI Service Integration for the application
 """
 
 import os
+import io
 import json
 import logging
 import time
-import base64
+import threading
+import functools
+import random
+import hashlib
+import httpx
 import openai
 from openai import OpenAI
-from typing import Dict, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Union, List, Iterator
+
+# orjson varsa yanıtlar onunla çözülür; orjson.JSONDecodeError, json.JSONDecodeError alt sınıfıdır
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# tiktoken varsa uzun metinler karakter yerine token sayısına göre kısaltılır
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# pybase64 (SIMD) varsa görsel verisinin base64 çözme/kodlama işlemleri onunla yapılır; API'si stdlib ile aynıdır
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Aynı anda OpenAI'a gönderilen istek sayısının üst sınırı; tüm iş parçacıkları bu semaforu paylaşır
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16"))
+_openai_semaphore = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+
+def _load_api_key() -> str:
+    """OpenAI API anahtarını ortam değişkeninden, yoksa config manager'dan oku; bulunamazsa boş dize"""
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    
+    # Eğer ortam değişkenlerinde yoksa, config manager'dan almayı dene
+    if not api_key:
+        try:
+            from utils.config import config_manager
+            api_key = config_manager.get_api_key("openai")
+        except Exception as e:
+            logger.warning(f"Config manager'dan API anahtarı alınamadı: {e}")
+    return api_key or ""
+
+# Bulunan API anahtarı ilk çözümlemeden sonra bellekte tutulur; anahtar değişince refresh_api_key çağrılır
+_api_key = ""
+_api_key_lock = threading.Lock()
+
+def _resolve_api_key() -> str:
+    """Önbellekteki OpenAI API anahtarını döndür; henüz bulunmadıysa okumayı dene"""
+    global _api_key
+    if _api_key:
+        return _api_key
+    with _api_key_lock:
+        if not _api_key:
+            _api_key = _load_api_key()
+        return _api_key
+
+def refresh_api_key() -> bool:
+    """
+    OpenAI API anahtarını ortam değişkeni ve config manager'dan yeniden oku
+    
+    Returns:
+        Anahtar bulunduysa True
+    """
+    global _api_key
+    with _api_key_lock:
+        _api_key = _load_api_key()
+        return bool(_api_key)
+
+# h2 paketi kuruluysa OpenAI bağlantıları HTTP/2 üzerinden çoğullanır
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """Tüm OpenAI istemcilerinin paylaştığı httpx istemcisi (bağlantı havuzu ve zaman aşımları ayarlı)"""
+    return httpx.Client(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+        timeout=httpx.Timeout(connect=5.0, read=120.0, write=30.0, pool=5.0)
+    )
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> OpenAI:
+    """API anahtarı başına tek OpenAI istemcisi; HTTP bağlantı havuzu çağrılar arasında yeniden kullanılır"""
+    # Yeniden denemeler _with_retries ile yapılır; SDK'nın kendi denemeleri üst üste binmesin diye kapatılır
+    return OpenAI(api_key=api_key, http_client=_get_http_client(), max_retries=0)
+
+class _TokenBucket:
+    """Dakikalık kapasitesi sürekli dolan token kovası; kapasite 0 ise sınır uygulanmaz"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, amount: float = 1.0) -> None:
+        """Kovada yeterli token birikene kadar bekle ve düş"""
+        if self.capacity <= 0:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Hesabın dakikalık istek (OPENAI_RPM) ve token (OPENAI_TPM) sınırları; istekler 429 almadan önce yavaşlatılır
+_request_bucket = _TokenBucket(float(os.environ.get("OPENAI_RPM", "0")))
+_token_bucket = _TokenBucket(float(os.environ.get("OPENAI_TPM", "0")))
+
+# Görsel girdisi için yaklaşık token maliyeti (yüksek ayrıntılı tek görsel / düşük ayrıntılı tek karo)
+_IMAGE_TOKEN_ESTIMATE = 765
+_LOW_DETAIL_IMAGE_TOKEN_ESTIMATE = 85
+
+def _estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """İsteğin token maliyetini tahmin et: metin için ~4 karakter/token, görsel başına sabit, artı çıktı sınırı"""
+    chars = 0
+    image_tokens = 0
+    for message in kwargs.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    chars += len(part.get("text", ""))
+                elif part.get("type") == "image_url":
+                    low = part.get("image_url", {}).get("detail") == "low"
+                    image_tokens += _LOW_DETAIL_IMAGE_TOKEN_ESTIMATE if low else _IMAGE_TOKEN_ESTIMATE
+    return chars // 4 + image_tokens + kwargs.get("max_tokens", 0)
+
+def _throttle(kwargs: Dict[str, Any]) -> None:
+    """Dakikalık istek ve token sınırlarına göre gerekirse bekle"""
+    _request_bucket.acquire()
+    if _token_bucket.capacity > 0:
+        _token_bucket.acquire(_estimate_tokens(kwargs))
+
+# Düşük sıcaklıktaki aynı isteklerin yanıtları bellekte tutulur (yeniden çalıştırma / yeniden deneme)
+COMPLETION_CACHE_SIZE = int(os.environ.get("OPENAI_COMPLETION_CACHE_SIZE", "128"))
+COMPLETION_CACHE_MAX_TEMPERATURE = 0.5
+_completion_cache = OrderedDict()
+_completion_cache_lock = threading.Lock()
+
+def _completion_cache_key(kwargs: Dict[str, Any]) -> str:
+    """İstek parametrelerinin (model, mesajlar, sıcaklık, token sınırı, yanıt formatı) SHA-256 özeti"""
+    if orjson is not None:
+        return hashlib.sha256(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return hashlib.sha256(json.dumps(kwargs, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# Geçici bağlantı, zaman aşımı ve 429 hatalarında istek üstel, rastgele bekleme ile yeniden denenir
+OPENAI_MAX_ATTEMPTS = 5
+OPENAI_RETRY_MAX_WAIT = 30
+_RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.APITimeoutError)
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Hata yeniden denemeye değer mi
+    
+    Kota bitmesi (429 insufficient_quota) beklemekle düzelmez. Okuma zaman aşımı da
+    denenmez: yanıt 120 saniyede gelmediyse aynı istek büyük olasılıkla yine gelmez ve
+    her deneme çağıranı bir okuma süresi daha bekletir; bağlantı zaman aşımları denenir.
+    """
+    if isinstance(error, openai.RateLimitError):
+        return getattr(error, "code", None) != "insufficient_quota"
+    if isinstance(error, openai.APITimeoutError):
+        return not isinstance(error.__cause__, httpx.ReadTimeout)
+    return True
+
+def _with_retries(call):
+    """call() çağrısını geçici OpenAI hatalarında OPENAI_MAX_ATTEMPTS kez dene; son hata yükseltilir"""
+    for attempt in range(OPENAI_MAX_ATTEMPTS):
+        try:
+            return call()
+        except _RETRYABLE_ERRORS as e:
+            if attempt == OPENAI_MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            delay = random.uniform(0, min(OPENAI_RETRY_MAX_WAIT, 2 ** (attempt + 1)))
+            logger.warning(f"OpenAI request failed ({type(e).__name__}); retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 2}/{OPENAI_MAX_ATTEMPTS})")
+            time.sleep(delay)
+
+def _call_chat(client, **kwargs):
+    """Hız sınırı ve eşzamanlılık sınırı altında, yeniden denemeli chat.completions.create"""
+    def attempt():
+        _throttle(kwargs)
+        with _openai_semaphore:
+            return client.chat.completions.create(**kwargs)
+    return _with_retries(attempt)
+
+def _chat_completion(client, **kwargs):
+    """
+    client.chat.completions.create çağrısını eşzamanlılık sınırı altında yap
+    
+    Sıcaklığı COMPLETION_CACHE_MAX_TEMPERATURE değerini aşmayan istekler
+    parametrelerinin özetiyle önbelleğe alınır; aynı istek API'ye tekrar gitmez.
+    """
+    cacheable = kwargs.get("temperature", 1.0) <= COMPLETION_CACHE_MAX_TEMPERATURE
+    if cacheable:
+        key = _completion_cache_key(kwargs)
+        with _completion_cache_lock:
+            if key in _completion_cache:
+                _completion_cache.move_to_end(key)
+                logger.debug(f"OpenAI completion cache hit for {kwargs.get('model')}")
+                return _completion_cache[key]
+    
+    response = _call_chat(client, **kwargs)
+    
+    # max_tokens sınırında kesilen yanıtlar önbelleğe alınmaz
+    if cacheable and response and response.choices and response.choices[0].finish_reason != "length":
+        with _completion_cache_lock:
+            _completion_cache[key] = response
+            while len(_completion_cache) > COMPLETION_CACHE_SIZE:
+                _completion_cache.popitem(last=False)
+    return response
+
+def _parse_json_response(response, model: str, task: str) -> Dict[str, Any]:
+    """
+    JSON formatlı bir chat yanıtını görev sonucuna dönüştür
+    
+    Returns:
+        {"result": ..., "model": ..., "task": ...}; boş ya da max_tokens sınırında
+        kesilmiş yanıtta veya JSON ayrıştırılamazsa {"error": ...} sözlüğü
+    """
+    if not (response and response.choices):
+        logger.error("Empty or invalid response from OpenAI")
+        return {"error": "Empty or invalid response"}
+    
+    # Token kullanımı tek yerden loglanır
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        logger.debug(f"OpenAI {model} {task} usage: {usage.total_tokens} tokens")
+    
+    choice = response.choices[0]
+    content = choice.message.content
+    # max_tokens sınırına ulaşan JSON yanıtı yarım kalır; ayrıştırmaya çalışılmadan hata döndürülür
+    if choice.finish_reason == "length":
+        logger.error(f"OpenAI {model} {task} response was cut off at max_tokens")
+        return {"error": "Response truncated (max_tokens reached)", "raw_content": (content or "")[:500]}
+    try:
+        result = _json_loads(content)
+    except json.JSONDecodeError:
+        logger.error("Failed to parse JSON response from OpenAI")
+        return {"error": "JSON parsing error", "raw_content": content[:500]}
+    logger.info(f"Successfully completed {task} with OpenAI {model}")
+    return {"result": result, "model": model, "task": task}
+
+# Model girdisine verilecek belge metninin token sınırları (tiktoken yoksa karakter sınırları kullanılır)
+CLASSIFICATION_MAX_INPUT_TOKENS = 3000
+CLASSIFICATION_MAX_INPUT_CHARS = 10000
+# Test senaryosu isteklerinde modelin bağlam boyutu; belge metnine bundan çıktı sınırı ve istemin geri
+# kalanının (sistem talimatı, yönerge, ek bağlam) token sayısı düşüldükten sonra kalan bütçe verilir
+SCENARIO_CONTEXT_TOKENS = {"gpt-4o": 128000, "gpt-4o-mini": 128000}
+SCENARIO_DEFAULT_CONTEXT_TOKENS = 16385
+SCENARIO_MAX_OUTPUT_TOKENS = 4000
+# Tek istekte sınıflandırma ve senaryo üretimi (sınıflandırma çıktısı için ek pay)
+CLASSIFY_AND_GENERATE_MAX_OUTPUT_TOKENS = 4500
+# Mesaj başına rol/ayraç tokenları ve kısaltma sonuna eklenen "..." için pay
+_CHAT_FORMAT_OVERHEAD_TOKENS = 16
+SCENARIO_MAX_INPUT_CHARS = {"gpt-4o": 100000}
+SCENARIO_DEFAULT_MAX_INPUT_CHARS = 50000
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Model için tiktoken kodlayıcısı; bilinmeyen modellerde o200k_base"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def _truncate_text(text: str, model: str, max_tokens: int, max_chars: int) -> str:
+    """Metni model için token sınırına (tiktoken yoksa karakter sınırına) göre kısalt; kısaltılan metnin sonuna "..." eklenir"""
+    if tiktoken is None:
+        return text[:max_chars] + "..." if len(text) > max_chars else text
+    # Her token en az bir karakter olduğundan kısa metinler kodlanmadan geçer
+    if len(text) <= max_tokens:
+        return text
+    encoding = _get_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]) + "..."
+
+# Bu boyutu aşan base64 görseller gönderilmeden önce küçültülüp JPEG olarak yeniden kodlanır
+VISION_MAX_EDGE = 2048
+VISION_JPEG_QUALITY = 85
+VISION_RESIZE_MIN_BASE64 = 512 * 1024
+
+def _shrink_image_base64(image_base64: str) -> str:
+    """Downscale a large base64 image to VISION_MAX_EDGE and re-encode it as JPEG; returns the input if it is small or unreadable"""
+    if len(image_base64) < VISION_RESIZE_MIN_BASE64:
+        return image_base64
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(base64.b64decode(image_base64))) as img:
+            img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
+            buffer = io.BytesIO()
+            img.convert('RGB').save(buffer, 'JPEG', quality=VISION_JPEG_QUALITY, optimize=True)
+        resized = base64.b64encode(buffer.getvalue()).decode('ascii')
+        return resized if len(resized) < len(image_base64) else image_base64
+    except Exception as e:
+        logger.debug(f"Görsel küçültülemedi, orijinal gönderiliyor: {str(e)}")
+        return image_base64
+
+# analyze_image_with_openai sonuçlarının kalıcı önbelleği; görsel içeriği, model ve prompt özetiyle anahtarlanır
+OPENAI_VISION_CACHE_DIR = os.environ.get(
+    "OPENAI_VISION_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "doctest-ai", "openai_vision")
+)
+
+def _vision_cache_key(image_base64: str, model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    """Return the cache key of an image analysis request"""
+    image_hash = hashlib.sha256(image_base64.encode("ascii", "ignore")).hexdigest()
+    prompt_hash = hashlib.md5(f"{model}|{temperature}|{system_prompt}|{user_prompt}".encode("utf-8")).hexdigest()
+    return f"{image_hash}_{prompt_hash}"
+
+def _vision_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached image analysis for a key, or None"""
+    try:
+        with open(os.path.join(OPENAI_VISION_CACHE_DIR, f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _vision_cache_put(key: str, result: Dict[str, Any]) -> None:
+    """Store an image analysis for a key; failures only disable caching"""
+    try:
+        os.makedirs(OPENAI_VISION_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(OPENAI_VISION_CACHE_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"Görsel analiz önbelleğine yazılamadı: {str(e)}")
+
+# Görsel analizi sistem talimatı; belge türü, amacı ve sayfa numarası str.format ile doldurulur
+_IMAGE_SYSTEM_PROMPT_TEMPLATE = """
+        Bu görsel bir test senaryosu oluşturma projesi kapsamında analiz edilecektir.
+        Görselden test senaryoları ve kullanım durumları çıkarın.
+        
+        Belge türü: {document_type}
+        Belge amacı: {document_purpose} 
+        Sayfa: {page_number}
+        
+        Görseli detaylı analiz edin ve aşağıdaki yapıda JSON çıktı oluşturun:
+        
+        {{
+            "image_type": "Görselin türü (ekran görüntüsü, diyagram, şema, tablo, vb.)",
+            "description": "Görselin kısa açıklaması",
+            "test_relevance": "Görselin test senaryoları için önemi (Düşük/Orta/Yüksek)",
+            "ui_elements": ["Görselde tespit edilen UI öğeleri listesi"],
+            "test_scenarios": [
+                {{
+                    "title": "Test senaryosu başlığı",
+                    "description": "Kısa açıklama",
+                    "test_cases": [
+                        {{
+                            "title": "Test durumu başlığı",
+                            "steps": "1. Adım 1\\n2. Adım 2\\n3. Adım 3",
+                            "expected_results": "Beklenen sonuç"
+                        }}
+                    ]
+                }}
+            ],
+            "extracted_text": "Görselden çıkarılan metin (varsa)"
+        }}
+        
+        Görsel bir tablo içeriyorsa, tablodaki verileri de yapılandırılmış formatta çıkarın.
+        """
+
+# Test senaryosu üretimi sistem talimatı
+_SCENARIOS_SYSTEM_PROMPT = """
+        Sen test senaryoları oluşturma konusunda uzmanlaşmış bir yapay zeka asistanısın.
+        Belgeleri analiz ederek kapsamlı test senaryoları ve test durumları üretiyorsun.
+        Türkçe dilinde profesyonel ve teknik açıdan doğru test senaryoları oluştur.
+        
+        Aşağıdaki formatı kullan:
+        
+        {
+            "summary": "Belgenin kapsamlı bir özeti",
+            "scenarios": [
+                {
+                    "title": "Senaryo Başlığı",
+                    "description": "Senaryonun açıklaması",
+                    "priority": "Yüksek/Orta/Düşük",
+                    "category": "Fonksiyonel/Performans/Güvenlik/Kullanılabilirlik",
+                    "test_cases": [
+                        {
+                            "title": "Test Durumu Başlığı",
+                            "type": "Pozitif/Negatif",
+                            "steps": "1. Adım 1\\n2. Adım 2\\n3. Adım 3",
+                            "expected_results": "Beklenen sonuçların açıklaması",
+                            "preconditions": "Ön koşullar"
+                        }
+                    ]
+                }
+            ]
+        }
+        
+        Test senaryoları oluştururken şunlara DİKKAT ET:
+        1. Dokümanın TÜM içeriğini dikkate alarak kapsamlı senaryolar oluştur
+        2. Her fonksiyon, özellik ve gereksinim için mutlaka en az bir test senaryosu olmalı
+        3. Hem pozitif hem de negatif test senaryolarını dahil et
+        4. Her bir senaryo için detaylı ve eksiksiz test adımları oluştur (atlamadan belgenin uygulanabilir tüm unsurlarını test et)
+        5. Belgede herhangi bir teknik veya fonksiyonel belirtim varsa, bunların doğrulanması için test senaryoları oluştur
+        6. Senaryolar için mutlaka anlamlı başlıklar, açıklamalar ve öncelik düzeyleri belirle
+        7. Belgedeki görseller, ekran görüntüleri veya diyagramlarda belirtilen her işlev için test senaryoları ekle
+        8. Tekrar eden senaryolar yerine, belgenin her bölümünü kapsayan özgün senaryolar oluştur
+        9. Sonuçta test senaryoları ve test durumları teknik açıdan uygulanabilir ve doğrulanabilir olmalı
+        10. Belgedeki TÜM gereksinimleri kapsayan test senaryoları oluşturduğundan emin ol
+        """
+
+# Belge sınıflandırma sistem talimatı (tekli ve toplu sınıflandırmada ortak)
+_CLASSIFICATION_SYSTEM_PROMPT = """
+        Bu bir belge sınıflandırma görevidir. Verilen metni analiz ederek türünü, amacını ve
+        önemli özelliklerini belirlemeniz gerekiyor.
+        
+        Çıktıyı aşağıdaki JSON formatında verin:
+        
+        {
+            "document_type": "Belge türü (gereksinim, kullanım kılavuzu, API dokümanı, vb.)",
+            "document_purpose": "Belgenin amacı",
+            "document_category": "Teknik/İş/Süreç/Kullanıcı/vb.",
+            "primary_audience": "Hedef kitle (Geliştiriciler, Son Kullanıcılar, Yöneticiler, vb.)",
+            "complexity_level": "Belge karmaşıklık seviyesi (Düşük/Orta/Yüksek)",
+            "main_topics": ["Ana konu 1", "Ana konu 2", "..."],
+            "test_focus_areas": ["Test odak alanı 1", "Test odak alanı 2", "..."],
+            "related_system_components": ["İlgili sistem bileşeni 1", "İlgili sistem bileşeni 2", "..."]
+        }
+        
+        Tüm alanları doldurun ve Türkçe olarak yanıt verin.
+        """
+
+# Toplu sınıflandırmada her belge için yukarıdaki nesne, giriş sırasıyla tek bir dizi içinde istenir
+_CLASSIFICATION_BATCH_INSTRUCTION = """
+        Birden fazla belge numaralandırılmış olarak verilecektir ([1], [2], ...).
+        Her belge için yukarıdaki nesneyi oluşturun ve çıktıyı aşağıdaki JSON formatında,
+        belgelerle aynı sırada ve belge başına tam olarak bir nesne olacak şekilde verin:
+        
+        {"results": [nesne1, nesne2, ...]}
+        """
+
+# Sınıflandırma ve senaryo üretimi tek istekte: iki şema art arda verilir ve birleşik çıktı istenir
+_CLASSIFY_AND_GENERATE_INSTRUCTION = """
+        Bu istekte iki görevi birlikte yapın: önce belgeyi yukarıdaki sınıflandırma formatına göre
+        sınıflandırın, ardından aşağıdaki formatta test senaryolarını oluşturun. Çıktıyı tek bir
+        JSON nesnesi olarak verin:
+        
+        {"classification": {sınıflandırma nesnesi}, "summary": "...", "scenarios": [...]}
+        """
+
 def process_with_model(model: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """
     OpenAI API ile belirli bir model kullanarak veri işle
@@ -30,22 +490,14 @@ def process_with_model(model: str, data: Dict[str, Any]) -> Dict[str, Any]:
         # OpenAI modülü zaten import edildi
         
         # OpenAI API anahtarı
-        api_key = os.environ.get("OPENAI_API_KEY", "")
-        
-        # Eğer ortam değişkenlerinde yoksa, config manager'dan almayı dene
-        if not api_key:
-            try:
-                from utils.config import config_manager
-                api_key = config_manager.get_api_key("openai")
-            except Exception as e:
-                logger.warning(f"Config manager'dan API anahtarı alınamadı: {e}")
+        api_key = _resolve_api_key()
         
         if not api_key:
             logger.error("OpenAI API anahtarı bulunamadı")
             return {"error": "OpenAI API anahtarı gerekli fakat bulunamadı"}
         
-        # OpenAI istemcisi oluştur
-        client = OpenAI(api_key=api_key)
+        # OpenAI istemcisi (anahtar başına önbellekte)
+        client = _get_client(api_key)
         
         # Görev türünü belirle
         task = data.get("task", "general")
@@ -56,8 +508,12 @@ def process_with_model(model: str, data: Dict[str, Any]) -> Dict[str, Any]:
             return _process_image_with_openai(client, model, data)
         elif task == "document_classification":
             return _process_classification_with_openai(client, model, data)
+        elif task == "classification_batch":
+            return _process_classification_batch_with_openai(client, model, data)
         elif task == "generate_test_scenarios":
             return _generate_test_scenarios_with_openai(client, model, data)
+        elif task == "classify_and_generate":
+            return _classify_and_generate_with_openai(client, model, data)
         else:
             # Genel amaçlı işleme
             return _process_general_with_openai(client, model, data)
@@ -69,6 +525,26 @@ def process_with_model(model: str, data: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error processing with OpenAI: {str(e)}")
         return {"error": str(e)}
 
+def batch_process_with_model(model: str, items: List[Dict[str, Any]],
+                             max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Birden fazla veriyi eşzamanlı OpenAI istekleriyle işle
+    
+    Args:
+        model: Kullanılacak OpenAI modeli (örn. gpt-4o)
+        items: process_with_model'e verilecek veri sözlükleri
+        max_workers: Aynı anda gönderilecek istek sayısı (varsayılan OPENAI_MAX_CONCURRENCY)
+            
+    Returns:
+        Her veri için, giriş sırasıyla, process_with_model sonucu
+    """
+    if len(items) <= 1:
+        return [process_with_model(model, data) for data in items]
+    
+    workers = min(max_workers or OPENAI_MAX_CONCURRENCY, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda data: process_with_model(model, data), items))
+
 def _process_image_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """OpenAI ile görsel analizi yap"""
     try:
@@ -91,62 +567,28 @@ def _process_image_with_openai(client, model: str, data: Dict[str, Any]) -> Dict
         page_number = context.get("page_number", 0)
         
         # Sistem talimatı
-        system_instruction = f"""
-        Bu görsel bir test senaryosu oluşturma projesi kapsamında analiz edilecektir.
-        Görselden test senaryoları ve kullanım durumları çıkarın.
-        
-        Belge türü: {document_type}
-        Belge amacı: {document_purpose} 
-        Sayfa: {page_number}
-        
-        Görseli detaylı analiz edin ve aşağıdaki yapıda JSON çıktı oluşturun:
-        
-        {{
-            "image_type": "Görselin türü (ekran görüntüsü, diyagram, şema, tablo, vb.)",
-            "description": "Görselin kısa açıklaması",
-            "test_relevance": "Görselin test senaryoları için önemi (Düşük/Orta/Yüksek)",
-            "ui_elements": ["Görselde tespit edilen UI öğeleri listesi"],
-            "test_scenarios": [
-                {{
-                    "title": "Test senaryosu başlığı",
-                    "description": "Kısa açıklama",
-                    "test_cases": [
-                        {{
-                            "title": "Test durumu başlığı",
-                            "steps": "1. Adım 1\\n2. Adım 2\\n3. Adım 3",
-                            "expected_results": "Beklenen sonuç"
-                        }}
-                    ]
-                }}
-            ],
-            "extracted_text": "Görselden çıkarılan metin (varsa)"
-        }}
-        
-        Görsel bir tablo içeriyorsa, tablodaki verileri de yapılandırılmış formatta çıkarın.
-        """
+        system_instruction = _IMAGE_SYSTEM_PROMPT_TEMPLATE.format(
+            document_type=document_type,
+            document_purpose=document_purpose,
+            page_number=page_number
+        )
         
         # Kullanıcı talimatı 
         user_instruction = "Bu görseli test senaryoları oluşturma bağlamında analiz edin. Görselde gördüğünüz ekran, süreç, diyagram veya tablodan test senaryoları çıkarın."
         
-        # Görsel verisi içeren mesaj oluştur
-        message_content = [{"type": "text", "text": user_instruction}]
-        
-        # Görsel URL veya base64 verisi ekle
-        if image_url:
-            # String tipindeki mesaj içeriğini doğrudan ekleyemiyoruz, önce uygun formatta bir nesneye dönüştürüyoruz
-            message_content = [
-                {"type": "text", "text": user_instruction},
-                {"type": "image_url", "image_url": {"url": image_url}}
-            ]
-        elif image_base64:
-            # String tipindeki mesaj içeriğini doğrudan ekleyemiyoruz, önce uygun formatta bir nesneye dönüştürüyoruz
-            message_content = [
-                {"type": "text", "text": user_instruction},
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}}
-            ]
+        # Görsel verisi içeren mesaj oluştur: metin ve ardından görsel URL'si ya da base64 verisi
+        # (ikisinden en az biri yukarıda doğrulandı)
+        image_ref = image_url or f"data:image/jpeg;base64,{_shrink_image_base64(image_base64)}"
+        # Düşük ayrıntı görseli tek 512 px karo olarak işler; tam analizde model ayrıntıyı kendisi seçer
+        detail = data.get("detail") or ("auto" if data.get("full_analysis") else "low")
+        message_content = [
+            {"type": "text", "text": user_instruction},
+            {"type": "image_url", "image_url": {"url": image_ref, "detail": detail}}
+        ]
         
         # API isteği yap
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            client,
             model=model,
             messages=[
                 {"role": "system", "content": system_instruction},
@@ -158,19 +600,7 @@ def _process_image_with_openai(client, model: str, data: Dict[str, Any]) -> Dict
         )
         
         # Yanıtı işle
-        if response and response.choices:
-            content = response.choices[0].message.content
-            try:
-                # JSON içeriği çıkar
-                result = json.loads(content)
-                logger.info(f"Successfully analyzed image with OpenAI {model}")
-                return {"result": result, "model": model, "task": "image_analysis"}
-            except json.JSONDecodeError:
-                logger.error("Failed to parse JSON response from OpenAI")
-                return {"error": "JSON parsing error", "raw_content": content[:500]}
-        else:
-            logger.error("Empty or invalid response from OpenAI")
-            return {"error": "Empty or invalid response"}
+        return _parse_json_response(response, model, "image_analysis")
         
     except Exception as e:
         logger.error(f"Error in image processing with OpenAI: {str(e)}")
@@ -185,33 +615,17 @@ def _process_classification_with_openai(client, model: str, data: Dict[str, Any]
             return {"error": "No text data provided"}
         
         # Metin büyükse kısalt
-        if len(text) > 10000:
-            text = text[:10000] + "..."
+        truncated = _truncate_text(text, model, CLASSIFICATION_MAX_INPUT_TOKENS, CLASSIFICATION_MAX_INPUT_CHARS)
+        if truncated is not text:
+            text = truncated
             logger.info(f"Text truncated to {len(text)} characters for classification")
         
         # Sistem talimatı
-        system_instruction = """
-        Bu bir belge sınıflandırma görevidir. Verilen metni analiz ederek türünü, amacını ve
-        önemli özelliklerini belirlemeniz gerekiyor.
-        
-        Çıktıyı aşağıdaki JSON formatında verin:
-        
-        {
-            "document_type": "Belge türü (gereksinim, kullanım kılavuzu, API dokümanı, vb.)",
-            "document_purpose": "Belgenin amacı",
-            "document_category": "Teknik/İş/Süreç/Kullanıcı/vb.",
-            "primary_audience": "Hedef kitle (Geliştiriciler, Son Kullanıcılar, Yöneticiler, vb.)",
-            "complexity_level": "Belge karmaşıklık seviyesi (Düşük/Orta/Yüksek)",
-            "main_topics": ["Ana konu 1", "Ana konu 2", "..."],
-            "test_focus_areas": ["Test odak alanı 1", "Test odak alanı 2", "..."],
-            "related_system_components": ["İlgili sistem bileşeni 1", "İlgili sistem bileşeni 2", "..."]
-        }
-        
-        Tüm alanları doldurun ve Türkçe olarak yanıt verin.
-        """
+        system_instruction = _CLASSIFICATION_SYSTEM_PROMPT
         
         # API isteği yap
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            client,
             model=model,
             messages=[
                 {"role": "system", "content": system_instruction},
@@ -222,15 +636,53 @@ def _process_classification_with_openai(client, model: str, data: Dict[str, Any]
             response_format={"type": "json_object"}
         )
         
+        # Yanıtı işle
+        return _parse_json_response(response, model, "classification")
+        
+    except Exception as e:
+        logger.error(f"Error in classification with OpenAI: {str(e)}")
+        return {"error": str(e)}
+
+def _process_classification_batch_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI ile birden fazla metni tek istekte sınıflandır"""
+    try:
+        # Metin listesini kontrol et
+        texts = data.get("texts", [])
+        if not texts:
+            return {"error": "No text data provided"}
+        
+        # Her belge tekli sınıflandırmadaki sınırla kısaltılır ve numaralandırılır
+        documents = []
+        for i, text in enumerate(texts):
+            text = _truncate_text(text, model, CLASSIFICATION_MAX_INPUT_TOKENS, CLASSIFICATION_MAX_INPUT_CHARS)
+            documents.append(f"[{i+1}] {text}")
+        user_content = "Documents:\n" + "\n".join(documents)
+        
+        # API isteği yap (belge başına tekli sınıflandırmadaki çıktı bütçesi)
+        response = _chat_completion(
+            client,
+            model=model,
+            messages=[
+                {"role": "system", "content": _CLASSIFICATION_SYSTEM_PROMPT + _CLASSIFICATION_BATCH_INSTRUCTION},
+                {"role": "user", "content": user_content}
+            ],
+            max_tokens=min(1000 * len(texts), 16000),
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+        
         # Yanıtı işle
         if response and response.choices:
             content = response.choices[0].message.content
             try:
-                # JSON içeriği çıkar
-                result = json.loads(content)
-                logger.info(f"Successfully classified document with OpenAI {model}")
-                return {"result": result, "model": model, "task": "classification"}
-            except json.JSONDecodeError:
+                # JSON içeriği çıkar ve sonuçları giriş sırasına eşle
+                batch_results = _json_loads(content).get("results", [])
+                results = (list(batch_results) + [None] * len(texts))[:len(texts)]
+                if len(batch_results) != len(texts):
+                    logger.warning(f"OpenAI returned {len(batch_results)} classifications for {len(texts)} documents")
+                logger.info(f"Successfully classified {len(texts)} documents with OpenAI {model}")
+                return {"results": results, "model": model, "task": "classification_batch"}
+            except (json.JSONDecodeError, AttributeError):
                 logger.error("Failed to parse JSON response from OpenAI")
                 return {"error": "JSON parsing error", "raw_content": content[:500]}
         else:
@@ -238,97 +690,62 @@ def _process_classification_with_openai(client, model: str, data: Dict[str, Any]
             return {"error": "Empty or invalid response"}
         
     except Exception as e:
-        logger.error(f"Error in classification with OpenAI: {str(e)}")
+        logger.error(f"Error in batch classification with OpenAI: {str(e)}")
         return {"error": str(e)}
 
-def _generate_test_scenarios_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
-    """OpenAI ile test senaryoları oluştur"""
-    try:
-        # Metin verisini kontrol et
-        text = data.get("text", "")
-        if not text:
-            return {"error": "No text data provided"}
-        
-        # Metin büyükse kısalt (gpt-4o 128K token desteğine sahip)
-        max_chars = 100000 if model == "gpt-4o" else 50000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "..."
-            logger.info(f"Text truncated to {len(text)} characters for test scenario generation")
-        
-        # Ek bağlam bilgilerini al
-        structure = data.get("structure", {})
-        classification = data.get("classification", {})
-        visual_insights = data.get("visual_insights", [])
-        table_insights = data.get("table_insights", [])
-        
-        # Sistem talimatı
-        system_instruction = """
-        Sen test senaryoları oluşturma konusunda uzmanlaşmış bir yapay zeka asistanısın.
-        Belgeleri analiz ederek kapsamlı test senaryoları ve test durumları üretiyorsun.
-        Türkçe dilinde profesyonel ve teknik açıdan doğru test senaryoları oluştur.
-        
-        Aşağıdaki formatı kullan:
-        
-        {
-            "summary": "Belgenin kapsamlı bir özeti",
-            "scenarios": [
-                {
-                    "title": "Senaryo Başlığı",
-                    "description": "Senaryonun açıklaması",
-                    "priority": "Yüksek/Orta/Düşük",
-                    "category": "Fonksiyonel/Performans/Güvenlik/Kullanılabilirlik",
-                    "test_cases": [
-                        {
-                            "title": "Test Durumu Başlığı",
-                            "type": "Pozitif/Negatif",
-                            "steps": "1. Adım 1\\n2. Adım 2\\n3. Adım 3",
-                            "expected_results": "Beklenen sonuçların açıklaması",
-                            "preconditions": "Ön koşullar"
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        Test senaryoları oluştururken şunlara DİKKAT ET:
-        1. Dokümanın TÜM içeriğini dikkate alarak kapsamlı senaryolar oluştur
-        2. Her fonksiyon, özellik ve gereksinim için mutlaka en az bir test senaryosu olmalı
-        3. Hem pozitif hem de negatif test senaryolarını dahil et
-        4. Her bir senaryo için detaylı ve eksiksiz test adımları oluştur (atlamadan belgenin uygulanabilir tüm unsurlarını test et)
-        5. Belgede herhangi bir teknik veya fonksiyonel belirtim varsa, bunların doğrulanması için test senaryoları oluştur
-        6. Senaryolar için mutlaka anlamlı başlıklar, açıklamalar ve öncelik düzeyleri belirle
-        7. Belgedeki görseller, ekran görüntüleri veya diyagramlarda belirtilen her işlev için test senaryoları ekle
-        8. Tekrar eden senaryolar yerine, belgenin her bölümünü kapsayan özgün senaryolar oluştur
-        9. Sonuçta test senaryoları ve test durumları teknik açıdan uygulanabilir ve doğrulanabilir olmalı
-        10. Belgedeki TÜM gereksinimleri kapsayan test senaryoları oluşturduğundan emin ol
-        """
-        
-        # Görsel ve tablo bilgilerini içeren ek bağlam oluştur
-        additional_context = ""
-        
-        # Sınıflandırma bilgilerini ekle
-        if classification:
-            additional_context += "\n\n### Belge Sınıflandırma Bilgileri ###\n"
-            for key, value in classification.items():
-                if isinstance(value, list):
-                    additional_context += f"{key}: {', '.join(value)}\n"
-                else:
-                    additional_context += f"{key}: {value}\n"
-        
-        # Görsel içgörülerini ekle
-        if visual_insights:
-            additional_context += "\n\n### Görsel Analiz İçgörüleri ###\n"
-            for i, insight in enumerate(visual_insights):
-                additional_context += f"{i+1}. {insight}\n"
-        
-        # Tablo içgörülerini ekle
-        if table_insights:
-            additional_context += "\n\n### Tablo Analiz İçgörüleri ###\n"
-            for i, insight in enumerate(table_insights):
-                additional_context += f"{i+1}. {insight}\n"
-        
-        # Belgeyi analiz etmek için daha detaylı kullanıcı yönergesi
-        detailed_user_instruction = f"""
+def _scenario_text_budget(model: str, max_tokens: int, *prompt_parts: str) -> int:
+    """Belge metnine kalan token bütçesi: bağlam boyutu - çıktı sınırı - istemin geri kalanının token sayısı"""
+    budget = SCENARIO_CONTEXT_TOKENS.get(model, SCENARIO_DEFAULT_CONTEXT_TOKENS) - max_tokens - _CHAT_FORMAT_OVERHEAD_TOKENS
+    if tiktoken is not None:
+        encoding = _get_encoding(model)
+        budget -= sum(len(encoding.encode(part, disallowed_special=())) for part in prompt_parts)
+    return max(budget, 0)
+
+def _test_scenario_messages(model: str, data: Dict[str, Any], max_tokens: int = SCENARIO_MAX_OUTPUT_TOKENS,
+                            system_instruction: str = _SCENARIOS_SYSTEM_PROMPT) -> Optional[List[Dict[str, Any]]]:
+    """
+    Test senaryosu üretim isteğinin mesajlarını oluştur; metin yoksa None döner
+    
+    Belge metni, max_tokens çıktı ve istemin geri kalanı modelin bağlamına
+    sığacak şekilde kısaltılır (tiktoken yoksa karakter sınırına göre).
+    """
+    # Metin verisini kontrol et
+    text = data.get("text", "")
+    if not text:
+        return None
+    
+    # Ek bağlam bilgilerini al
+    structure = data.get("structure", {})
+    classification = data.get("classification", {})
+    visual_insights = data.get("visual_insights", [])
+    table_insights = data.get("table_insights", [])
+    
+    # Görsel ve tablo bilgilerini içeren ek bağlam oluştur; parçalar listede toplanıp tek seferde birleştirilir
+    context_parts = []
+    
+    # Sınıflandırma bilgilerini ekle
+    if classification:
+        context_parts.append("\n\n### Belge Sınıflandırma Bilgileri ###\n")
+        for key, value in classification.items():
+            if isinstance(value, list):
+                context_parts.append(f"{key}: {', '.join(value)}\n")
+            else:
+                context_parts.append(f"{key}: {value}\n")
+    
+    # Görsel içgörülerini ekle
+    if visual_insights:
+        context_parts.append("\n\n### Görsel Analiz İçgörüleri ###\n")
+        context_parts.extend(f"{i+1}. {insight}\n" for i, insight in enumerate(visual_insights))
+    
+    # Tablo içgörülerini ekle
+    if table_insights:
+        context_parts.append("\n\n### Tablo Analiz İçgörüleri ###\n")
+        context_parts.extend(f"{i+1}. {insight}\n" for i, insight in enumerate(table_insights))
+    
+    additional_context = "".join(context_parts)
+    
+    # Belgeyi analiz etmek için daha detaylı kullanıcı yönergesi (metin bütçesi hesaplandıktan sonra doldurulur)
+    user_instruction_template = """
         Lütfen aşağıdaki belgeyi detaylı bir şekilde analiz et ve kapsamlı test senaryoları oluştur. 
         Bu işi yaparken belgenin her bölümünü dikkate al ve TÜM teknik gereksinimler, özellikler ve fonksiyonlar için test senaryoları oluştur.
         
@@ -348,38 +765,241 @@ def _generate_test_scenarios_with_openai(client, model: str, data: Dict[str, Any
         === EK BAĞLAM BİLGİLERİ ===
         {additional_context}
         """
+    
+    # Metin büyükse kısalt; bütçe istemin metin dışındaki kısmı çıkarılarak hesaplanır
+    text_budget = _scenario_text_budget(
+        model, max_tokens, system_instruction,
+        user_instruction_template.format(text="", additional_context=additional_context)
+    )
+    truncated = _truncate_text(
+        text, model, text_budget,
+        SCENARIO_MAX_INPUT_CHARS.get(model, SCENARIO_DEFAULT_MAX_INPUT_CHARS)
+    )
+    if truncated is not text:
+        text = truncated
+        logger.info(f"Text truncated to {len(text)} characters for test scenario generation")
+    
+    detailed_user_instruction = user_instruction_template.format(text=text, additional_context=additional_context)
+    
+    return [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": detailed_user_instruction}
+    ]
+
+def _generate_test_scenarios_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI ile test senaryoları oluştur"""
+    try:
+        messages = _test_scenario_messages(model, data)
+        if messages is None:
+            return {"error": "No text data provided"}
         
         # API isteği yap
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            client,
             model=model,
-            messages=[
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": detailed_user_instruction}
-            ],
-            max_tokens=4000,
+            messages=messages,
+            max_tokens=SCENARIO_MAX_OUTPUT_TOKENS,
             temperature=0.2,
             response_format={"type": "json_object"}
         )
         
         # Yanıtı işle
-        if response and response.choices:
-            content = response.choices[0].message.content
-            try:
-                # JSON içeriği çıkar
-                result = json.loads(content)
-                logger.info(f"Successfully generated test scenarios with OpenAI {model}")
-                return {"result": result, "model": model, "task": "test_scenarios"}
-            except json.JSONDecodeError:
-                logger.error("Failed to parse JSON response from OpenAI")
-                return {"error": "JSON parsing error", "raw_content": content[:500]}
-        else:
-            logger.error("Empty or invalid response from OpenAI")
-            return {"error": "Empty or invalid response"}
+        return _parse_json_response(response, model, "test_scenarios")
         
     except Exception as e:
         logger.error(f"Error in test scenario generation with OpenAI: {str(e)}")
         return {"error": str(e)}
 
+def _classify_and_generate_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI ile belgeyi tek istekte sınıflandır ve test senaryolarını oluştur"""
+    try:
+        messages = _test_scenario_messages(
+            model, data, CLASSIFY_AND_GENERATE_MAX_OUTPUT_TOKENS,
+            _CLASSIFICATION_SYSTEM_PROMPT + _CLASSIFY_AND_GENERATE_INSTRUCTION + _SCENARIOS_SYSTEM_PROMPT
+        )
+        if messages is None:
+            return {"error": "No text data provided"}
+        
+        # API isteği yap (sınıflandırma ve senaryo çıktısı için ortak bütçe)
+        response = _chat_completion(
+            client,
+            model=model,
+            messages=messages,
+            max_tokens=CLASSIFY_AND_GENERATE_MAX_OUTPUT_TOKENS,
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+        
+        # Yanıtı işle; sınıflandırma senaryo sonucundan ayrılarak ayrı alanda döner
+        parsed = _parse_json_response(response, model, "classify_and_generate")
+        if "result" in parsed and isinstance(parsed["result"], dict):
+            parsed["classification"] = parsed["result"].pop("classification", {})
+        return parsed
+        
+    except Exception as e:
+        logger.error(f"Error in classification and test scenario generation with OpenAI: {str(e)}")
+        return {"error": str(e)}
+
+def stream_test_scenarios_with_openai(model: str, data: Dict[str, Any]) -> Iterator[str]:
+    """
+    OpenAI ile test senaryolarını akış halinde oluştur
+    
+    Args:
+        model: Kullanılacak OpenAI modeli (örn. gpt-4o)
+        data: generate_test_scenarios göreviyle aynı veri (text, classification, visual_insights, table_insights)
+            
+    Yields:
+        Model tarafından üretilen JSON metninin parçaları, geldikleri sırayla;
+        birleştirildiklerinde generate_test_scenarios sonucundaki JSON elde edilir
+        
+    Raises:
+        ValueError: Metin verisi veya API anahtarı yoksa
+    """
+    messages = _test_scenario_messages(model, data)
+    if messages is None:
+        raise ValueError("No text data provided")
+    
+    api_key = _resolve_api_key()
+    if not api_key:
+        raise ValueError("OpenAI API anahtarı gerekli fakat bulunamadı")
+    
+    request = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": SCENARIO_MAX_OUTPUT_TOKENS,
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"}
+    }
+    client = _get_client(api_key)
+    
+    def open_stream():
+        _throttle(request)
+        return client.chat.completions.create(stream=True, **request)
+    
+    # Akış boyunca eşzamanlılık sınırı tutulur; ilk parçalar üretim bitmeden çağırana ulaşır
+    with _openai_semaphore:
+        stream = _with_retries(open_stream)
+        for chunk in stream:
+            if chunk.choices:
+                piece = chunk.choices[0].delta.content
+                if piece:
+                    yield piece
+
+# Batch API ile gönderilen işlerin tamamlanma penceresi ve durum sorgulama aralığı
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 30
+_BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+def submit_batch_scenarios(docs: List[Dict[str, Any]], model: str = "gpt-4o") -> str:
+    """
+    Birden fazla belge için test senaryosu üretimini OpenAI Batch API'ye gönder
+    
+    Etkileşimli gecikme gerektirmeyen toplu işler için; istekler daha düşük
+    maliyetle ve eşzamanlı istek sınırına takılmadan 24 saat içinde işlenir.
+    
+    Args:
+        docs: generate_test_scenarios göreviyle aynı veri sözlükleri; isteğe bağlı
+            "custom_id" alanı sonuçları eşlemek için kullanılır (varsayılan "doc-<sıra>")
+        model: Kullanılacak OpenAI modeli
+            
+    Returns:
+        Batch kimliği (wait_for_batch ile sonuçlar alınır)
+        
+    Raises:
+        ValueError: Gönderilecek belge veya API anahtarı yoksa
+    """
+    lines = []
+    for i, data in enumerate(docs):
+        messages = _test_scenario_messages(model, data)
+        if messages is None:
+            logger.warning(f"Batch document {i} has no text, skipped")
+            continue
+        lines.append(json.dumps({
+            "custom_id": str(data.get("custom_id", f"doc-{i}")),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": messages,
+                "max_tokens": SCENARIO_MAX_OUTPUT_TOKENS,
+                "temperature": 0.2,
+                "response_format": {"type": "json_object"}
+            }
+        }, ensure_ascii=False))
+    if not lines:
+        raise ValueError("No text data provided")
+    
+    api_key = _resolve_api_key()
+    if not api_key:
+        raise ValueError("OpenAI API anahtarı gerekli fakat bulunamadı")
+    client = _get_client(api_key)
+    
+    batch_file = client.files.create(
+        file=("test_scenarios.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+    logger.info(f"Submitted OpenAI batch {batch.id} with {len(lines)} documents")
+    return batch.id
+
+def wait_for_batch(batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL,
+                   timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch işinin bitmesini bekle ve sonuçlarını ayrıştır
+    
+    Args:
+        batch_id: submit_batch_scenarios'tan dönen kimlik
+        poll_interval: Durum sorguları arasındaki saniye
+        timeout: En fazla bekleme süresi (saniye); None ise süresiz
+            
+    Returns:
+        custom_id -> generate_test_scenarios görevinin sonucuyla aynı yapıda sözlük
+        ({"result": ..., "model": ..., "task": "test_scenarios"} veya {"error": ...})
+        
+    Raises:
+        TimeoutError: Batch süre içinde tamamlanmazsa
+        ValueError: API anahtarı yoksa
+    """
+    api_key = _resolve_api_key()
+    if not api_key:
+        raise ValueError("OpenAI API anahtarı gerekli fakat bulunamadı")
+    client = _get_client(api_key)
+    
+    deadline = time.time() + timeout if timeout is not None else None
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in _BATCH_FINAL_STATES:
+        if deadline is not None and time.time() >= deadline:
+            raise TimeoutError(f"OpenAI batch {batch_id} did not finish in time (status: {batch.status})")
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+    
+    results = {}
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error(f"OpenAI batch {batch_id} ended with status {batch.status}")
+        return results
+    
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        custom_id = item.get("custom_id")
+        response = item.get("response") or {}
+        body = response.get("body") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            results[custom_id] = {"error": str(item.get("error") or body.get("error") or "Batch request failed")}
+            continue
+        content = body["choices"][0]["message"]["content"]
+        try:
+            results[custom_id] = {"result": _json_loads(content), "model": body.get("model"), "task": "test_scenarios"}
+        except json.JSONDecodeError:
+            results[custom_id] = {"error": "JSON parsing error", "raw_content": content[:500]}
+    logger.info(f"OpenAI batch {batch_id} completed with {len(results)} results")
+    return results
+
 def _process_general_with_openai(client, model: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """OpenAI ile genel amaçlı işleme yap"""
     try:
@@ -395,7 +1015,8 @@ def _process_general_with_openai(client, model: str, data: Dict[str, Any]) -> Di
         response_format = data.get("response_format", {"type": "json_object"})
         
         # API isteği yap
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            client,
             model=model,
             messages=[
                 {"role": "system", "content": system_instruction},
@@ -406,24 +1027,15 @@ def _process_general_with_openai(client, model: str, data: Dict[str, Any]) -> Di
             response_format=response_format
         )
         
-        # Yanıtı işle
+        # Yanıt formatı JSON ise, parse et
+        if response_format.get("type") == "json_object":
+            return _parse_json_response(response, model, "general")
+        
+        # Düz metin yanıtı
         if response and response.choices:
-            content = response.choices[0].message.content
-            
-            # Yanıt formatı JSON ise, parse et
-            if response_format.get("type") == "json_object":
-                try:
-                    result = json.loads(content)
-                    return {"result": result, "model": model, "task": "general"}
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse JSON response from OpenAI")
-                    return {"error": "JSON parsing error", "raw_content": content[:500]}
-            else:
-                # Düz metin yanıtı
-                return {"result": {"content": content}, "model": model, "task": "general"}
-        else:
-            logger.error("Empty or invalid response from OpenAI")
-            return {"error": "Empty or invalid response"}
+            return {"result": {"content": response.choices[0].message.content}, "model": model, "task": "general"}
+        logger.error("Empty or invalid response from OpenAI")
+        return {"error": "Empty or invalid response"}
             
     except Exception as e:
         logger.error(f"Error in general processing with OpenAI: {str(e)}")
@@ -495,35 +1107,34 @@ def analyze_image_with_openai(
     if not user_prompt:
         user_prompt = "Bu görseli analiz ederek test senaryoları için kullanılabilecek bilgileri çıkar"
     
+    # Aynı görsel aynı model ve promptlarla daha önce analiz edildiyse API'ye gidilmez
+    cache_key = _vision_cache_key(image_base64, model, system_prompt, user_prompt, temperature)
+    cached = _vision_cache_get(cache_key)
+    if cached is not None:
+        logger.info("Görsel analizi önbellekten alındı (OpenAI)")
+        cached["analysis_time"] = time.time() - start_time
+        return cached
+    
     try:
-        from openai import OpenAI
-        
         # OpenAI API anahtarı
-        api_key = os.environ.get("OPENAI_API_KEY", "")
-        
-        # Eğer ortam değişkenlerinde yoksa, config manager'dan almayı dene
-        if not api_key:
-            try:
-                from utils.config import config_manager
-                api_key = config_manager.get_api_key("openai")
-            except Exception as e:
-                logger.warning(f"Config manager'dan API anahtarı alınamadı: {e}")
+        api_key = _resolve_api_key()
         
         if not api_key:
             logger.error("OpenAI API anahtarı bulunamadı")
             return {"error": "OpenAI API anahtarı gerekli fakat bulunamadı"}
         
-        # OpenAI istemcisi oluştur
-        client = OpenAI(api_key=api_key)
+        # OpenAI istemcisi (anahtar başına önbellekte)
+        client = _get_client(api_key)
         
-        # Görsel için istek hazırla
+        # Görsel için istek hazırla (büyük görseller küçültülmüş JPEG olarak gönderilir)
         message_content = [
             {"type": "text", "text": user_prompt},
-            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}}
+            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{_shrink_image_base64(image_base64)}"}}
         ]
         
         # API isteği yap
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            client,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -539,20 +1150,13 @@ def analyze_image_with_openai(
             content = response.choices[0].message.content
             try:
                 # Metni JSON olarak ayrıştırma denemesi
-                result = json.loads(content)
-                return {
-                    "text": content,
-                    "json": result,
-                    "model": model,
-                    "analysis_time": time.time() - start_time
-                }
+                analysis = {"text": content, "json": _json_loads(content), "model": model}
             except json.JSONDecodeError:
                 # JSON ayrıştırma başarısız olursa sadece metin olarak döndür
-                return {
-                    "text": content,
-                    "model": model,
-                    "analysis_time": time.time() - start_time
-                }
+                analysis = {"text": content, "model": model}
+            _vision_cache_put(cache_key, analysis)
+            analysis["analysis_time"] = time.time() - start_time
+            return analysis
         else:
             logger.error("Empty or invalid response from OpenAI")
             return {"error": "Empty or invalid response from OpenAI"}
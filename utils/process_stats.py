@@ -6,15 +6,66 @@ izlemek ve raporlamak için kullanılır. Her işlemden sonra istatistikleri top
 ve analiz edilebilir bir formatta sunar.
 """
 
+import atexit
+import heapq
 import logging
 import json
+import os
+import queue
+import threading
 import time
 from pathlib import Path
 from typing import Dict, Any, List
 
+# orjson varsa istatistikler onunla (bayt olarak) serileştirilir ve çözülür; dosyalar yalnızca bu modül
+# tarafından okunduğu için girintisiz, sıkıştırılmış biçimde yazılır
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 # Loglama ayarları
 logger = logging.getLogger(__name__)
 
+# Değişen istatistikler en fazla bu aralıkla (saniye) diske yazılır; kayıt çağrıları dosyaya dokunmaz
+STATS_FLUSH_INTERVAL = 1.0
+
+# Kayıtlar olay günlüğüne birer satır olarak eklenir; bu kadar olaydan sonra özet dosyası yeniden yazılır
+# ve günlük sıfırlanır (sıkıştırma)
+STATS_COMPACT_EVERY = 500
+
+
+def _update_mean(entry: Dict[str, Any], avg_key: str, m2_key: str, count: int, value: float):
+    """
+    Ortalamayı ve kare sapmalar toplamını (M2) Welford yöntemiyle yerinde güncelle.
+    
+    count, value dahil edildikten sonraki örnek sayısıdır; varyans M2 / count ile elde edilir.
+    """
+    mean = entry[avg_key]
+    delta = value - mean
+    mean += delta / count
+    entry[avg_key] = mean
+    entry[m2_key] = entry.get(m2_key, 0.0) + delta * (value - mean)
+
+
+def _document_aggregate() -> Dict[str, Any]:
+    """Dosya türü / model başına belge işleme istatistiği kaydı"""
+    return {"total": 0, "successful": 0, "failed": 0, "avg_time": 0, "time_m2": 0.0}
+
+
+def _model_aggregate() -> Dict[str, Any]:
+    """Model / görev başına model kullanım istatistiği kaydı"""
+    return {"total_calls": 0, "successful_calls": 0, "failed_calls": 0, "avg_response_time": 0, "response_time_m2": 0.0}
+
+
 class ProcessStatistics:
     """
     Belge işleme ve test senaryosu oluşturma performansı istatistikleri
@@ -27,6 +78,7 @@ class ProcessStatistics:
                 "successful": 0,
                 "failed": 0,
                 "avg_time": 0,
+                "time_m2": 0.0,
                 "fastest_time": None,
                 "slowest_time": None,
                 "by_file_type": {},
@@ -43,35 +95,172 @@ class ProcessStatistics:
             }
         }
         
-        # İstatistik dosyası yolu
+        # İstatistik dosyası (özet) ve son özetten sonraki kayıtların olay günlüğü
         self.stats_file = Path("logs/process_stats.json")
+        self.events_file = Path("logs/process_stats.jsonl")
+        
+        # Son yazılan özetin özeti (hash); içerik değişmediyse dosya yeniden yazılmaz
+        self._last_hash = None
         
-        # İstatistikleri varsa yükle
+        # İstatistikleri varsa yükle; önceki çalışmadan kalan olaylar özete işlenir
         self._load_stats()
+        self._events = None
+        self._pending_events = self._replay_events()
+        if self._pending_events:
+            self._compact()
+        
+        # Kayıtlar kuyruğa eklenir; yazıcı iş parçacığı onları STATS_FLUSH_INTERVAL aralıkla uygulayıp
+        # olay günlüğüne ekler. get_summary ve çıkıştaki close bekleyen kayıtları da uygular.
+        self._lock = threading.RLock()
+        self._queue = queue.Queue()
+        self._dirty = False
+        # get_summary'nin en çok kullanılan model/görev/hata listeleri; yeni kayıt uygulanınca geçersiz olur
+        self._top_cache = None
+        atexit.register(self.close)
+        threading.Thread(target=self._writer_loop, name="process-stats-writer", daemon=True).start()
         
         logger.info("İşlem istatistikleri toplayıcısı başlatıldı")
     
+    # Olay türü -> istatistiklere uygulayan metot
+    _APPLIERS = {
+        "document": "_apply_document_processing",
+        "model": "_apply_model_usage",
+        "error": "_apply_error",
+    }
+    
+    def _apply_event(self, kind: str, args) -> bool:
+        """Bir olayı istatistiklere uygula; başarılıysa True"""
+        try:
+            getattr(self, self._APPLIERS[kind])(*args)
+            return True
+        except Exception as e:
+            logger.error(f"İstatistik kaydı uygulanırken hata: {str(e)}")
+            return False
+    
+    def _replay_events(self) -> int:
+        """Olay günlüğündeki (son özetten sonraki) kayıtları istatistiklere uygula; uygulanan olay sayısını döndür"""
+        if not self.events_file.exists():
+            return 0
+        replayed = 0
+        try:
+            with open(self.events_file, 'rb') as f:
+                for line in f:
+                    try:
+                        kind, args = _json_loads(line)
+                    except ValueError:
+                        # Yarım kalmış son satır
+                        continue
+                    replayed += self._apply_event(kind, args)
+        except Exception as e:
+            logger.error(f"İstatistik olay günlüğü okunurken hata: {str(e)}")
+        if replayed:
+            logger.info(f"İstatistik olay günlüğünden {replayed} kayıt uygulandı")
+        return replayed
+    
+    def _drain(self):
+        """Kuyrukta bekleyen kayıtları sırayla uygula ve olay günlüğüne ekle (kilit altında çağrılır)"""
+        while True:
+            try:
+                kind, args = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if not self._apply_event(kind, args):
+                continue
+            try:
+                if self._events is None:
+                    self.events_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._events = open(self.events_file, 'ab', buffering=64 * 1024)
+                self._events.write(_json_dumps([kind, args]) + b'\n')
+            except Exception as e:
+                logger.error(f"İstatistik olay günlüğüne yazılırken hata: {str(e)}")
+            self._pending_events += 1
+            self._dirty = True
+            self._top_cache = None
+    
+    def _writer_loop(self):
+        """Biriken kayıtları aralıklı olarak uygula ve diske yaz"""
+        while True:
+            time.sleep(STATS_FLUSH_INTERVAL)
+            self.flush()
+    
+    def flush(self):
+        """Bekleyen kayıtları uygula ve olay günlüğüne yaz; yeterince olay biriktiyse özeti yeniden oluştur"""
+        with self._lock:
+            self._drain()
+            if not self._dirty:
+                return
+            self._dirty = False
+            if self._pending_events >= STATS_COMPACT_EVERY:
+                self._compact()
+            elif self._events is not None:
+                # Günlük diske de işlenir; bu yol yalnızca yazıcı iş parçacığının aralıklı boşaltmasıdır
+                try:
+                    self._events.flush()
+                    os.fsync(self._events.fileno())
+                except OSError as e:
+                    logger.error(f"İstatistik olay günlüğü diske yazılırken hata: {str(e)}")
+    
+    def close(self):
+        """Bekleyen kayıtları uygula, özeti yaz ve olay günlüğünü kapat"""
+        with self._lock:
+            self._drain()
+            if self._pending_events:
+                self._compact()
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+    
+    def _compact(self):
+        """Özeti dosyaya yaz ve artık özete dahil olan olay günlüğünü sıfırla"""
+        if not self._save_stats():
+            return
+        try:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+            with open(self.events_file, 'wb'):
+                pass
+            self._pending_events = 0
+        except Exception as e:
+            logger.error(f"İstatistik olay günlüğü sıfırlanırken hata: {str(e)}")
+    
     def _load_stats(self):
         """Kaydedilmiş istatistikleri yükle"""
         if self.stats_file.exists():
             try:
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    self.stats = json.load(f)
+                with open(self.stats_file, 'rb') as f:
+                    data = f.read()
+                self.stats = _json_loads(data)
+                self._last_hash = hash(data)
                 logger.info(f"İşlem istatistikleri yüklendi: {self.stats_file}")
             except Exception as e:
                 logger.error(f"İstatistik dosyası yüklenirken hata: {str(e)}")
     
-    def _save_stats(self):
-        """İstatistikleri dosyaya kaydet"""
+    def _save_stats(self) -> bool:
+        """İstatistikleri geçici dosyaya yazıp atomik olarak yerine taşı; başarılıysa True"""
         try:
             # Dizin yoksa oluştur
             self.stats_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, ensure_ascii=False, indent=2)
+            data = _json_dumps(self.stats)
+            data_hash = hash(data)
+            if data_hash == self._last_hash:
+                logger.debug("İşlem istatistikleri değişmedi, dosya yeniden yazılmadı")
+                return True
+            
+            tmp_file = self.stats_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                # Özet yerine taşınmadan ve olay günlüğü sıfırlanmadan önce diske işlenmiş olmalı
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.stats_file)
+            self._last_hash = data_hash
             logger.debug("İşlem istatistikleri güncellendi ve kaydedildi")
+            return True
         except Exception as e:
             logger.error(f"İstatistikler kaydedilirken hata: {str(e)}")
+            return False
     
     def record_document_processing(self, file_type: str, model: str, success: bool, 
                               processing_time: float, details: Dict[str, Any] = None):
@@ -85,95 +274,8 @@ class ProcessStatistics:
             processing_time: İşlem süresi (saniye)
             details: İlave detaylar
         """
-        # Genel istatistikleri güncelle
-        self.stats["document_processing"]["total"] += 1
-        
-        if success:
-            self.stats["document_processing"]["successful"] += 1
-        else:
-            self.stats["document_processing"]["failed"] += 1
-        
-        # Ortalama süreyi güncelle
-        total = self.stats["document_processing"]["total"]
-        current_avg = self.stats["document_processing"]["avg_time"]
-        
-        if total == 1:
-            new_avg = processing_time
-        else:
-            new_avg = ((current_avg * (total - 1)) + processing_time) / total
-        
-        self.stats["document_processing"]["avg_time"] = new_avg
-        
-        # En hızlı ve en yavaş süreleri güncelle
-        if (self.stats["document_processing"]["fastest_time"] is None or 
-            processing_time < self.stats["document_processing"]["fastest_time"]):
-            self.stats["document_processing"]["fastest_time"] = processing_time
-            
-        if (self.stats["document_processing"]["slowest_time"] is None or
-            processing_time > self.stats["document_processing"]["slowest_time"]):
-            self.stats["document_processing"]["slowest_time"] = processing_time
-        
-        # Dosya türüne göre istatistikleri güncelle
-        if file_type not in self.stats["document_processing"]["by_file_type"]:
-            self.stats["document_processing"]["by_file_type"][file_type] = {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_time": 0
-            }
-            
-        self.stats["document_processing"]["by_file_type"][file_type]["total"] += 1
-        
-        if success:
-            self.stats["document_processing"]["by_file_type"][file_type]["successful"] += 1
-        else:
-            self.stats["document_processing"]["by_file_type"][file_type]["failed"] += 1
-            
-        # Dosya türü için ortalama süreyi güncelle
-        ft_total = self.stats["document_processing"]["by_file_type"][file_type]["total"]
-        ft_current_avg = self.stats["document_processing"]["by_file_type"][file_type]["avg_time"]
-        
-        if ft_total == 1:
-            ft_new_avg = processing_time
-        else:
-            ft_new_avg = ((ft_current_avg * (ft_total - 1)) + processing_time) / ft_total
-            
-        self.stats["document_processing"]["by_file_type"][file_type]["avg_time"] = ft_new_avg
-        
-        # Modele göre istatistikleri güncelle
-        if model not in self.stats["document_processing"]["by_model"]:
-            self.stats["document_processing"]["by_model"][model] = {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_time": 0
-            }
-            
-        self.stats["document_processing"]["by_model"][model]["total"] += 1
-        
-        if success:
-            self.stats["document_processing"]["by_model"][model]["successful"] += 1
-        else:
-            self.stats["document_processing"]["by_model"][model]["failed"] += 1
-            
-        # Model için ortalama süreyi güncelle
-        model_total = self.stats["document_processing"]["by_model"][model]["total"]
-        model_current_avg = self.stats["document_processing"]["by_model"][model]["avg_time"]
-        
-        if model_total == 1:
-            model_new_avg = processing_time
-        else:
-            model_new_avg = ((model_current_avg * (model_total - 1)) + processing_time) / model_total
-            
-        self.stats["document_processing"]["by_model"][model]["avg_time"] = model_new_avg
-        
-        # İstatistikleri kaydet
-        self._save_stats()
-        
-        # Detaylı log
-        logger.info(f"Belge işleme istatistikleri güncellendi: "
-                   f"Dosya türü: {file_type}, Model: {model}, "
-                   f"Başarı: {success}, Süre: {processing_time:.2f} sn")
+        # Kayıt yazıcı iş parçacığına kuyrukla iletilir; çağıran taraf beklemez
+        self._queue.put(("document", (file_type, model, success, processing_time)))
     
     def record_model_usage(self, model: str, task: str, success: bool, 
                           response_time: float, token_count: int = None):
@@ -187,133 +289,106 @@ class ProcessStatistics:
             response_time: Yanıt süresi
             token_count: Kullanılan token sayısı
         """
-        # Genel istatistikleri güncelle
-        self.stats["model_usage"]["total_calls"] += 1
+        # Kayıt yazıcı iş parçacığına kuyrukla iletilir; çağıran taraf beklemez
+        self._queue.put(("model", (model, task, success, response_time, token_count)))
+    
+    def record_error(self, error_type: str, details: Dict[str, Any] = None):
+        """
+        Hata istatistiklerini kaydet
         
-        # Modele göre istatistikleri güncelle
-        if model not in self.stats["model_usage"]["by_model"]:
-            self.stats["model_usage"]["by_model"][model] = {
-                "total_calls": 0,
-                "successful_calls": 0,
-                "failed_calls": 0,
-                "avg_response_time": 0,
-                "total_tokens": 0
-            }
+        Args:
+            error_type: Hata türü
+            details: Hata detayları
+        """
+        # Kayıt yazıcı iş parçacığına kuyrukla iletilir; çağıran taraf beklemez
+        self._queue.put(("error", (error_type, time.time())))
+    
+    def _apply_document_processing(self, file_type: str, model: str, success: bool, processing_time: float):
+        """Belge işleme kaydını istatistiklere uygula"""
+        dp = self.stats["document_processing"]
+        # Kayıtlar yalnızca ilk kez görülen anahtar için oluşturulur (setdefault her çağrıda yeni sözlük ayırırdı)
+        ft = dp["by_file_type"].get(file_type)
+        if ft is None:
+            ft = dp["by_file_type"][file_type] = _document_aggregate()
+        m = dp["by_model"].get(model)
+        if m is None:
+            m = dp["by_model"][model] = _document_aggregate()
+        
+        # Genel, dosya türü ve model istatistiklerini güncelle
+        outcome = "successful" if success else "failed"
+        for entry in (dp, ft, m):
+            total = entry["total"] = entry["total"] + 1
+            entry[outcome] += 1
             
-        self.stats["model_usage"]["by_model"][model]["total_calls"] += 1
+            # Ortalama süreyi güncelle
+            _update_mean(entry, "avg_time", "time_m2", total, processing_time)
         
-        if success:
-            self.stats["model_usage"]["by_model"][model]["successful_calls"] += 1
-        else:
-            self.stats["model_usage"]["by_model"][model]["failed_calls"] += 1
-            
-        # Ortalama yanıt süresini güncelle
-        model_calls = self.stats["model_usage"]["by_model"][model]["total_calls"]
-        model_current_avg = self.stats["model_usage"]["by_model"][model]["avg_response_time"]
+        # En hızlı ve en yavaş süreleri güncelle
+        fastest = dp["fastest_time"]
+        if fastest is None or processing_time < fastest:
+            dp["fastest_time"] = processing_time
+        
+        slowest = dp["slowest_time"]
+        if slowest is None or processing_time > slowest:
+            dp["slowest_time"] = processing_time
         
-        if model_calls == 1:
-            model_new_avg = response_time
-        else:
-            model_new_avg = ((model_current_avg * (model_calls - 1)) + response_time) / model_calls
+        # Detaylı log
+        logger.info("Belge işleme istatistikleri güncellendi: "
+                    "Dosya türü: %s, Model: %s, Başarı: %s, Süre: %.2f sn",
+                    file_type, model, success, processing_time)
+    
+    def _apply_model_usage(self, model: str, task: str, success: bool, response_time: float, token_count: int = None):
+        """Model kullanım kaydını istatistiklere uygula"""
+        mu = self.stats["model_usage"]
+        mu["total_calls"] += 1
+        
+        # Kayıtlar yalnızca ilk kez görülen anahtar için oluşturulur
+        by_model = mu["by_model"].get(model)
+        if by_model is None:
+            by_model = mu["by_model"][model] = _model_aggregate()
+            by_model["total_tokens"] = 0
+        by_task = mu["by_task"].get(task)
+        if by_task is None:
+            by_task = mu["by_task"][task] = _model_aggregate()
+            by_task["by_model"] = {}
+        combo = by_task["by_model"].get(model)
+        if combo is None:
+            combo = by_task["by_model"][model] = _model_aggregate()
+        
+        # Model, görev ve görev-model kombinasyonu istatistiklerini güncelle
+        outcome = "successful_calls" if success else "failed_calls"
+        for entry in (by_model, by_task, combo):
+            calls = entry["total_calls"] = entry["total_calls"] + 1
+            entry[outcome] += 1
             
-        self.stats["model_usage"]["by_model"][model]["avg_response_time"] = model_new_avg
+            # Ortalama yanıt süresini güncelle
+            _update_mean(entry, "avg_response_time", "response_time_m2", calls, response_time)
         
         # Token sayısını güncelle (eğer verilmişse)
         if token_count is not None:
-            self.stats["model_usage"]["by_model"][model]["total_tokens"] += token_count
-        
-        # Görev türüne göre istatistikleri güncelle
-        if task not in self.stats["model_usage"]["by_task"]:
-            self.stats["model_usage"]["by_task"][task] = {
-                "total_calls": 0,
-                "successful_calls": 0,
-                "failed_calls": 0,
-                "avg_response_time": 0,
-                "by_model": {}
-            }
-            
-        self.stats["model_usage"]["by_task"][task]["total_calls"] += 1
-        
-        if success:
-            self.stats["model_usage"]["by_task"][task]["successful_calls"] += 1
-        else:
-            self.stats["model_usage"]["by_task"][task]["failed_calls"] += 1
-            
-        # Görev için ortalama yanıt süresini güncelle
-        task_calls = self.stats["model_usage"]["by_task"][task]["total_calls"]
-        task_current_avg = self.stats["model_usage"]["by_task"][task]["avg_response_time"]
-        
-        if task_calls == 1:
-            task_new_avg = response_time
-        else:
-            task_new_avg = ((task_current_avg * (task_calls - 1)) + response_time) / task_calls
-            
-        self.stats["model_usage"]["by_task"][task]["avg_response_time"] = task_new_avg
-        
-        # Görev ve model kombinasyonu istatistiklerini güncelle
-        if model not in self.stats["model_usage"]["by_task"][task]["by_model"]:
-            self.stats["model_usage"]["by_task"][task]["by_model"][model] = {
-                "total_calls": 0,
-                "successful_calls": 0,
-                "failed_calls": 0,
-                "avg_response_time": 0
-            }
-            
-        self.stats["model_usage"]["by_task"][task]["by_model"][model]["total_calls"] += 1
-        
-        if success:
-            self.stats["model_usage"]["by_task"][task]["by_model"][model]["successful_calls"] += 1
-        else:
-            self.stats["model_usage"]["by_task"][task]["by_model"][model]["failed_calls"] += 1
-            
-        # Görev ve model kombinasyonu için ortalama yanıt süresini güncelle
-        combo_calls = self.stats["model_usage"]["by_task"][task]["by_model"][model]["total_calls"]
-        combo_current_avg = self.stats["model_usage"]["by_task"][task]["by_model"][model]["avg_response_time"]
-        
-        if combo_calls == 1:
-            combo_new_avg = response_time
-        else:
-            combo_new_avg = ((combo_current_avg * (combo_calls - 1)) + response_time) / combo_calls
-            
-        self.stats["model_usage"]["by_task"][task]["by_model"][model]["avg_response_time"] = combo_new_avg
-        
-        # İstatistikleri kaydet
-        self._save_stats()
+            by_model["total_tokens"] += token_count
         
         # Detaylı log
-        token_info = f", Token: {token_count}" if token_count is not None else ""
-        logger.info(f"Model kullanım istatistikleri güncellendi: "
-                   f"Model: {model}, Görev: {task}, "
-                   f"Başarı: {success}, Süre: {response_time:.2f} sn{token_info}")
+        if logger.isEnabledFor(logging.INFO):
+            token_info = f", Token: {token_count}" if token_count is not None else ""
+            logger.info("Model kullanım istatistikleri güncellendi: "
+                        "Model: %s, Görev: %s, Başarı: %s, Süre: %.2f sn%s",
+                        model, task, success, response_time, token_info)
     
-    def record_error(self, error_type: str, details: Dict[str, Any] = None):
-        """
-        Hata istatistiklerini kaydet
-        
-        Args:
-            error_type: Hata türü
-            details: Hata detayları
-        """
-        # Genel hata sayısını güncelle
-        self.stats["errors"]["count"] += 1
+    def _apply_error(self, error_type: str, seen_at: float):
+        """Hata kaydını istatistiklere uygula"""
+        errors = self.stats["errors"]
+        errors["count"] += 1
         
         # Hata türüne göre istatistikleri güncelle
-        if error_type not in self.stats["errors"]["by_type"]:
-            self.stats["errors"]["by_type"][error_type] = {
-                "count": 0,
-                "first_seen": time.time(),
-                "last_seen": time.time()
-            }
-            
-        self.stats["errors"]["by_type"][error_type]["count"] += 1
-        self.stats["errors"]["by_type"][error_type]["last_seen"] = time.time()
-        
-        # İstatistikleri kaydet
-        self._save_stats()
+        entry = errors["by_type"].get(error_type)
+        if entry is None:
+            entry = errors["by_type"][error_type] = {"count": 0, "first_seen": seen_at, "last_seen": seen_at}
+        entry["count"] += 1
+        entry["last_seen"] = seen_at
         
         # Detaylı log
-        logger.warning(f"Hata istatistikleri güncellendi: Tür: {error_type}, "
-                     f"Toplam: {self.stats['errors']['by_type'][error_type]['count']}")
+        logger.warning("Hata istatistikleri güncellendi: Tür: %s, Toplam: %d", error_type, entry["count"])
     
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -322,26 +397,39 @@ class ProcessStatistics:
         Returns:
             Özet istatistikler
         """
-        summary = {
-            "document_processing": {
-                "total": self.stats["document_processing"]["total"],
-                "successful": self.stats["document_processing"]["successful"],
-                "failed": self.stats["document_processing"]["failed"],
-                "success_rate": 0,
-                "avg_time": self.stats["document_processing"]["avg_time"],
-                "fastest_time": self.stats["document_processing"]["fastest_time"],
-                "slowest_time": self.stats["document_processing"]["slowest_time"]
-            },
-            "model_usage": {
-                "total_calls": self.stats["model_usage"]["total_calls"],
-                "top_models": self._get_top_models(3),
-                "top_tasks": self._get_top_tasks(3)
-            },
-            "errors": {
-                "count": self.stats["errors"]["count"],
-                "top_errors": self._get_top_errors(3)
+        # Kuyrukta bekleyen kayıtlar da özete yansıtılır
+        with self._lock:
+            self._drain()
+            
+            # Sıralamalar yalnızca son özetten bu yana kayıt uygulandıysa yeniden hesaplanır
+            top = self._top_cache
+            if top is None:
+                top = self._top_cache = {
+                    "models": self._get_top_models(3),
+                    "tasks": self._get_top_tasks(3),
+                    "errors": self._get_top_errors(3)
+                }
+            
+            summary = {
+                "document_processing": {
+                    "total": self.stats["document_processing"]["total"],
+                    "successful": self.stats["document_processing"]["successful"],
+                    "failed": self.stats["document_processing"]["failed"],
+                    "success_rate": 0,
+                    "avg_time": self.stats["document_processing"]["avg_time"],
+                    "fastest_time": self.stats["document_processing"]["fastest_time"],
+                    "slowest_time": self.stats["document_processing"]["slowest_time"]
+                },
+                "model_usage": {
+                    "total_calls": self.stats["model_usage"]["total_calls"],
+                    "top_models": [dict(item) for item in top["models"]],
+                    "top_tasks": [dict(item) for item in top["tasks"]]
+                },
+                "errors": {
+                    "count": self.stats["errors"]["count"],
+                    "top_errors": [dict(item) for item in top["errors"]]
+                }
             }
-        }
         
         # Başarı oranını hesapla
         if summary["document_processing"]["total"] > 0:
@@ -353,51 +441,36 @@ class ProcessStatistics:
     
     def _get_top_models(self, count: int) -> List[Dict[str, Any]]:
         """En çok kullanılan modelleri döndür"""
-        models = []
-        
-        for model, stats in self.stats["model_usage"]["by_model"].items():
-            models.append({
-                "model": model,
-                "total_calls": stats["total_calls"],
-                "avg_response_time": stats["avg_response_time"]
-            })
-            
-        # Çağrı sayısına göre sırala
-        models.sort(key=lambda x: x["total_calls"], reverse=True)
-        
-        return models[:count]
+        # Çağrı sayısına göre ilk count model seçilir; tamamı sıralanmaz
+        top = heapq.nlargest(count, self.stats["model_usage"]["by_model"].items(),
+                             key=lambda item: item[1]["total_calls"])
+        
+        return [
+            {"model": model, "total_calls": stats["total_calls"], "avg_response_time": stats["avg_response_time"]}
+            for model, stats in top
+        ]
     
     def _get_top_tasks(self, count: int) -> List[Dict[str, Any]]:
         """En çok yapılan görevleri döndür"""
-        tasks = []
-        
-        for task, stats in self.stats["model_usage"]["by_task"].items():
-            tasks.append({
-                "task": task,
-                "total_calls": stats["total_calls"],
-                "avg_response_time": stats["avg_response_time"]
-            })
-            
-        # Çağrı sayısına göre sırala
-        tasks.sort(key=lambda x: x["total_calls"], reverse=True)
-        
-        return tasks[:count]
+        # Çağrı sayısına göre ilk count görev seçilir
+        top = heapq.nlargest(count, self.stats["model_usage"]["by_task"].items(),
+                             key=lambda item: item[1]["total_calls"])
+        
+        return [
+            {"task": task, "total_calls": stats["total_calls"], "avg_response_time": stats["avg_response_time"]}
+            for task, stats in top
+        ]
     
     def _get_top_errors(self, count: int) -> List[Dict[str, Any]]:
         """En çok karşılaşılan hataları döndür"""
-        errors = []
-        
-        for error_type, stats in self.stats["errors"]["by_type"].items():
-            errors.append({
-                "type": error_type,
-                "count": stats["count"],
-                "last_seen": stats["last_seen"]
-            })
-            
-        # Hata sayısına göre sırala
-        errors.sort(key=lambda x: x["count"], reverse=True)
-        
-        return errors[:count]
+        # Hata sayısına göre ilk count hata türü seçilir
+        top = heapq.nlargest(count, self.stats["errors"]["by_type"].items(),
+                             key=lambda item: item[1]["count"])
+        
+        return [
+            {"type": error_type, "count": stats["count"], "last_seen": stats["last_seen"]}
+            for error_type, stats in top
+        ]
 
 # Modül yüklendiğinde otomatik olarak istatistik toplayıcıyı başlat
 process_stats = ProcessStatistics()
\ No newline at end of file
@@ -8,12 +8,103 @@ sonuçları işlemeye olanak tanır.
 import os
 import json
 import logging
-import requests
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union
 
+# orjson varsa istek gövdesi ve yanıt onunla serileştirilir/çözülür
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 # Logging
 logger = logging.getLogger(__name__)
 
+# h2 paketi kuruluysa eşzamanlı istekler tek bağlantı üzerinden HTTP/2 ile çoğullanır
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Tüm çağrılar aynı istemciyi kullanır; bağlantılar (TLS dahil) havuzda tutulup yeniden kullanılır.
+# Kurulamayan bağlantılar taşıma katmanında yeniden denenir.
+_CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=_HTTP2_AVAILABLE,
+        retries=3,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    ),
+    timeout=httpx.Timeout(120.0, connect=5.0)
+)
+
+# 429 ve geçici 5xx yanıtları kısa üstel bekleme ile (varsa Retry-After'a uyularak) yeniden denenir
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+AZURE_STATUS_RETRIES = 3
+AZURE_RETRY_BACKOFF = 0.2
+AZURE_RETRY_AFTER_MAX = 60
+
+# Doctest sabit değerleri (ortam değişkenleri yoksa yedek olarak)
+_DEFAULT_API_KEY = "API-KEY"
+_DEFAULT_O1_API_KEY = "API-KEY"
+_DEFAULT_ENDPOINT = "https://api-url.openai.azure.com"
+
+# Model adına göre (deployment ID, API versiyonu, özel API anahtarının ortam değişkeni);
+# listede olmayan modeller deployment ID olarak kendi adını ve standart API versiyonunu kullanır
+_MODEL_CONFIG = {
+    "o1": ("api-url-o1", "2024-12-01-preview", "O1_API_KEY"),
+    "o3-mini": ("api-url-o3-mini", "2024-12-01-preview", "O1_API_KEY"),
+}
+_DEFAULT_API_VERSION = "2024-08-01-preview"
+
+# GPT serisi modellerde yanıt JSON nesnesi olarak istenir (yalnızca serileştirilir, paylaşılabilir)
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+def _build_gpt_payload(messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    """GPT serisi modeller için standart payload"""
+    return {
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "response_format": _JSON_RESPONSE_FORMAT
+    }
+
+def _build_claude_payload(messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    """Claude modelleri (o1, o3-mini) için payload; temperature ve response_format desteklenmiyor"""
+    return {
+        "messages": messages,
+        "max_completion_tokens": max_tokens  # Claude modelleri için özel parametre
+    }
+
+# Model adına göre payload oluşturucu; listede olmayan modeller GPT payload'ını kullanır
+_PAYLOAD_BUILDERS = {model: _build_claude_payload for model in _MODEL_CONFIG}
+
+# Toplu gönderimde aynı anda açık tutulacak en fazla istek sayısı
+AZURE_MAX_CONCURRENCY = int(os.environ.get("AZURE_MAX_CONCURRENCY", "16"))
+
+def _post(url: str, headers: Dict[str, str], body: bytes) -> httpx.Response:
+    """İsteği gönder; yeniden denenebilir durum kodlarında bekleyip tekrar dener, son yanıtı döndürür"""
+    for attempt in range(AZURE_STATUS_RETRIES + 1):
+        response = _CLIENT.post(url, headers=headers, content=body)
+        if response.status_code not in _RETRY_STATUSES or attempt == AZURE_STATUS_RETRIES:
+            return response
+        
+        delay = AZURE_RETRY_BACKOFF * (2 ** attempt)
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            delay = max(delay, min(int(retry_after), AZURE_RETRY_AFTER_MAX))
+        logger.warning("Azure OpenAI returned %d; retrying in %.1fs (attempt %d/%d)",
+                       response.status_code, delay, attempt + 2, AZURE_STATUS_RETRIES + 1)
+        time.sleep(delay)
+
 def send_to_azure(
     messages: List[Dict[str, Any]],
     model: str = "gpt-4o-mini",
@@ -36,51 +127,35 @@ def send_to_azure(
     Returns:
         İşlenmiş API yanıtı veya hata durumunda None
     """
-    # Azure kimlik bilgilerini al
+    # Azure kimlik bilgilerini al (ortam değişkenleri çalışma sırasında güncellenebildiği için her çağrıda okunur)
     azure_api_key = os.environ.get("AZURE_OPENAI_API_KEY")
     azure_endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
     
-    # Doctest sabit değerleri (yedek olarak)
-    api_api_key = "API-KEY"
-    O1_API_KEY = "API-KEY"
-    api_endpoint = "https://api-url.openai.azure.com"
-    
     # API anahtarı ve endpoint kontrol et
     if not azure_api_key:
-        azure_api_key = api_api_key
+        azure_api_key = _DEFAULT_API_KEY
         logger.warning("Azure API key not found, using default Doctest key")
     
     if not azure_endpoint:
-        azure_endpoint = api_endpoint
+        azure_endpoint = _DEFAULT_ENDPOINT
         logger.warning("Azure endpoint not found, using default Doctest endpoint")
     
     # Model adına göre deployment ID ve API versiyonu belirle (belirtilmemişse)
+    model_config = _MODEL_CONFIG.get(model)
     if not deployment_id:
-        # Model adına göre deployment ID belirle
-        if model == "o1":
-            deployment_id = "api-url-o1"
-            # o1 için özel API anahtarını kullan
-            o1_api_key = os.environ.get("O1_API_KEY", O1_API_KEY)
-            if o1_api_key:
-                azure_api_key = o1_api_key
-                logger.info("Using special API key for o1 model")
-        elif model == "o3-mini":
-            deployment_id = "api-url-o3-mini"
-            # o3-mini için de özel API anahtarını kullan
-            o3_mini_api_key = os.environ.get("O1_API_KEY", O1_API_KEY)
-            if o3_mini_api_key:
-                azure_api_key = o3_mini_api_key
-                logger.info("Using special API key for o3-mini model")
+        if model_config:
+            deployment_id = model_config[0]
+            # o1 ve o3-mini için özel API anahtarını kullan
+            special_api_key = os.environ.get(model_config[2], _DEFAULT_O1_API_KEY)
+            if special_api_key:
+                azure_api_key = special_api_key
+                logger.info("Using special API key for %s model", model)
         else:
             # Diğer modeller için doğrudan model adını kullan
             deployment_id = model
     
     if not api_version:
-        # Model adına göre API versiyonu belirle
-        if model in ["o1", "o3-mini"]:
-            api_version = "2024-12-01-preview"  # Claude modelleri için özel API versiyonu
-        else:
-            api_version = "2024-08-01-preview"  # Standart modeller için API versiyonu
+        api_version = model_config[1] if model_config else _DEFAULT_API_VERSION
     
     # API endpoint URL'sini oluştur
     url = f"{azure_endpoint}/openai/deployments/{deployment_id}/chat/completions?api-version={api_version}"
@@ -91,35 +166,27 @@ def send_to_azure(
         "api-key": azure_api_key
     }
     
-    # Claude modelleri (o1, o3-mini) için özelleştirilmiş istek payload'ı oluştur
-    if model in ["o1", "o3-mini"]:
-        payload = {
-            "messages": messages,
-            "max_completion_tokens": max_tokens  # Claude modelleri için özel parametre
-            # Claude modelleri için temperature ve response_format desteklenmiyor
-        }
-    else:
-        # GPT serisi modeller için standart payload
-        payload = {
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "response_format": {"type": "json_object"}
-        }
+    # İstek payload'ı model türüne göre oluşturulur
+    payload = _PAYLOAD_BUILDERS.get(model, _build_gpt_payload)(messages, temperature, max_tokens)
     
     try:
-        logger.info(f"Sending request to Azure OpenAI API. Model: {model}, Deployment: {deployment_id}")
-        logger.debug(f"Request URL: {url}")
-        logger.debug(f"Request payload: {json.dumps(payload)[:500]}...")
+        logger.info("Sending request to Azure OpenAI API. Model: %s, Deployment: %s", model, deployment_id)
+        body = _json_dumps(payload)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request URL: %s", url)
+            logger.debug("Request payload: %s...", body[:500].decode("utf-8", "replace"))
         
         # API isteği gönder
-        response = requests.post(url, headers=headers, json=payload, timeout=120)
+        response = _post(url, headers, body)
+        
+        # Yanıt gövdesi bir kez alınır; ayrıca response.text ile çözülmez
+        content = response.content
         
         # Durumu kontrol et
         if response.status_code == 200:
             # Başarılı yanıt
-            response_json = response.json()
-            logger.info(f"Request successful. Response length: {len(response.text)}")
+            response_json = _json_loads(content)
+            logger.info("Request successful. Response length: %d bytes", len(content))
             
             # Yanıttan içeriği çıkar ve döndür
             if "choices" in response_json and response_json["choices"]:
@@ -133,22 +200,23 @@ def send_to_azure(
                     }
             
             # Beklenmeyen yanıt formatı
-            logger.error(f"Unexpected response format: {response.text[:200]}...")
+            logger.error(f"Unexpected response format: {content[:200].decode('utf-8', 'replace')}...")
             return None
             
         else:
             # API hata döndürdü
-            logger.error(f"API Error ({response.status_code}): {response.text}")
+            error_text = content.decode("utf-8", "replace")
+            logger.error(f"API Error ({response.status_code}): {error_text}")
             error_data = None
             
             try:
-                error_data = response.json()
+                error_data = _json_loads(content)
             except:
                 pass
                 
             return {
                 "error": f"API Error ({response.status_code})",
-                "details": error_data or response.text,
+                "details": error_data or error_text,
                 "status_code": response.status_code
             }
             
@@ -157,4 +225,27 @@ def send_to_azure(
         return {
             "error": "Request failed",
             "details": str(e)
-        }
\ No newline at end of file
+        }
+
+def batch_send_to_azure(
+    message_batches: List[List[Dict[str, Any]]],
+    max_workers: Optional[int] = None,
+    **kwargs
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Birden fazla mesaj listesini eşzamanlı isteklerle Azure OpenAI API'ye gönderir.
+    
+    Args:
+        message_batches: Her biri ayrı bir istek olacak mesaj listeleri
+        max_workers: Aynı anda gönderilecek istek sayısı (varsayılan AZURE_MAX_CONCURRENCY)
+        **kwargs: Her isteğe aynen iletilecek send_to_azure parametreleri (model, temperature vb.)
+        
+    Returns:
+        Her mesaj listesi için, giriş sırasıyla, send_to_azure sonucu
+    """
+    if len(message_batches) <= 1:
+        return [send_to_azure(messages, **kwargs) for messages in message_batches]
+    
+    workers = min(max_workers or AZURE_MAX_CONCURRENCY, len(message_batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda messages: send_to_azure(messages, **kwargs), message_batches))
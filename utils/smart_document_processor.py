@@ -12,14 +12,43 @@ import logging
 import os
 import json
 import tempfile
+import importlib.util
+import codecs
+import contextlib
+import functools
+import hashlib
+import io
+import mmap
+import multiprocessing
+import queue
+import shutil
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator, Iterable
 import time
 import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# orjson varsa işlenmiş sonuçlar onunla doğrudan bayt olarak yazılır
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for values the encoder does not handle: NumPy scalars as numbers, anything else as str"""
+    if getattr(obj, "ndim", None) == 0 and callable(getattr(obj, "item", None)):
+        return obj.item()
+    return str(obj)
+
 
 # Import document chunker
-from utils.document_chunker import DocumentChunker, chunk_document_text
+from utils.document_chunker import DocumentChunker, DocumentMapBuilder, chunk_document_text
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +59,393 @@ TEMP_DIR = Path(tempfile.gettempdir()) / "document_processing"
 SMART_PROCESSING_ENABLED = True  # Flag to enable/disable smart processing
 STREAM_PROCESSING_THRESHOLD = 10 * 1024 * 1024  # 10MB threshold for stream processing
 MAX_WORKERS = 4  # Max concurrent workers for parallel processing
+STREAM_TEXT_SAMPLE_CHARS = 64 * 1024  # Text kept for streamed documents when keep_full_text is False
+
+# PyMuPDF kuruluysa PDF'ler onunla okunur (PyPDF2 yalnızca yedek), büyük PDF'lerin metni sayfa blokları
+# halinde süreç havuzunda çıkarılır; modül burada içe aktarılmaz, yalnızca varlığı kontrol edilir
+PYMUPDF_AVAILABLE = importlib.util.find_spec("fitz") is not None
+PDF_PAGE_WORKERS = min(os.cpu_count() or 1, 8)
+PDF_PARALLEL_MIN_PAGES = 32
+# Camelot sayfa başına CPU yoğun çalışır; bundan uzun PDF'lerin tabloları bu büyüklükte sayfa dilimleri
+# halinde süreç havuzunda çıkarılır
+PDF_TABLE_PAGES_PER_SHARD = 10
+# Bir sayfada hem yatay hem dikey en az bu kadar farklı konumda çizgi (ya da dikdörtgen kenarı) varsa
+# sayfadaki tablolar kenarlıklı sayılır ve daha hızlı olan Camelot lattice yöntemi kullanılır; sayfa
+# çerçevesi (2 yatay + 2 dikey) ya da başlık altı çizgisi tek başına lattice'e geçirmez
+PDF_TABLE_RULING_MIN_LINES = 3
+# Bu modüldeki süreç havuzları (sayfa metni, görsel/tablo çıkarma) fork ile başlatılmaz: çok iş parçacıklı
+# sunucuda kopyalanan kilitler alt süreçte kilitli kalabilir; forkserver yoksa spawn kullanılır
+EXTRACTION_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+_EXTRACTION_MP_CONTEXT = multiprocessing.get_context(EXTRACTION_START_METHOD)
+
+# Bu boyuttan büyük metin dosyaları okunmak yerine belleğe eşlenir (mmap) ve parçalar kopyalanmadan çözülür
+TEXT_MMAP_MIN_SIZE = 1024 * 1024
+
+# DOCX akış işlemede word/document.xml python-docx DOM'u kurulmadan paragraf paragraf ayrıştırılır;
+# lxml varsa o, yoksa standart kütüphanedeki ElementTree kullanılır
+try:
+    from lxml.etree import iterparse as _xml_iterparse, fromstring as _xml_fromstring
+except ImportError:
+    from xml.etree.ElementTree import iterparse as _xml_iterparse, fromstring as _xml_fromstring
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W_NS + 'p'
+_W_R = _W_NS + 'r'
+_W_T = _W_NS + 't'
+_W_TAB = _W_NS + 'tab'
+_W_BR = _W_NS + 'br'
+_W_CR = _W_NS + 'cr'
+_W_TBL = _W_NS + 'tbl'
+_W_TR = _W_NS + 'tr'
+_W_TC = _W_NS + 'tc'
+_W_HYPERLINK = _W_NS + 'hyperlink'
+_W_TCPR = _W_NS + 'tcPr'
+_W_GRIDSPAN = _W_NS + 'gridSpan'
+_W_VMERGE = _W_NS + 'vMerge'
+_W_PSTYLE_PATH = f'{_W_NS}pPr/{_W_NS}pStyle'
+_W_VAL = _W_NS + 'val'
+# İçindeki paragraflar gövde paragrafı sayılmayan kapsayıcılar (python-docx'teki doc.paragraphs gibi)
+_DOCX_CONTAINER_TAGS = frozenset((_W_TBL, _W_NS + 'txbxContent'))
+
+# Biçimi tanınmayan dosyalar ham parçalar halinde okunurken her parça için yeni bytes ayrılmaz;
+# sabit boyutlu tamponlar havuzdan alınıp readinto ile yeniden kullanılır
+STREAM_READ_CHUNK_SIZE = 1024 * 1024
+READ_BUFFER_POOL_SIZE = 4
+_READ_BUFFER_POOL: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+
+# DOCX görselleri arşivden diske bu boyutta parçalarla kopyalanır
+DOCX_IMAGE_COPY_CHUNK_SIZE = 64 * 1024
+
+
+# İsteğe bağlı bağımlılıklar ilk kullanımda bir kez içe aktarılır; kurulu olmayanlar da kaydedilir,
+# böylece sonraki çağrılarda içe aktarma yolu yeniden taranmaz
+_OPTIONAL_MODULES: Dict[str, Any] = {}
+
+
+def _require_module(name: str):
+    """Return an optional dependency, importing it on first use; raises ImportError if it is not installed"""
+    try:
+        module = _OPTIONAL_MODULES[name]
+    except KeyError:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            module = None
+        _OPTIONAL_MODULES[name] = module
+    
+    if module is None:
+        raise ImportError(f"No module named '{name}'")
+    return module
+
+
+def _write_file_bytes(path: Union[str, Path], data: bytes) -> None:
+    """Write data to path with raw os.write calls (no Python-level write buffer in between)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _advise_sequential(file) -> None:
+    """Tell the kernel the open file will be read sequentially (larger readahead), where supported"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _iter_mmap_text(file_path: Union[str, Path], chunk_size: int) -> Iterator[str]:
+    """
+    Decode a UTF-8 text file through a read-only memory map, chunk_size bytes at a time.
+    
+    Behaves like reading the file in text mode with errors='ignore': multi-byte characters
+    split across chunks are kept and newlines are normalised to "\\n".
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='ignore'), translate=True)
+    
+    with open(file_path, 'rb') as file:
+        _advise_sequential(file)
+        
+        # Boş dosya belleğe eşlenemez
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(mm), chunk_size):
+                    text = decoder.decode(view[start:start + chunk_size])
+                    if text:
+                        yield text
+            finally:
+                view.release()
+    
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def _acquire_read_buffer() -> bytearray:
+    """Take a chunk buffer from the pool, allocating a new one if the pool is empty"""
+    try:
+        return _READ_BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(STREAM_READ_CHUNK_SIZE)
+
+
+def _release_read_buffer(buffer: bytearray) -> None:
+    """Return a chunk buffer to the pool; buffers beyond READ_BUFFER_POOL_SIZE are dropped"""
+    if _READ_BUFFER_POOL.qsize() < READ_BUFFER_POOL_SIZE:
+        _READ_BUFFER_POOL.put(buffer)
+
+
+def _iter_binary_chunks(file_path: Union[str, Path]) -> Iterator[str]:
+    """Read a file of unknown format in STREAM_READ_CHUNK_SIZE pieces into a pooled buffer and decode each as UTF-8"""
+    buffer = _acquire_read_buffer()
+    view = memoryview(buffer)
+    try:
+        with open(file_path, 'rb') as file:
+            _advise_sequential(file)
+            while n := file.readinto(buffer):
+                yield str(view[:n], 'utf-8', 'ignore')
+    finally:
+        view.release()
+        _release_read_buffer(buffer)
+
+
+def _docx_heading_style_ids(archive: zipfile.ZipFile) -> set:
+    """Style IDs in word/styles.xml whose name marks them as headings"""
+    try:
+        styles = _xml_fromstring(archive.read('word/styles.xml'))
+    except KeyError:
+        return set()
+    
+    heading_ids = set()
+    for style in styles.iter(_W_NS + 'style'):
+        name = style.find(_W_NS + 'name')
+        if name is not None and name.get(_W_VAL, '').lower().startswith('heading'):
+            heading_ids.add(style.get(_W_NS + 'styleId'))
+    return heading_ids
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a <w:p> element's runs (including hyperlinks), like python-docx's Paragraph.text"""
+    parts = []
+    append = parts.append
+    for child in paragraph:
+        if child.tag == _W_R:
+            runs = (child,)
+        elif child.tag == _W_HYPERLINK:
+            runs = child.iterfind(_W_R)
+        else:
+            continue
+        for run in runs:
+            for item in run:
+                tag = item.tag
+                if tag == _W_T:
+                    append(item.text or '')
+                elif tag == _W_TAB:
+                    append('\t')
+                elif tag == _W_BR or tag == _W_CR:
+                    append('\n')
+    return ''.join(parts)
+
+
+def _docx_table_rows(table) -> List[List[str]]:
+    """
+    Cell texts of a <w:tbl> element, row by row, like python-docx's row.cells / cell.text:
+    horizontally merged cells repeat once per spanned grid column and vertically merged
+    continuation cells repeat the text of the cell above.
+    """
+    rows = []
+    previous_row = {}
+    for row in table.iterfind(_W_TR):
+        row_texts = []
+        current_row = {}
+        for cell in row.iterfind(_W_TC):
+            grid_column = len(row_texts)
+            properties = cell.find(_W_TCPR)
+            span = 1
+            merge = None
+            if properties is not None:
+                span_element = properties.find(_W_GRIDSPAN)
+                if span_element is not None:
+                    span = int(span_element.get(_W_VAL, 1))
+                merge_element = properties.find(_W_VMERGE)
+                if merge_element is not None:
+                    merge = merge_element.get(_W_VAL, 'continue')
+            
+            if merge == 'continue' and grid_column in previous_row:
+                text = previous_row[grid_column]
+            else:
+                text = "\n".join(map(_docx_paragraph_text, cell.iterfind(_W_P)))
+            
+            for column in range(grid_column, grid_column + span):
+                current_row[column] = text
+                row_texts.append(text)
+        
+        rows.append(row_texts)
+        previous_row = current_row
+    return rows
+
+
+def _docx_table_text(table_number: int, table) -> str:
+    """Render a <w:tbl> element as "[Table n]" followed by one " | "-separated line per row"""
+    lines = [f"[Table {table_number}]\n"]
+    for row_texts in _docx_table_rows(table):
+        lines.append(" | ".join(text.strip() for text in row_texts) + "\n")
+    return "".join(lines)
+
+
+def _iter_docx_tables(file_path: Union[str, Path]) -> Iterator[List[List[str]]]:
+    """Yield the cell texts of each body-level DOCX table (python-docx's doc.tables) in document order"""
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        nesting = 0
+        for event, elem in _xml_iterparse(xml_file, events=('start', 'end')):
+            tag = elem.tag
+            if tag in _DOCX_CONTAINER_TAGS:
+                if event == 'start':
+                    nesting += 1
+                    continue
+                nesting -= 1
+                if tag == _W_TBL and nesting == 0:
+                    yield _docx_table_rows(elem)
+                    elem.clear()
+            elif tag == _W_P and event == 'end' and nesting == 0:
+                # Gövde paragrafları tabloya ait değildir, bellekte tutulmaz
+                elem.clear()
+
+
+def _extract_pdf_page_texts(file_path: str, page_indices: range) -> List[str]:
+    """Worker: open the PDF in this process and extract the text of a page range"""
+    import fitz  # PyMuPDF
+    
+    with fitz.open(file_path) as doc:
+        return [doc[page_index].get_text("text") for page_index in page_indices]
+
+
+def _iter_pdf_page_texts(file_path: str, page_count: int, doc=None) -> Iterator[str]:
+    """Yield the text of every PDF page in order, spreading large documents over a process pool"""
+    if page_count <= PDF_PARALLEL_MIN_PAGES or PDF_PAGE_WORKERS < 2:
+        if doc is None:
+            yield from _extract_pdf_page_texts(file_path, range(page_count))
+        else:
+            for page in doc:
+                yield page.get_text("text")
+        return
+    
+    # Her işçi kendi fitz.Document nesnesini açar; sayfalar sırayı korumak için ardışık bloklara bölünür
+    workers = min(PDF_PAGE_WORKERS, page_count)
+    step = -(-page_count // workers)
+    page_ranges = [range(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    
+    with ProcessPoolExecutor(max_workers=len(page_ranges), mp_context=_EXTRACTION_MP_CONTEXT) as executor:
+        for page_texts in executor.map(_extract_pdf_page_texts, repeat(str(file_path)), page_ranges):
+            yield from page_texts
+
+
+# Aynı metin için belge haritası yeniden hesaplanmaz; anahtar metnin özetidir (metnin kendisi tutulmaz)
+STRUCTURE_CACHE_SIZE = 32
+_structure_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_structure_cache_lock = threading.Lock()
+
+
+def _cached_document_map(text: str) -> Dict[str, Any]:
+    """DocumentChunker.generate_document_map(text), memoized on a BLAKE2b digest of the text"""
+    key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _structure_cache_lock:
+        doc_map = _structure_cache.get(key)
+        if doc_map is not None:
+            _structure_cache.move_to_end(key)
+    
+    if doc_map is None:
+        doc_map = DocumentChunker.generate_document_map(text)
+        with _structure_cache_lock:
+            _structure_cache[key] = doc_map
+            if len(_structure_cache) > STRUCTURE_CACHE_SIZE:
+                _structure_cache.popitem(last=False)
+    
+    # Önbellekteki harita çağıranın değiştirebileceği bir kopya olarak döndürülür
+    return {**doc_map, "sections": [dict(section) for section in doc_map["sections"]]}
+
+
+def _page_camelot_flavor(page) -> str:
+    """Pick Camelot's flavor for a PyMuPDF page: 'lattice' if it draws a grid of ruling lines, else 'stream'"""
+    rows = set()
+    columns = set()
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                start, end = item[1], item[2]
+                if abs(start.y - end.y) < 1:
+                    rows.add(round(start.y))
+                elif abs(start.x - end.x) < 1:
+                    columns.add(round(start.x))
+            elif item[0] == "re":
+                # İnce dikdörtgen tek bir çizgidir; diğerlerinin dört kenarı da sayılır (hücre kutuları)
+                rect = item[1]
+                if rect.height < 2:
+                    rows.add(round(rect.y0))
+                elif rect.width < 2:
+                    columns.add(round(rect.x0))
+                else:
+                    rows.update((round(rect.y0), round(rect.y1)))
+                    columns.update((round(rect.x0), round(rect.x1)))
+    
+    if len(rows) >= PDF_TABLE_RULING_MIN_LINES and len(columns) >= PDF_TABLE_RULING_MIN_LINES:
+        return 'lattice'
+    return 'stream'
+
+
+def _camelot_page_spec(pages: List[int]) -> str:
+    """Camelot pages argument for ascending page numbers, with consecutive runs as ranges ("1-3,7,9-10")"""
+    parts = []
+    start = previous = pages[0]
+    for page in pages[1:]:
+        if page != previous + 1:
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+            start = page
+        previous = page
+    parts.append(str(start) if start == previous else f"{start}-{previous}")
+    return ",".join(parts)
+
+
+def _camelot_pages(file_path: str, pages: str, flavor: str = 'stream') -> List[Dict[str, Any]]:
+    """Worker: extract the tables of a page range ("1-10", "1,3-4" or "all") with Camelot as picklable dicts"""
+    camelot = _require_module("camelot")
+    
+    try:
+        camelot_tables = camelot.read_pdf(file_path, pages=pages, flavor=flavor, suppress_stdout=True)
+    except Exception as e:
+        if flavor == 'stream':
+            raise
+        # lattice ek bağımlılık ister (Ghostscript/OpenCV); kullanılamıyorsa stream ile devam edilir
+        logger.warning(f"Camelot {flavor} failed for pages {pages}, using stream: {str(e)}")
+        camelot_tables = camelot.read_pdf(file_path, pages=pages, flavor='stream', suppress_stdout=True)
+    else:
+        if flavor == 'lattice' and len(camelot_tables) == 0:
+            # Çizgiler tablo ızgarası oluşturmuyorsa lattice tablo bulamaz; sayfalar stream ile yeniden okunur
+            logger.info(f"Camelot lattice found no tables on pages {pages}, retrying with stream")
+            camelot_tables = camelot.read_pdf(file_path, pages=pages, flavor='stream', suppress_stdout=True)
+    
+    tables = []
+    for table in camelot_tables:
+        tables.append({
+            "page": table.page,
+            # Convert table to list format (Camelot hücreleri metin; satır başına Series kurulmaz)
+            "data": table.df.values.tolist(),
+            "shape": table.shape,
+            "accuracy": table.accuracy,
+            "whitespace": table.whitespace
+        })
+    return tables
 
 
 class SmartDocumentProcessor:
@@ -56,31 +472,81 @@ class SmartDocumentProcessor:
         self.max_workers = max_workers
         self.temp_dir = temp_dir or TEMP_DIR
         self.chunker = DocumentChunker()
+        # process_document süresince açılan PyMuPDF/python-docx belgeleri (metin, görsel ve tablo
+        # adımları aynı tanıtıcıyı kullanır); örnek iş parçacıkları arasında paylaşılabildiği için
+        # önbellek iş parçacığına özeldir, çağrı dışında None
+        self._local = threading.local()
         
         # Create temp directory if it doesn't exist
         os.makedirs(self.temp_dir, exist_ok=True)
+        # save_processed_result için oluşturulduğu bilinen çıktı dizinleri
+        self._ensured_dirs = {Path(self.temp_dir)}
         
         logger.info(f"NeuraParse Plus belge işleme motoru başlatıldı: akış_eşiği={stream_threshold}, paralel_işleyiciler={max_workers}")
     
-    def should_stream_process(self, file_path: Union[str, Path]) -> bool:
+    @property
+    def _document_cache(self) -> Optional[Dict[Tuple[str, str], Any]]:
+        return getattr(self._local, "document_cache", None)
+    
+    @_document_cache.setter
+    def _document_cache(self, cache: Optional[Dict[Tuple[str, str], Any]]) -> None:
+        self._local.document_cache = cache
+    
+    @contextlib.contextmanager
+    def _open_document(self, file_path: Path, library: str) -> Iterator[Any]:
+        """
+        Open a document with PyMuPDF ("fitz") or python-docx ("docx").
+        
+        Inside process_document the handle is cached and shared by the text, image and
+        table passes; it is closed when process_document returns.
+        """
+        key = (library, str(file_path))
+        if self._document_cache is not None and key in self._document_cache:
+            yield self._document_cache[key]
+            return
+        
+        module = _require_module(library)
+        doc = module.open(file_path) if library == "fitz" else module.Document(file_path)
+        if self._document_cache is not None:
+            self._document_cache[key] = doc
+            yield doc
+            return
+        
+        try:
+            yield doc
+        finally:
+            if library == "fitz":
+                doc.close()
+    
+    def _close_cached_documents(self) -> None:
+        """Close the document handles cached during process_document"""
+        for (library, _), doc in self._document_cache.items():
+            if library == "fitz":
+                doc.close()
+        self._document_cache = None
+    
+    def should_stream_process(self, file_path: Union[str, Path], file_size: Optional[int] = None) -> bool:
         """
         Determine if a file should be processed in streaming mode.
         
         Args:
             file_path: Path to the document file
+            file_size: Size of the file in bytes, if already known
             
         Returns:
             True if the file should be stream processed
         """
-        file_size = os.path.getsize(file_path)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
         return file_size > self.stream_threshold
     
-    def extract_text_with_streaming(self, file_path: Union[str, Path]) -> Iterator[str]:
+    def extract_text_with_streaming(self, file_path: Union[str, Path], ext: Optional[str] = None) -> Iterator[str]:
         """
         Extract text from a document using streaming for memory efficiency.
         
         Args:
             file_path: Path to the document file
+            ext: Lower-case file extension, if already known
             
         Yields:
             Text chunks from the document
@@ -88,7 +554,7 @@ class SmartDocumentProcessor:
         try:
             # Determine file type
             file_path = Path(file_path)
-            file_extension = file_path.suffix.lower()
+            file_extension = ext if ext is not None else file_path.suffix.lower()
             
             # Use appropriate parser based on file type
             if file_extension == '.pdf':
@@ -118,29 +584,31 @@ class SmartDocumentProcessor:
         """
         try:
             # Import modules only when needed
-            import PyPDF2
+            if PYMUPDF_AVAILABLE:
+                with self._open_document(file_path, "fitz") as doc:
+                    num_pages = doc.page_count
+                    page_texts = _iter_pdf_page_texts(file_path, num_pages, doc)
+                    for page_num, text in enumerate(page_texts):
+                        if text.strip():
+                            # Include page metadata
+                            yield f"[Page {page_num + 1} of {num_pages}]\n{text}"
+                return
+            
+            PyPDF2 = _require_module("PyPDF2")
             
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
                 num_pages = len(reader.pages)
                 
-                for page_num in range(num_pages):
-                    # Extract text from page
-                    page = reader.pages[page_num]
+                for page_num, page in enumerate(reader.pages):
                     text = page.extract_text()
-                    
                     if text.strip():
                         # Include page metadata
                         yield f"[Page {page_num + 1} of {num_pages}]\n{text}"
         except ImportError:
             logger.warning("PyPDF2 not available, falling back to standard processing")
             # Fall back to reading the file in chunks
-            with open(file_path, 'rb') as file:
-                while chunk := file.read(1024 * 1024):  # 1MB chunks
-                    try:
-                        yield chunk.decode('utf-8', errors='ignore')
-                    except:
-                        yield f"[Binary data chunk, decoding failed]"
+            yield from _iter_binary_chunks(file_path)
     
     def _stream_docx(self, file_path: Path) -> Iterator[str]:
         """
@@ -152,70 +620,72 @@ class SmartDocumentProcessor:
         Yields:
             Text from paragraphs
         """
-        try:
-            # Import modules only when needed
-            import docx
+        with open(file_path, 'rb') as docx_file, zipfile.ZipFile(docx_file) as archive:
+            _advise_sequential(docx_file)
+            heading_styles = _docx_heading_style_ids(archive)
             
-            doc = docx.Document(file_path)
-            
-            # Extract paragraphs
-            total_paragraphs = len(doc.paragraphs)
-            current_section = ""
+            # Bölüm metni parçalar listesinde biriktirilir, yalnızca verilirken birleştirilir
+            section_parts = []
             section_count = 0
+            paragraph_index = -1
+            # Tablolar, python-docx akışındaki gibi paragraflardan sonra verilir
+            tables = []
+            nesting = 0
             
-            for i, para in enumerate(doc.paragraphs):
-                text = para.text.strip()
-                
-                # Skip empty paragraphs
-                if not text:
-                    continue
-                
-                # Check if this looks like a heading
-                if para.style.name.startswith('Heading'):
-                    # Yield the previous section if it exists
-                    if current_section:
-                        yield current_section
-                        current_section = ""
+            with archive.open('word/document.xml') as xml_file:
+                for event, elem in _xml_iterparse(xml_file, events=('start', 'end')):
+                    tag = elem.tag
                     
-                    # Start a new section with the heading
-                    section_count += 1
-                    current_section = f"[Section {section_count}] {text}\n\n"
-                else:
-                    # Add to current section
-                    current_section += text + "\n\n"
-                
-                # Yield periodically to avoid building up too much text
-                if i % 50 == 0 and current_section:
-                    yield current_section
-                    current_section = ""
+                    # Tablo ve metin kutusu içindeki paragraflar gövde paragrafı sayılmaz
+                    if tag in _DOCX_CONTAINER_TAGS:
+                        if event == 'start':
+                            nesting += 1
+                            continue
+                        nesting -= 1
+                        if tag == _W_TBL and nesting == 0:
+                            tables.append(_docx_table_text(len(tables) + 1, elem))
+                            elem.clear()
+                        continue
+                    
+                    if event != 'end' or tag != _W_P or nesting:
+                        continue
+                    
+                    paragraph_index += 1
+                    text = _docx_paragraph_text(elem).strip()
+                    style = elem.find(_W_PSTYLE_PATH)
+                    is_heading = style is not None and style.get(_W_VAL) in heading_styles
+                    # İşlenen paragraf bellekte tutulmaz
+                    elem.clear()
+                    
+                    # Skip empty paragraphs
+                    if not text:
+                        continue
+                    
+                    # Check if this looks like a heading
+                    if is_heading:
+                        # Yield the previous section if it exists
+                        if section_parts:
+                            yield "".join(section_parts)
+                            section_parts.clear()
+                        
+                        # Start a new section with the heading
+                        section_count += 1
+                        section_parts.append(f"[Section {section_count}] {text}\n\n")
+                    else:
+                        # Add to current section
+                        section_parts.append(text + "\n\n")
+                    
+                    # Yield periodically to avoid building up too much text
+                    if paragraph_index % 50 == 0 and section_parts:
+                        yield "".join(section_parts)
+                        section_parts.clear()
             
             # Yield any remaining content
-            if current_section:
-                yield current_section
-                
+            if section_parts:
+                yield "".join(section_parts)
+            
             # Extract tables
-            for i, table in enumerate(doc.tables):
-                table_text = f"[Table {i+1}]\n"
-                for row in table.rows:
-                    row_text = " | ".join(cell.text.strip() for cell in row.cells)
-                    table_text += row_text + "\n"
-                yield table_text
-                
-        except ImportError:
-            logger.warning("python-docx not available, falling back to standard processing")
-            # Fall back to reading the file in chunks
-            try:
-                import textract
-                text = textract.process(str(file_path)).decode('utf-8')
-                yield text
-            except ImportError:
-                logger.warning("textract not available, falling back to binary chunks")
-                with open(file_path, 'rb') as file:
-                    while chunk := file.read(1024 * 1024):  # 1MB chunks
-                        try:
-                            yield chunk.decode('utf-8', errors='ignore')
-                        except:
-                            yield f"[Binary data chunk, decoding failed]"
+            yield from tables
     
     def _stream_text(self, file_path: Path) -> Iterator[str]:
         """
@@ -229,12 +699,11 @@ class SmartDocumentProcessor:
         """
         chunk_size = 1024 * 1024  # 1MB chunks
         
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            while chunk := file.read(chunk_size):
-                yield chunk
+        yield from _iter_mmap_text(file_path, chunk_size)
     
     def process_document(self, file_path: Union[str, Path], extract_images: bool = False, 
-                        extract_tables: bool = False, smart_chunking: bool = True) -> Dict[str, Any]:
+                        extract_tables: bool = False, smart_chunking: bool = True,
+                        keep_full_text: bool = True) -> Dict[str, Any]:
         """
         Process a document with smart extraction and chunking.
         
@@ -243,20 +712,28 @@ class SmartDocumentProcessor:
             extract_images: Whether to extract images
             extract_tables: Whether to extract tables
             smart_chunking: Whether to use smart semantic chunking
+            keep_full_text: Whether to keep the full text of streamed documents; when False,
+                result["text"] only holds the first STREAM_TEXT_SAMPLE_CHARS characters
             
         Returns:
-            Document processing results including text, structure, and extracted elements
+            Document processing results including text, structure, and extracted elements.
+            Extracted images are written to a new directory under temp_dir whose path is
+            returned in result["image_dir"]; the caller owns it and should delete it once the
+            images are no longer needed. No directory is kept when no image was extracted.
         """
         start_time = time.time()
         file_path = Path(file_path)
+        # Uzantı ve boyut bir kez hesaplanıp alt adımlara aktarılır
+        file_extension = file_path.suffix.lower()
+        file_size = os.path.getsize(file_path)
         
         logger.info(f"NeuraParse Plus belge işleme başlatılıyor: {file_path} (görüntü_çıkarma={extract_images}, tablo_çıkarma={extract_tables})")
         
         # Initialize result structure
         result = {
             "filename": file_path.name,
-            "file_type": file_path.suffix.lower().replace('.', ''),
-            "file_size": os.path.getsize(file_path),
+            "file_type": file_extension.replace('.', ''),
+            "file_size": file_size,
             "processed_at": time.time(),
             "processing_time": 0,
             "text": "",
@@ -268,56 +745,89 @@ class SmartDocumentProcessor:
             "processing_method": "standard"
         }
         
+        # Metin, görsel ve tablo adımları aynı belge tanıtıcısını kullanır
+        self._document_cache = {}
+        image_dir = None
         try:
             # Determine processing method based on file size
-            if self.should_stream_process(file_path):
-                logger.info(f"NeuraParse Plus akış işleme teknolojisi kullanılıyor - Büyük belge: {result['file_size'] / (1024*1024):.2f} MB")
+            if self.should_stream_process(file_path, file_size):
+                logger.info(f"NeuraParse Plus akış işleme teknolojisi kullanılıyor - Büyük belge: {file_size / (1024*1024):.2f} MB")
                 result["processing_method"] = "streaming"
                 
-                # Process with streaming
+                # Process with streaming: akıştan gelen metin geldikçe parçalanır ve belge yapısı
+                # çıkarılır, birleştirilmiş metin yalnızca istenirse tutulur
+                chunker = DocumentChunker() if smart_chunking else None
                 text_chunks = []
-                for chunk in self.extract_text_with_streaming(file_path):
-                    text_chunks.append(chunk)
                 
-                result["text"] = "".join(text_chunks)
+                def streamed_text() -> Iterator[str]:
+                    sample_size = 0
+                    for chunk in self.extract_text_with_streaming(file_path, file_extension):
+                        if keep_full_text:
+                            text_chunks.append(chunk)
+                        elif sample_size < STREAM_TEXT_SAMPLE_CHARS:
+                            text_chunks.append(chunk[:STREAM_TEXT_SAMPLE_CHARS - sample_size])
+                            sample_size += len(text_chunks[-1])
+                        
+                        if chunker:
+                            result["chunks"].extend(chunker.feed_incremental(chunk))
+                        yield chunk
                 
-                # Apply smart chunking to the combined text if requested
-                if smart_chunking and result["text"]:
-                    result["chunks"] = self._apply_smart_chunking(result["text"])
+                # Generate document structure map
+                result["document_structure"] = self._extract_document_structure(streamed_text())
+                
+                if chunker:
+                    result["chunks"].extend(chunker.finish_incremental())
+                
+                result["text"] = "".join(text_chunks)
                 
             else:
                 # Regular processing for smaller files
                 result["processing_method"] = "standard"
-                result.update(self._process_standard(file_path, extract_images, extract_tables))
+                # Görsel ve tablolar aşağıda paralel olarak bir kez çıkarılır
+                result.update(self._process_standard(file_path, False, False, file_extension, file_size))
                 
                 # Apply smart chunking if requested
                 if smart_chunking and result["text"]:
                     result["chunks"] = self._apply_smart_chunking(result["text"])
+                
+                # Generate document structure map
+                result["document_structure"] = self._extract_document_structure(result["text"])
             
-            # Generate document structure map
-            result["document_structure"] = self._extract_document_structure(result["text"])
+            # Görseller bu çağrıya özel bir alt dizine yazılır; aynı adlı görseller (image_p1_1.png,
+            # word/media/image1.png) eşzamanlı işlenen başka belgelerinkinin üzerine yazılmaz
+            image_dir = Path(tempfile.mkdtemp(dir=self.temp_dir)) if extract_images else None
             
-            # Process images and tables in parallel if requested
-            if extract_images or extract_tables:
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    futures = []
-                    
-                    if extract_images:
-                        futures.append(executor.submit(self._extract_images, file_path))
-                    
-                    if extract_tables:
-                        futures.append(executor.submit(self._extract_tables, file_path))
+            # Process images and tables in parallel if requested (ikisi birlikte istendiğinde, GIL'i
+            # paylaşmamaları için ayrı süreçlerde; süreçlere yalnızca dosya yolu, uzantı ve çıktı dizini gider)
+            if extract_images and extract_tables:
+                workers = {"images": _extract_images_in_worker, "tables": _extract_tables_in_worker}
+                with ProcessPoolExecutor(max_workers=len(workers), mp_context=_EXTRACTION_MP_CONTEXT) as executor:
+                    # Her future, sonucunun yazılacağı anahtarla eşlenir
+                    futures = {
+                        executor.submit(worker, str(file_path), file_extension, str(image_dir)): kind
+                        for kind, worker in workers.items()
+                    }
                     
-                    # Collect results
+                    # Collect results (biri başarısız olsa da diğerinin sonucu kullanılır)
                     for future in concurrent.futures.as_completed(futures):
+                        kind = futures[future]
                         try:
-                            data = future.result()
-                            if "images" in data:
-                                result["images"] = data["images"]
-                            if "tables" in data:
-                                result["tables"] = data["tables"]
+                            result[kind] = future.result()[kind]
                         except Exception as e:
-                            logger.error(f"Error in parallel processing: {str(e)}")
+                            logger.error(f"Error in parallel processing ({kind}): {str(e)}")
+            else:
+                # Tek iş bu iş parçacığında yürütülür ve önbellekteki belge tanıtıcısını kullanır
+                extractors = {}
+                if extract_images:
+                    extractors["images"] = functools.partial(self._extract_images, output_dir=image_dir)
+                if extract_tables:
+                    extractors["tables"] = self._extract_tables
+                
+                for kind, extractor in extractors.items():
+                    try:
+                        result[kind] = extractor(file_path, file_extension)[kind]
+                    except Exception as e:
+                        logger.error(f"Error in {kind} extraction: {str(e)}")
             
             # Calculate processing time
             result["processing_time"] = time.time() - start_time
@@ -331,8 +841,43 @@ class SmartDocumentProcessor:
             result["error"] = str(e)
             result["processing_time"] = time.time() - start_time
             return result
+        
+        finally:
+            self._close_cached_documents()
+            # Görsel çıkmadıysa (ya da çıkarma başarısız olduysa) çağrıya özel dizin bırakılmaz;
+            # görsel varsa dizin çağırana devredilir
+            if image_dir is not None:
+                if result["images"]:
+                    result["image_dir"] = str(image_dir)
+                else:
+                    shutil.rmtree(image_dir, ignore_errors=True)
+    
+    def extract_structure_only(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Extract only the document structure map, skipping chunking and image/table extraction.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Returns:
+            Document structure data (empty if the text could not be extracted)
+        """
+        file_path = Path(file_path)
+        file_extension = file_path.suffix.lower()
+        file_size = os.path.getsize(file_path)
+        
+        try:
+            if self.should_stream_process(file_path, file_size):
+                return self._extract_document_structure(self.extract_text_with_streaming(file_path, file_extension))
+            
+            text = self._process_standard(file_path, False, False, file_extension, file_size)["text"]
+            return self._extract_document_structure(text)
+        except Exception as e:
+            logger.error(f"NeuraParse Plus belge yapısı çıkarma hatası: {str(e)}")
+            return {}
     
-    def _process_standard(self, file_path: Path, extract_images: bool, extract_tables: bool) -> Dict[str, Any]:
+    def _process_standard(self, file_path: Path, extract_images: bool, extract_tables: bool,
+                          ext: Optional[str] = None, file_size: Optional[int] = None) -> Dict[str, Any]:
         """
         Process document using standard (non-streaming) approach.
         
@@ -340,6 +885,8 @@ class SmartDocumentProcessor:
             file_path: Path to the document file
             extract_images: Whether to extract images
             extract_tables: Whether to extract tables
+            ext: Lower-case file extension, if already known
+            file_size: Size of the file in bytes, if already known
             
         Returns:
             Processing results
@@ -347,7 +894,7 @@ class SmartDocumentProcessor:
         result = {}
         
         # Determine file type
-        file_extension = file_path.suffix.lower()
+        file_extension = ext if ext is not None else file_path.suffix.lower()
         
         # Extract text based on file type
         if file_extension == '.pdf':
@@ -355,13 +902,17 @@ class SmartDocumentProcessor:
         elif file_extension in ['.docx', '.doc']:
             result.update(self._process_docx(file_path))
         elif file_extension == '.txt':
-            # Simple text file
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                result["text"] = f.read()
+            # Simple text file (büyük dosyalar belleğe eşlenerek tek seferde çözülür)
+            text_size = file_size if file_size is not None else os.path.getsize(file_path)
+            if text_size > TEXT_MMAP_MIN_SIZE:
+                result["text"] = "".join(_iter_mmap_text(file_path, text_size))
+            else:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    result["text"] = f.read()
         else:
             # Try generic extraction
             try:
-                import textract
+                textract = _require_module("textract")
                 result["text"] = textract.process(str(file_path)).decode('utf-8')
             except ImportError:
                 logger.warning("textract not available, falling back to basic text extraction")
@@ -371,7 +922,7 @@ class SmartDocumentProcessor:
         # Extract images if requested (but only if not already done in specific processors)
         if extract_images and "images" not in result:
             try:
-                images_result = self._extract_images(file_path)
+                images_result = self._extract_images(file_path, file_extension)
                 result.update(images_result)
             except Exception as e:
                 logger.error(f"NeuraParse Plus görüntü çıkarma hatası: {str(e)}")
@@ -380,7 +931,7 @@ class SmartDocumentProcessor:
         # Extract tables if requested (but only if not already done in specific processors)
         if extract_tables and "tables" not in result:
             try:
-                tables_result = self._extract_tables(file_path)
+                tables_result = self._extract_tables(file_path, file_extension)
                 result.update(tables_result)
             except Exception as e:
                 logger.error(f"NeuraParse Plus tablo çıkarma hatası: {str(e)}")
@@ -405,7 +956,23 @@ class SmartDocumentProcessor:
         }
         
         try:
-            import PyPDF2
+            if PYMUPDF_AVAILABLE:
+                with self._open_document(file_path, "fitz") as doc:
+                    # Extract metadata (PyPDF2 ile aynı anahtar biçimi: "title" -> "Title")
+                    for key, value in (doc.metadata or {}).items():
+                        if value:
+                            result["metadata"][key[:1].upper() + key[1:]] = str(value)
+                    
+                    # Extract page count
+                    result["page_count"] = doc.page_count
+                    
+                    # Extract text from all pages (büyük belgelerde paralel)
+                    all_text = list(_iter_pdf_page_texts(file_path, doc.page_count, doc))
+                
+                result["text"] = "\n\n".join(all_text)
+                return result
+            
+            PyPDF2 = _require_module("PyPDF2")
             
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
@@ -424,11 +991,7 @@ class SmartDocumentProcessor:
                 result["page_count"] = len(reader.pages)
                 
                 # Extract text from all pages
-                all_text = []
-                for page_num in range(len(reader.pages)):
-                    page = reader.pages[page_num]
-                    text = page.extract_text()
-                    all_text.append(text)
+                all_text = [page.extract_text() for page in reader.pages]
                 
                 result["text"] = "\n\n".join(all_text)
                 
@@ -439,7 +1002,7 @@ class SmartDocumentProcessor:
             
             try:
                 # Try using textract as a fallback
-                import textract
+                textract = _require_module("textract")
                 result["text"] = textract.process(str(file_path)).decode('utf-8')
                 return result
             except ImportError:
@@ -465,68 +1028,75 @@ class SmartDocumentProcessor:
         }
         
         try:
-            import docx
-            
-            doc = docx.Document(file_path)
-            
-            # Extract core properties
-            core_properties = ["author", "category", "comments", "content_status", 
-                              "created", "identifier", "keywords", "language", 
-                              "last_modified_by", "last_printed", "modified", 
-                              "revision", "subject", "title", "version"]
-            
-            for prop in core_properties:
-                try:
-                    value = getattr(doc.core_properties, prop)
-                    if value:
-                        result["metadata"][prop] = str(value)
-                except:
-                    pass
-            
-            # Extract text from paragraphs
-            text_parts = []
-            current_section = {"heading": "", "content": []}
-            
-            for para in doc.paragraphs:
-                text = para.text.strip()
+            with self._open_document(file_path, "docx") as doc:
+                # Extract core properties
+                core_properties = ["author", "category", "comments", "content_status", 
+                                  "created", "identifier", "keywords", "language", 
+                                  "last_modified_by", "last_printed", "modified", 
+                                  "revision", "subject", "title", "version"]
+            
+                for prop in core_properties:
+                    try:
+                        value = getattr(doc.core_properties, prop)
+                        if value:
+                            result["metadata"][prop] = str(value)
+                    except:
+                        pass
+            
+                # Başlık stilleri bir kez çözülür (stil kimliği -> seviye); paragraf başına para.style
+                # ile stil tablosu aranmaz
+                heading_levels = {}
+                for style in doc.styles:
+                    style_name = style.name or ""
+                    if style_name.startswith('Heading'):
+                        level_text = style_name.replace("Heading", "")
+                        heading_levels[style.style_id] = int(level_text) if level_text.isdigit() else 1
                 
-                if not text:
-                    continue
+                # Extract text from paragraphs
+                text_parts = []
+                current_section = {"heading": "", "content": []}
+            
+                for para in doc.paragraphs:
+                    text = para.text.strip()
+                
+                    if not text:
+                        continue
                 
-                # Add all text to the main text
-                text_parts.append(text)
+                    # Add all text to the main text
+                    text_parts.append(text)
                 
-                # Track sections based on headings
-                if para.style.name.startswith('Heading'):
-                    # Save previous section if it exists and has content
-                    if current_section["content"]:
-                        result["sections"].append(current_section)
+                    # Track sections based on headings
+                    heading_level = heading_levels.get(para._p.style)
+                    if heading_level is not None:
+                        # Save previous section if it exists and has content
+                        if current_section["content"]:
+                            result["sections"].append(current_section)
                     
-                    # Start new section
-                    current_section = {
-                        "heading": text,
-                        "level": int(para.style.name.replace("Heading", "")) if para.style.name.replace("Heading", "").isdigit() else 1,
-                        "content": []
-                    }
-                else:
-                    # Add to current section
-                    current_section["content"].append(text)
+                        # Start new section
+                        current_section = {
+                            "heading": text,
+                            "level": heading_level,
+                            "content": []
+                        }
+                    else:
+                        # Add to current section
+                        current_section["content"].append(text)
             
-            # Add final section if it has content
-            if current_section["content"]:
-                result["sections"].append(current_section)
+                # Add final section if it has content
+                if current_section["content"]:
+                    result["sections"].append(current_section)
             
-            # Combine all text
-            result["text"] = "\n\n".join(text_parts)
+                # Combine all text
+                result["text"] = "\n\n".join(text_parts)
             
-            return result
+                return result
             
         except ImportError:
             logger.warning("python-docx not available, trying alternate DOCX processing")
             
             try:
                 # Try using textract as a fallback
-                import textract
+                textract = _require_module("textract")
                 result["text"] = textract.process(str(file_path)).decode('utf-8')
                 return result
             except ImportError:
@@ -535,24 +1105,28 @@ class SmartDocumentProcessor:
                     result["text"] = f.read().decode('utf-8', errors='ignore')
                 return result
     
-    def _extract_images(self, file_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    def _extract_images(self, file_path: Path, ext: Optional[str] = None,
+                        output_dir: Optional[Path] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract images from document.
         
         Args:
             file_path: Path to the document file
+            ext: Lower-case file extension, if already known
+            output_dir: Directory to write the images to (defaults to the temp directory)
             
         Returns:
             Dictionary with extracted images information
         """
-        file_extension = file_path.suffix.lower()
+        file_extension = ext if ext is not None else file_path.suffix.lower()
+        output_dir = Path(output_dir) if output_dir is not None else self.temp_dir
         images = []
         
         try:
             if file_extension == '.pdf':
-                images = self._extract_images_from_pdf(file_path)
+                images = self._extract_images_from_pdf(file_path, output_dir)
             elif file_extension in ['.docx', '.doc']:
-                images = self._extract_images_from_docx(file_path)
+                images = self._extract_images_from_docx(file_path, output_dir)
             else:
                 logger.warning(f"Image extraction not supported for {file_extension}")
         except Exception as e:
@@ -560,12 +1134,13 @@ class SmartDocumentProcessor:
         
         return {"images": images}
     
-    def _extract_images_from_pdf(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _extract_images_from_pdf(self, file_path: Path, output_dir: Path) -> List[Dict[str, Any]]:
         """
         Extract images from PDF.
         
         Args:
             file_path: Path to the PDF file
+            output_dir: Directory to write the images to
             
         Returns:
             List of extracted image information
@@ -573,54 +1148,30 @@ class SmartDocumentProcessor:
         images = []
         
         try:
-            import fitz  # PyMuPDF
-            
-            doc = fitz.open(file_path)
-            
-            for page_index in range(len(doc)):
-                page = doc[page_index]
+            with self._open_document(file_path, "fitz") as doc:
+                # Sayfalardaki tüm görsel referansları tek geçişte toplanır
+                image_refs = [
+                    (page_index, img_index, img_info[0])
+                    for page_index in range(len(doc))
+                    for img_index, img_info in enumerate(doc[page_index].get_images(full=True))
+                ]
                 
-                # Get images
-                image_list = page.get_images(full=True)
+                # fitz.Document iş parçacığı güvenli değil: çıkarma kilit altında yapılır, diske yazma paralel yürür
+                extract_one = functools.partial(self._extract_pdf_image, doc, threading.Lock(), output_dir)
+                if len(image_refs) > 1:
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                        extracted = list(executor.map(extract_one, image_refs))
+                else:
+                    extracted = [extract_one(ref) for ref in image_refs]
                 
-                for img_index, img_info in enumerate(image_list):
-                    xref = img_info[0]
-                    base_image = doc.extract_image(xref)
-                    
-                    if base_image:
-                        # Save image to temporary file
-                        image_extension = base_image["ext"]
-                        image_filename = f"image_p{page_index+1}_{img_index+1}.{image_extension}"
-                        temp_path = self.temp_dir / image_filename
-                        
-                        with open(temp_path, "wb") as f:
-                            f.write(base_image["image"])
-                        
-                        # Get image dimensions
-                        width = base_image.get("width", 0)
-                        height = base_image.get("height", 0)
-                        
-                        # Add image info
-                        images.append({
-                            "filename": image_filename,
-                            "path": str(temp_path),
-                            "page": page_index + 1,
-                            "index": img_index + 1,
-                            "width": width,
-                            "height": height,
-                            "type": image_extension.upper(),
-                            "size": len(base_image["image"])
-                        })
-            
-            doc.close()
+                images = [image for image in extracted if image]
             
         except ImportError:
             logger.warning("PyMuPDF not available, trying alternate PDF image extraction")
             try:
                 # Try using Pillow and PyPDF2 as fallback
-                import PyPDF2
-                from PIL import Image
-                import io
+                PyPDF2 = _require_module("PyPDF2")
+                Image = _require_module("PIL.Image")
                 
                 with open(file_path, 'rb') as file:
                     reader = PyPDF2.PdfReader(file)
@@ -637,10 +1188,9 @@ class SmartDocumentProcessor:
                                     
                                     # Save image to temporary file
                                     image_filename = f"image_p{page_index+1}_{img_index+1}.{image_extension}"
-                                    temp_path = self.temp_dir / image_filename
+                                    temp_path = output_dir / image_filename
                                     
-                                    with open(temp_path, "wb") as f:
-                                        f.write(data)
+                                    _write_file_bytes(temp_path, data)
                                     
                                     # Add image info
                                     images.append({
@@ -650,7 +1200,7 @@ class SmartDocumentProcessor:
                                         "index": img_index + 1,
                                         "width": resource.get('/Width', 0),
                                         "height": resource.get('/Height', 0),
-                                        "type": image_extension.upper(),
+                                        "type": sys.intern(image_extension.upper()),
                                         "size": len(data)
                                     })
                                 except:
@@ -661,12 +1211,52 @@ class SmartDocumentProcessor:
         
         return images
     
-    def _extract_images_from_docx(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _extract_pdf_image(self, doc, doc_lock: threading.Lock, output_dir: Path,
+                           image_ref: Tuple[int, int, int]) -> Optional[Dict[str, Any]]:
+        """
+        Extract one embedded PDF image, save it to output_dir and describe it.
+        
+        Args:
+            doc: Open PyMuPDF document
+            doc_lock: Lock serialising access to doc
+            output_dir: Directory to write the image to
+            image_ref: (page_index, img_index, xref) of the image
+            
+        Returns:
+            Image information, or None if the image could not be extracted
+        """
+        page_index, img_index, xref = image_ref
+        with doc_lock:
+            base_image = doc.extract_image(xref)
+        
+        if not base_image:
+            return None
+        
+        # Save image to temporary file
+        image_extension = base_image["ext"]
+        image_filename = f"image_p{page_index+1}_{img_index+1}.{image_extension}"
+        temp_path = output_dir / image_filename
+        
+        _write_file_bytes(temp_path, base_image["image"])
+        
+        return {
+            "filename": image_filename,
+            "path": str(temp_path),
+            "page": page_index + 1,
+            "index": img_index + 1,
+            "width": base_image.get("width", 0),
+            "height": base_image.get("height", 0),
+            "type": sys.intern(image_extension.upper()),
+            "size": len(base_image["image"])
+        }
+    
+    def _extract_images_from_docx(self, file_path: Path, output_dir: Path) -> List[Dict[str, Any]]:
         """
         Extract images from DOCX.
         
         Args:
             file_path: Path to the DOCX file
+            output_dir: Directory to write the images to (under docx_images/)
             
         Returns:
             List of extracted image information
@@ -674,34 +1264,29 @@ class SmartDocumentProcessor:
         images = []
         
         try:
-            from docx import Document
-            import zipfile
-            from PIL import Image
-            import io
+            _require_module("docx")
+            Image = _require_module("PIL.Image")
             
             # DOCX files are ZIP files containing images in word/media/
-            temp_dir = self.temp_dir / "docx_images"
+            temp_dir = output_dir / "docx_images"
             os.makedirs(temp_dir, exist_ok=True)
             
             with zipfile.ZipFile(file_path) as docx_zip:
                 # Find all image files in the zip
-                image_files = [f for f in docx_zip.namelist() if f.startswith('word/media/')]
+                image_files = [info for info in docx_zip.infolist() if info.filename.startswith('word/media/')]
                 
-                for img_index, image_path in enumerate(image_files):
-                    # Extract the image
-                    image_data = docx_zip.read(image_path)
-                    
+                for img_index, image_info in enumerate(image_files):
                     # Get image filename from path
-                    image_filename = os.path.basename(image_path)
+                    image_filename = os.path.basename(image_info.filename)
                     temp_path = temp_dir / image_filename
                     
-                    # Save image to temporary file
-                    with open(temp_path, "wb") as f:
-                        f.write(image_data)
+                    # Save image to temporary file (görsel belleğe alınmadan parça parça açılıp diske yazılır)
+                    with docx_zip.open(image_info) as src, open(temp_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst, DOCX_IMAGE_COPY_CHUNK_SIZE)
                     
-                    # Get image dimensions and type
+                    # Get image dimensions and type (Pillow yalnızca dosya başlığını okur)
                     try:
-                        with Image.open(io.BytesIO(image_data)) as img:
+                        with Image.open(temp_path) as img:
                             width, height = img.size
                             img_format = img.format
                     except:
@@ -716,7 +1301,7 @@ class SmartDocumentProcessor:
                         "width": width,
                         "height": height,
                         "type": img_format,
-                        "size": len(image_data)
+                        "size": image_info.file_size
                     })
                     
         except ImportError:
@@ -724,17 +1309,18 @@ class SmartDocumentProcessor:
         
         return images
     
-    def _extract_tables(self, file_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    def _extract_tables(self, file_path: Path, ext: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract tables from document.
         
         Args:
             file_path: Path to the document file
+            ext: Lower-case file extension, if already known
             
         Returns:
             Dictionary with extracted tables
         """
-        file_extension = file_path.suffix.lower()
+        file_extension = ext if ext is not None else file_path.suffix.lower()
         tables = []
         
         try:
@@ -749,6 +1335,48 @@ class SmartDocumentProcessor:
         
         return {"tables": tables}
     
+    def _pdf_page_count(self, file_path: Path) -> Optional[int]:
+        """Page count of a PDF via PyMuPDF or PyPDF2, or None if neither is available"""
+        try:
+            if PYMUPDF_AVAILABLE:
+                with self._open_document(file_path, "fitz") as doc:
+                    return doc.page_count
+            
+            PyPDF2 = _require_module("PyPDF2")
+            with open(file_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        except ImportError:
+            return None
+    
+    def _camelot_shards(self, file_path: Path, page_count: Optional[int]) -> List[Tuple[str, str]]:
+        """
+        Split a PDF into Camelot jobs of at most PDF_TABLE_PAGES_PER_SHARD pages.
+        
+        Every page is probed for ruling lines and pages are grouped by flavor, so a
+        bordered table on one page does not switch the whole document to lattice.
+        
+        Returns:
+            (pages, flavor) pairs, e.g. ("1-3,7", "lattice")
+        """
+        if page_count is None:
+            return [('all', 'stream')]
+        
+        if PYMUPDF_AVAILABLE:
+            with self._open_document(file_path, "fitz") as doc:
+                flavors = [_page_camelot_flavor(page) for page in doc]
+        else:
+            flavors = ['stream'] * page_count
+        
+        pages_by_flavor: Dict[str, List[int]] = {}
+        for page_number, flavor in enumerate(flavors, 1):
+            pages_by_flavor.setdefault(flavor, []).append(page_number)
+        
+        return [
+            (_camelot_page_spec(pages[start:start + PDF_TABLE_PAGES_PER_SHARD]), flavor)
+            for flavor, pages in pages_by_flavor.items()
+            for start in range(0, len(pages), PDF_TABLE_PAGES_PER_SHARD)
+        ]
+    
     def _extract_tables_from_pdf(self, file_path: Path) -> List[Dict[str, Any]]:
         """
         Extract tables from PDF.
@@ -762,33 +1390,30 @@ class SmartDocumentProcessor:
         tables = []
         
         try:
-            import camelot
+            _require_module("camelot")
             
-            # Extract tables using camelot
-            table_pages = camelot.read_pdf(str(file_path), pages='all', flavor='stream')
+            # Extract tables using camelot (sayfalar yönteme göre gruplanır, uzun belgelerde dilimler paralel işlenir)
+            page_count = self._pdf_page_count(file_path)
+            shards = self._camelot_shards(file_path, page_count)
+            if len(shards) < 2 or page_count <= PDF_TABLE_PAGES_PER_SHARD or PDF_PAGE_WORKERS < 2:
+                shard_tables = [_camelot_pages(str(file_path), pages, flavor) for pages, flavor in shards]
+            else:
+                page_specs, flavors = zip(*shards)
+                with ProcessPoolExecutor(max_workers=min(PDF_PAGE_WORKERS, len(shards)),
+                                         mp_context=_EXTRACTION_MP_CONTEXT) as executor:
+                    shard_tables = list(executor.map(_camelot_pages, repeat(str(file_path)), page_specs, flavors))
             
-            for i, table in enumerate(table_pages):
-                # Convert table to list format
-                table_data = []
-                df = table.df
-                
-                for _, row in df.iterrows():
-                    table_data.append(list(row))
-                
-                tables.append({
-                    "index": i + 1,
-                    "page": table.page,
-                    "data": table_data,
-                    "shape": table.shape,
-                    "accuracy": table.accuracy,
-                    "whitespace": table.whitespace
-                })
+            # Dilimler sayfa sırasına göre birleştirilir, index belge genelinde yeniden verilir
+            page_tables = [table for tables_of_shard in shard_tables for table in tables_of_shard]
+            page_tables.sort(key=lambda table: int(table["page"]))
+            for table in page_tables:
+                tables.append({"index": len(tables) + 1, **table})
                 
         except ImportError:
             logger.warning("camelot not available, trying alternate table extraction")
             try:
                 # Try using tabula-py as fallback
-                import tabula
+                tabula = _require_module("tabula")
                 
                 # Extract tables
                 extracted_tables = tabula.read_pdf(str(file_path), pages='all')
@@ -820,27 +1445,13 @@ class SmartDocumentProcessor:
         """
         tables = []
         
-        try:
-            import docx
-            
-            doc = docx.Document(file_path)
-            
-            for i, table in enumerate(doc.tables):
-                # Convert table to data format
-                table_data = []
-                
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data.append(row_data)
-                
-                tables.append({
-                    "index": i + 1,
-                    "data": table_data,
-                    "shape": (len(table.rows), len(table.rows[0].cells) if table.rows else 0)
-                })
-                
-        except ImportError:
-            logger.warning("python-docx not available for table extraction")
+        # word/document.xml python-docx nesne modeli kurulmadan doğrudan ayrıştırılır
+        for i, table_data in enumerate(_iter_docx_tables(file_path)):
+            tables.append({
+                "index": i + 1,
+                "data": table_data,
+                "shape": (len(table_data), len(table_data[0]) if table_data else 0)
+            })
         
         return tables
     
@@ -856,32 +1467,42 @@ class SmartDocumentProcessor:
         """
         return chunk_document_text(text)
     
-    def _extract_document_structure(self, text: str) -> Dict[str, Any]:
+    def _extract_document_structure(self, text: Union[str, Iterable[str]]) -> Dict[str, Any]:
         """
         Extract document structure including headings, sections, etc.
         
         Args:
-            text: Document text
+            text: Document text, or an iterable of consecutive text pieces (consumed once)
             
         Returns:
             Document structure data
         """
-        return DocumentChunker.generate_document_map(text)
+        if isinstance(text, str):
+            return _cached_document_map(text)
+        
+        builder = DocumentMapBuilder()
+        for piece in text:
+            builder.feed(piece)
+        return builder.finish()
     
-    def save_processed_result(self, result: Dict[str, Any], output_dir: Optional[Path] = None) -> str:
+    def save_processed_result(self, result: Dict[str, Any], output_dir: Optional[Path] = None,
+                              pretty: bool = False) -> str:
         """
         Save processed document result to file.
         
         Args:
             result: Document processing result
             output_dir: Directory to save result (defaults to temp directory)
+            pretty: Whether to indent the JSON (compact output is smaller and faster to write)
             
         Returns:
             Path to saved result file
         """
         # Use temp directory if output directory not specified
-        save_dir = output_dir or self.temp_dir
-        os.makedirs(save_dir, exist_ok=True)
+        save_dir = Path(output_dir or self.temp_dir)
+        if save_dir not in self._ensured_dirs:
+            save_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(save_dir)
         
         # Create filename based on original document name
         original_name = Path(result.get("filename", "document")).stem
@@ -889,15 +1510,31 @@ class SmartDocumentProcessor:
         output_path = save_dir / result_filename
         
         # Save result to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, default=str)
+        if orjson is not None:
+            # NumPy değerleri (Camelot/tabula) orjson tarafından doğrudan yazılır, geri çağrıya düşmez
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(result, default=_json_default, option=option))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                if pretty:
+                    json.dump(result, f, indent=2, default=_json_default, ensure_ascii=False)
+                else:
+                    json.dump(result, f, separators=(',', ':'), default=_json_default, ensure_ascii=False)
         
         logger.info(f"Saved processing result to {output_path}")
         return str(output_path)
 
 
+@functools.lru_cache(maxsize=1)
+def _default_processor() -> SmartDocumentProcessor:
+    """Shared processor used by the module-level convenience functions"""
+    return SmartDocumentProcessor()
+
+
 def smart_process_document(file_path: Union[str, Path], extract_images: bool = False,
-                         extract_tables: bool = False) -> Dict[str, Any]:
+                         extract_tables: bool = False, keep_full_text: bool = True,
+                         processor: Optional[SmartDocumentProcessor] = None) -> Dict[str, Any]:
     """
     Convenience function to process document with smart extraction.
     
@@ -905,24 +1542,95 @@ def smart_process_document(file_path: Union[str, Path], extract_images: bool = F
         file_path: Path to the document file
         extract_images: Whether to extract images
         extract_tables: Whether to extract tables
+        keep_full_text: Whether to keep the full text of streamed documents
+            (pass False when only result["chunks"] is used)
+        processor: Processor to use (defaults to a shared module-level instance)
         
     Returns:
         Processing results
     """
-    processor = SmartDocumentProcessor()
-    return processor.process_document(file_path, extract_images, extract_tables)
+    processor = processor or _default_processor()
+    return processor.process_document(file_path, extract_images, extract_tables,
+                                      keep_full_text=keep_full_text)
+
+
+# smart_process_documents işçi süreçlerinde kullanılan işlemci (her süreçte bir kez oluşturulur)
+_worker_processor: Optional[SmartDocumentProcessor] = None
+
+
+def _init_document_worker() -> None:
+    """Worker initializer: create this process's SmartDocumentProcessor"""
+    global _worker_processor
+    _worker_processor = SmartDocumentProcessor()
+
+
+def _process_document_in_worker(file_path: str, extract_images: bool,
+                                extract_tables: bool) -> Dict[str, Any]:
+    """Worker: process one document with this process's SmartDocumentProcessor"""
+    return _worker_processor.process_document(file_path, extract_images, extract_tables)
+
+
+def _extract_images_in_worker(file_path: str, ext: str, temp_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Worker: extract a document's images into temp_dir with a processor created in this process"""
+    return SmartDocumentProcessor(temp_dir=Path(temp_dir))._extract_images(Path(file_path), ext)
+
+
+def _extract_tables_in_worker(file_path: str, ext: str, temp_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Worker: extract a document's tables with a processor created in this process"""
+    return SmartDocumentProcessor(temp_dir=Path(temp_dir))._extract_tables(Path(file_path), ext)
+
+
+def smart_process_documents(file_paths: Iterable[Union[str, Path]], extract_images: bool = False,
+                            extract_tables: bool = False,
+                            max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Process several documents in parallel, one document per worker process.
+    
+    PDF/DOCX parsing is CPU-bound and holds the GIL, so documents are spread over a
+    process pool rather than threads. Each worker keeps its own SmartDocumentProcessor
+    (and the parsing libraries it loads), so memory grows with max_workers.
+    
+    Args:
+        file_paths: Paths of the documents to process
+        extract_images: Whether to extract images
+        extract_tables: Whether to extract tables
+        max_workers: Number of worker processes (defaults to PDF_PAGE_WORKERS)
+        
+    Yields:
+        (file_path, result) pairs in completion order; failures are reported in result["error"]
+    """
+    file_paths = [str(file_path) for file_path in file_paths]
+    if not file_paths:
+        return
+    
+    workers = min(max_workers or PDF_PAGE_WORKERS, len(file_paths))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_EXTRACTION_MP_CONTEXT,
+                             initializer=_init_document_worker) as executor:
+        futures = {
+            executor.submit(_process_document_in_worker, file_path, extract_images, extract_tables): file_path
+            for file_path in file_paths
+        }
+        
+        for future in concurrent.futures.as_completed(futures):
+            file_path = futures[future]
+            try:
+                yield file_path, future.result()
+            except Exception as e:
+                logger.error(f"NeuraParse Plus toplu belge işleme hatası ({file_path}): {str(e)}")
+                yield file_path, {"filename": Path(file_path).name, "error": str(e)}
 
 
-def extract_document_structure(file_path: Union[str, Path]) -> Dict[str, Any]:
+def extract_document_structure(file_path: Union[str, Path],
+                               processor: Optional[SmartDocumentProcessor] = None) -> Dict[str, Any]:
     """
     Extract document structure from a file.
     
     Args:
         file_path: Path to the document file
+        processor: Processor to use (defaults to a shared module-level instance)
         
     Returns:
         Document structure information
     """
-    processor = SmartDocumentProcessor()
-    result = processor.process_document(file_path, extract_images=False, extract_tables=False)
-    return result["document_structure"]
\ No newline at end of file
+    processor = processor or _default_processor()
+    return processor.extract_structure_only(file_path)
\ No newline at end of file